@@ -1,315 +1,422 @@
 
 #pip install vpython
-from vpython import *
 import numpy as np
+import functools
+import os
+import sys
+from types import SimpleNamespace
+
+# Motor numérico compartido (Simulaciones/motor)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from motor import rlc
+from motor.buffer import FPS, ProductorPasoFijo, fotogramas
+from motor.graficas import CurvaBufferizada
+from motor.cache import cache_simulacion, clave_parametros
+from motor.grabacion import Grabacion, Reproductor, abrir as abrir_grabacion
+from motor.textos import TextoLimitado
+from motor.vivo import CambiosEnVivo
+from motor.interfaz import GestorEscena, cargar_vpython
+from motor.lineal import texto_seleccion
+from motor.mna import CircuitoMNA, escalera_lc, serie_rlc
+from motor.rlc import analizar_ecuacion_rlc
+
+# VPython se carga en crear_interfaz(); importar el script no abre ninguna ventana
+vp = None
+
+# Objetos 3D de todas las escenas: se crean una sola vez y cada ejecución
+# los reconfigura (ver motor.interfaz.GestorEscena)
+objetos = GestorEscena()
+
+# Duración y ritmo de la animación
+T_FINAL = 20
+VELOCIDAD = 1.0    # segundos simulados por segundo real
+
+# Archivo donde se graba la última simulación (ver motor.grabacion)
+ARCHIVO_GRABACION = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ultima_simulacion.tray")
+
+# Análisis y series de las últimas configuraciones (ver motor.cache)
+cache = cache_simulacion("rlc")
+
+# Parámetros que los sliders pueden cambiar durante una ejecución
+PARAMETROS_EN_VIVO = ("R", "L", "C", "V0", "omega")
+# Cambios pendientes de la ejecución en curso (None si no hay ninguna)
+en_vivo = None
+
+# Respuesta en frecuencia: frecuencias evaluadas y tope de la amplificación
+# dibujada
+PUNTOS_BODE = 2000
+AMPLIFICACION_MAXIMA = 100.0
+# Gráficas de amplitud y fase (se crean al pedirlas por primera vez)
+bode = None
+
+# Redes por netlist (motor.mna): circuitos del menú, nodos dibujados como
+# barras de tensión, pasos por periodo de la fuente más rápida y estados
+# en el buffer
+CIRCUITOS_RED = ("Serie RLC", "Escalera LC", "Archivo de netlist")
+NODOS_MOSTRADOS = 40
+PASOS_POR_PERIODO = 40
+CAPACIDAD_RED = 8
+# Barras y gráficas de la red (se crean la primera vez que se usan)
+escena_red = None
 
 # -------------------------------------------------
 # ESCENA BASE
 # -------------------------------------------------
-scene = canvas(title="Simulación de Circuito RLC",
-               width=1000, height=700, background=color.white)
-
-# Gráficas
-graph_carga = graph(title="Carga vs Tiempo", 
-                    xtitle="Tiempo (s)", ytitle="Carga Q (C)",
-                    width=650, height=300, align="right")
-curve_carga = gcurve(color=color.blue, width=2, label="Q(t)")
-
-graph_corriente = graph(title="Corriente vs Tiempo", 
-                        xtitle="Tiempo (s)", ytitle="Corriente I (A)",
-                        width=650, height=300, align="right")
-curve_corriente = gcurve(color=color.red, width=2, label="I(t)")
-
-# Lista para objetos creados en cada ejecución
-created_objects = []
-
-wtext(text="\n--- Parámetros del Circuito RLC ---\n")
-
-# Sliders con valores dinámicos
-# --- Resistencia ---
-texto_R = wtext(text="Resistencia (R): 5.00 Ω\n")
-def actualizar_R(s):
-    texto_R.text = f"Resistencia (R): {s.value:.2f} Ω\n"
-slider_R = slider(min=0.1, max=50.0, value=5.0, step=0.5, bind=actualizar_R)
-
-# --- Inductancia ---
-texto_L = wtext(text="\nInductancia (L): 0.50 H\n")
-def actualizar_L(s):
-    texto_L.text = f"\nInductancia (L): {s.value:.2f} H\n"
-slider_L = slider(min=0.1, max=5.0, value=0.5, step=0.1, bind=actualizar_L)
-
-# --- Capacitancia ---
-texto_C = wtext(text="\nCapacitancia (C): 0.10 F\n")
-def actualizar_C(s):
-    texto_C.text = f"\nCapacitancia (C): {s.value:.2f} F\n"
-slider_C = slider(min=0.01, max=1.0, value=0.1, step=0.01, bind=actualizar_C)
-
-# --- Carga inicial ---
-texto_Q0 = wtext(text="\nCarga inicial (Q₀): 1.00 C\n")
-def actualizar_Q0(s):
-    texto_Q0.text = f"\nCarga inicial (Q₀): {s.value:.2f} C\n"
-slider_Q0 = slider(min=0.0, max=5.0, value=1.0, step=0.1, bind=actualizar_Q0)
-
-# --- Corriente inicial ---
-texto_I0 = wtext(text="\nCorriente inicial (I₀): 0.00 A\n")
-def actualizar_I0(s):
-    texto_I0.text = f"\nCorriente inicial (I₀): {s.value:.2f} A\n"
-slider_I0 = slider(min=-2.0, max=2.0, value=0.0, step=0.1, bind=actualizar_I0)
-
-# --- Voltaje de fuente ---
-texto_V0 = wtext(text="\nVoltaje fuente (V₀): 0.00 V\n")
-def actualizar_V0(s):
-    texto_V0.text = f"\nVoltaje fuente (V₀): {s.value:.2f} V\n"
-slider_V0 = slider(min=0.0, max=20.0, value=0.0, step=0.5, bind=actualizar_V0)
-
-# --- Frecuencia de fuente ---
-texto_omega = wtext(text="\nFrecuencia fuente (ω): 2.00 rad/s\n")
-def actualizar_omega(s):
-    texto_omega.text = f"\nFrecuencia fuente (ω): {s.value:.2f} rad/s\n"
-slider_omega = slider(min=0.0, max=10.0, value=2.0, step=0.5, bind=actualizar_omega)
-
-wtext(text="\n")
-
-# Mostrar ecuación diferencial general
-ecuacion_text = wtext(text="\n--- Ecuación Diferencial ---\n")
-ecuacion_text2 = wtext(text="Forma general: L·Q'' + R·Q' + Q/C = V₀·cos(ω·t)\n")
-ecuacion_text3 = wtext(text="donde Q es la carga e I = Q' es la corriente\n\n")
-
-# Ecuación con parámetros
-ecuacion_params = wtext(text="Ecuación con parámetros: (presiona 'Iniciar simulación')\n\n")
-
-# Análisis de la ecuación característica
-analisis_ec = wtext(text="")
-
-# Salidas numéricas
-salida_info = wtext(text="\nTiempo actual: 0.00 s\n")
+def crear_interfaz():
+    """Crea la ventana, las gráficas y los controles (carga VPython)."""
+    global vp, scene, graph_carga, curve_carga, graph_corriente, curve_corriente, texto_R
+    global slider_R, texto_L, slider_L, texto_C, slider_C, texto_Q0, slider_Q0, texto_I0
+    global slider_I0, texto_V0, slider_V0, texto_omega, slider_omega, ecuacion_text
+    global ecuacion_text2, ecuacion_text3, ecuacion_params, analisis_ec, salida_info
+    global boton_iniciar, boton_repetir, menu_red, texto_secciones, slider_secciones, entrada_netlist
+    vp = cargar_vpython()
+
+    scene = vp.canvas(title="Simulación de Circuito RLC",
+                      width=1000, height=700, background=vp.color.white)
+
+    # Gráficas
+    graph_carga = vp.graph(title="Carga vs Tiempo", 
+                           xtitle="Tiempo (s)", ytitle="Carga Q (C)",
+                           width=650, height=300, align="right")
+    curve_carga = vp.gcurve(color=vp.color.blue, width=2, label="Q(t)")
+
+    graph_corriente = vp.graph(title="Corriente vs Tiempo", 
+                               xtitle="Tiempo (s)", ytitle="Corriente I (A)",
+                               width=650, height=300, align="right")
+    curve_corriente = vp.gcurve(color=vp.color.red, width=2, label="I(t)")
+
+    vp.wtext(text="\n--- Parámetros del Circuito RLC ---\n")
+
+    # Sliders con valores dinámicos
+    # --- Resistencia ---
+    texto_R = vp.wtext(text="Resistencia (R): 5.00 Ω\n")
+    def actualizar_R(s):
+        texto_R.text = f"Resistencia (R): {s.value:.2f} Ω\n"
+        avisar_cambio()
+    slider_R = vp.slider(min=0.1, max=50.0, value=5.0, step=0.5, bind=actualizar_R)
+
+    # --- Inductancia ---
+    texto_L = vp.wtext(text="\nInductancia (L): 0.50 H\n")
+    def actualizar_L(s):
+        texto_L.text = f"\nInductancia (L): {s.value:.2f} H\n"
+        avisar_cambio()
+    slider_L = vp.slider(min=0.1, max=5.0, value=0.5, step=0.1, bind=actualizar_L)
+
+    # --- Capacitancia ---
+    texto_C = vp.wtext(text="\nCapacitancia (C): 0.10 F\n")
+    def actualizar_C(s):
+        texto_C.text = f"\nCapacitancia (C): {s.value:.2f} F\n"
+        avisar_cambio()
+    slider_C = vp.slider(min=0.01, max=1.0, value=0.1, step=0.01, bind=actualizar_C)
+
+    # --- Carga inicial ---
+    texto_Q0 = vp.wtext(text="\nCarga inicial (Q₀): 1.00 C\n")
+    def actualizar_Q0(s):
+        texto_Q0.text = f"\nCarga inicial (Q₀): {s.value:.2f} C\n"
+    slider_Q0 = vp.slider(min=0.0, max=5.0, value=1.0, step=0.1, bind=actualizar_Q0)
+
+    # --- Corriente inicial ---
+    texto_I0 = vp.wtext(text="\nCorriente inicial (I₀): 0.00 A\n")
+    def actualizar_I0(s):
+        texto_I0.text = f"\nCorriente inicial (I₀): {s.value:.2f} A\n"
+    slider_I0 = vp.slider(min=-2.0, max=2.0, value=0.0, step=0.1, bind=actualizar_I0)
+
+    # --- Voltaje de fuente ---
+    texto_V0 = vp.wtext(text="\nVoltaje fuente (V₀): 0.00 V\n")
+    def actualizar_V0(s):
+        texto_V0.text = f"\nVoltaje fuente (V₀): {s.value:.2f} V\n"
+        avisar_cambio()
+    slider_V0 = vp.slider(min=0.0, max=20.0, value=0.0, step=0.5, bind=actualizar_V0)
+
+    # --- Frecuencia de fuente ---
+    texto_omega = vp.wtext(text="\nFrecuencia fuente (ω): 2.00 rad/s\n")
+    def actualizar_omega(s):
+        texto_omega.text = f"\nFrecuencia fuente (ω): {s.value:.2f} rad/s\n"
+        avisar_cambio()
+    slider_omega = vp.slider(min=0.0, max=10.0, value=2.0, step=0.5, bind=actualizar_omega)
+
+    vp.wtext(text="\n")
+
+    # Mostrar ecuación diferencial general
+    ecuacion_text = vp.wtext(text="\n--- Ecuación Diferencial ---\n")
+    ecuacion_text2 = vp.wtext(text="Forma general: L·Q'' + R·Q' + Q/C = V₀·cos(ω·t)\n")
+    ecuacion_text3 = vp.wtext(text="donde Q es la carga e I = Q' es la corriente\n\n")
 
-# -------------------------------------------------
-# ANÁLISIS DE LA ECUACIÓN
-# -------------------------------------------------
-def analizar_ecuacion_rlc(R, L, C, Q0, I0, V0, omega):
-    """
-    Analiza la ecuación diferencial del circuito RLC.
-    
-    Ecuación: L·Q'' + R·Q' + Q/C = V₀·cos(ω·t)
-    
-    Para la parte homogénea (V₀ = 0):
-    Ecuación característica: L·r² + R·r + 1/C = 0
-    r = [-R ± √(R² - 4L/C)] / (2L)
-    """
-    
     # Ecuación con parámetros
-    if V0 == 0:
-        ec_texto = f"({L:.2f})·Q'' + ({R:.2f})·Q' + Q/({C:.2f}) = 0\n"
-        ec_texto += f"Simplificando: ({L:.2f})·Q'' + ({R:.2f})·Q' + ({1/C:.2f})·Q = 0\n\n"
-    else:
-        ec_texto = f"({L:.2f})·Q'' + ({R:.2f})·Q' + Q/({C:.2f}) = ({V0:.2f})·cos(({omega:.2f})·t)\n"
-        ec_texto += f"Simplificando: ({L:.2f})·Q'' + ({R:.2f})·Q' + ({1/C:.2f})·Q = ({V0:.2f})·cos(({omega:.2f})·t)\n\n"
-    
-    # Análisis de la ecuación característica homogénea
-    analisis = "\n--- Análisis de la Ecuación Característica ---\n"
-    analisis += f"Ecuación característica: ({L:.2f})·r² + ({R:.2f})·r + ({1/C:.2f}) = 0\n"
-    
-    # Discriminante
-    discriminante = R**2 - 4*L*(1/C)
-    analisis += f"Discriminante Δ = R² - 4L/C = {discriminante:.4f}\n\n"
-    
-    if discriminante > 0:
-        # Sobreamortiguado - dos raíces reales
-        r1 = (-R + np.sqrt(discriminante)) / (2*L)
-        r2 = (-R - np.sqrt(discriminante)) / (2*L)
-        analisis += "🔹 Caso: SOBREAMORTIGUADO (dos raíces reales distintas)\n"
-        analisis += f"   r₁ = {r1:.4f}\n"
-        analisis += f"   r₂ = {r2:.4f}\n"
-        analisis += f"   Solución homogénea: Q_h(t) = C₁·e^({r1:.4f}·t) + C₂·e^({r2:.4f}·t)\n"
-        analisis += "   Comportamiento: Decaimiento exponencial SIN oscilaciones\n"
-        tipo = "sobreamortiguado"
-        
-    elif abs(discriminante) < 1e-10:
-        # Críticamente amortiguado
-        r = -R / (2*L)
-        analisis += "🔹 Caso: CRÍTICAMENTE AMORTIGUADO (raíz real doble)\n"
-        analisis += f"   r = {r:.4f}\n"
-        analisis += f"   Solución homogénea: Q_h(t) = (C₁ + C₂·t)·e^({r:.4f}·t)\n"
-        analisis += "   Comportamiento: Decaimiento más rápido posible sin oscilación\n"
-        tipo = "critico"
-        
-    else:
-        # Subamortiguado - raíces complejas
-        alpha = -R / (2*L)
-        beta = np.sqrt(-discriminante) / (2*L)
-        analisis += "🔹 Caso: SUBAMORTIGUADO (raíces complejas conjugadas)\n"
-        analisis += f"   r = {alpha:.4f} ± {beta:.4f}i\n"
-        analisis += f"   Solución homogénea: Q_h(t) = e^({alpha:.4f}·t)·[C₁·cos({beta:.4f}·t) + C₂·sin({beta:.4f}·t)]\n"
-        analisis += "   Comportamiento: Oscilaciones AMORTIGUADAS\n"
-        tipo = "subamortiguado"
-        
-        # Parámetros adicionales
-        omega_n = 1 / np.sqrt(L*C)
-        zeta = R / (2 * np.sqrt(L/C))
-        periodo = 2*np.pi / beta
-        
-        analisis += f"\n   📊 Parámetros del sistema:\n"
-        analisis += f"   Frecuencia natural: ω₀ = {omega_n:.4f} rad/s\n"
-        analisis += f"   Factor de amortiguamiento: ζ = {zeta:.4f}\n"
-        analisis += f"   Frecuencia amortiguada: ω_d = {beta:.4f} rad/s\n"
-        analisis += f"   Período de oscilación: T = {periodo:.4f} s\n"
-    
-    if V0 > 0:
-        analisis += f"\n🔹 Solución particular (forzamiento externo):\n"
-        analisis += f"   Debido a V₀·cos(ω·t), habrá una respuesta forzada\n"
-        analisis += f"   Solución completa: Q(t) = Q_h(t) + Q_p(t)\n"
-        analisis += f"   donde Q_p(t) es la solución particular (estado estacionario)\n"
-    
-    return ec_texto, analisis, tipo
+    ecuacion_params = vp.wtext(text="Ecuación con parámetros: (presiona 'Iniciar simulación')\n\n")
+
+    # Análisis de la ecuación característica
+    analisis_ec = vp.wtext(text="")
+
+    # Salidas numéricas
+    salida_info = vp.wtext(text="\nTiempo actual: 0.00 s\n")
+
+    # Botón para iniciar simulación
+    boton_iniciar = vp.button(text="▶ Iniciar simulación", bind=simular)
+    # Botón para repetir la última simulación grabada
+    boton_repetir = vp.button(text="⟲ Repetir última", bind=reproducir)
+    # Botón para la respuesta en frecuencia (sin simular)
+    vp.button(text="Respuesta en frecuencia", bind=mostrar_respuesta_frecuencia)
+
+    # --- Redes descritas por netlist (R, L, C, V₀ y ω de los sliders) ---
+    vp.wtext(text="\n\n--- Red por netlist (MNA) ---\nCircuito: ")
+    menu_red = vp.menu(choices=list(CIRCUITOS_RED), selected="Escalera LC", bind=lambda m: None)
+    texto_secciones = vp.wtext(text="\nSecciones de la escalera: 50\n")
+    def actualizar_secciones(s):
+        texto_secciones.text = f"\nSecciones de la escalera: {int(s.value)}\n"
+    slider_secciones = vp.slider(min=1, max=3000, value=50, step=1, bind=actualizar_secciones)
+    vp.wtext(text="\nArchivo de netlist: ")
+    entrada_netlist = vp.winput(bind=lambda w: None, type="string", width=300)
+    vp.wtext(text="\n")
+    vp.button(text="▶ Simular red", bind=simular_red)
 
 
 # -------------------------------------------------
 # FUNCIONES DE SIMULACIÓN
 # -------------------------------------------------
 
-def hide_previous_objects():
-    global created_objects
-    for obj in created_objects:
-        try:
-            obj.visible = False
-        except:
-            pass
-    created_objects = []
-
-def simular(ev):
-    global created_objects, curve_carga, curve_corriente
+@functools.lru_cache(maxsize=None)
+def camino_circuito(circuit_width, circuit_height):
+    """
+    Puntos del recorrido de las cargas alrededor del circuito, forma (n, 3).
+    Se construye una sola vez por tamaño de circuito y se reutiliza.
+    """
+    def tramo(xs, ys):
+        xs, ys = np.broadcast_arrays(xs, ys)
+        return np.column_stack([xs, ys, np.zeros_like(xs)])
+
+    camino = np.concatenate([
+        tramo(-circuit_width/2, np.linspace(0, circuit_height, 25)),
+        tramo(np.linspace(-circuit_width/2, circuit_width/2, 35), circuit_height),
+        tramo(circuit_width/2, np.linspace(circuit_height, 0, 25)),
+        tramo(np.linspace(circuit_width/2, -circuit_width/2, 35), 0),
+    ])
+    camino.flags.writeable = False
+    return camino
+
+def avisar_cambio():
+    """Modo en vivo: anota los valores de los sliders para la ejecución en curso."""
+    if en_vivo is not None:
+        en_vivo.cambiar(leer_parametros())
+
+
+def leer_parametros():
+    """Parámetros actuales de los sliders."""
+    return dict(R=float(slider_R.value), L=float(slider_L.value), C=float(slider_C.value),
+                Q0=float(slider_Q0.value), I0=float(slider_I0.value),
+                V0=float(slider_V0.value), omega=float(slider_omega.value))
+
+
+def mostrar_tipo(label_tipo, tipo):
+    """Texto y color del indicador de tipo de amortiguamiento."""
+    label_tipo.text = f"Régimen: {tipo}"
+    if tipo == "sobreamortiguado":
+        label_tipo.color = vp.color.blue
+    elif tipo == "subamortiguado":
+        label_tipo.color = vp.color.red
+    else:
+        label_tipo.color = vp.color.green
 
-    # Leer parámetros desde sliders
-    R = float(slider_R.value)
-    L = float(slider_L.value)
-    C = float(slider_C.value)
-    Q0 = float(slider_Q0.value)
-    I0 = float(slider_I0.value)
-    V0 = float(slider_V0.value)
-    omega = float(slider_omega.value)
-
-    # Analizar ecuación
-    ec_texto, analisis, tipo = analizar_ecuacion_rlc(R, L, C, Q0, I0, V0, omega)
-    ecuacion_params.text = f"Ecuación con parámetros:\n{ec_texto}"
-    analisis_ec.text = analisis
 
-    # Limpiar gráficas anteriores
-    curve_carga.delete()
-    curve_corriente.delete()
-    curve_carga = gcurve(color=color.blue, width=2, label="Q(t)")
-    curve_corriente = gcurve(color=color.red, width=2, label="I(t)")
+def construir_escena(p):
+    """Prepara el circuito, las cargas, las etiquetas y las curvas de una ejecución."""
+    R, L, C, Q0, I0, V0, omega = (p[n] for n in ("R", "L", "C", "Q0", "I0", "V0", "omega"))
+    _, _, tipo = analizar_ecuacion_rlc(R, L, C, Q0, I0, V0, omega)
 
-    # Ocultar objetos previos
-    hide_previous_objects()
+    # Las curvas se vacían y se reutilizan
+    serie_carga = CurvaBufferizada(curve_carga)
+    serie_carga.reiniciar()
+    serie_corriente = CurvaBufferizada(curve_corriente)
+    serie_corriente.reiniciar()
 
-    # Función de voltaje externo
-    def V(t):
-        return V0 * np.cos(omega * t)
+    # Ocultar objetos previos (también los de la red)
+    objetos.ocultar()
 
-    # ============================
-    # CONFIGURACIÓN DE ESCENA
-    # ============================
-    
     # Dimensiones del circuito
     circuit_width = 6
     circuit_height = 3
     
-    # Componentes del circuito
-    source = cylinder(pos=vector(-circuit_width/2, 0, 0), 
-                     axis=vector(0, circuit_height, 0),
-                     radius=0.15, color=color.orange)
-    source_label = label(pos=vector(-circuit_width/2 - 0.6, circuit_height/2, 0),
-                        text="V(t)", height=12, box=False, color=color.black)
+    # Componentes del circuito (creados la primera vez; después solo cambian los textos)
+    objetos.objeto("fuente", vp.cylinder, pos=vp.vector(-circuit_width/2, 0, 0),
+                   axis=vp.vector(0, circuit_height, 0),
+                   radius=0.15, color=vp.color.orange)
+    objetos.objeto("etiqueta_fuente", vp.label, pos=vp.vector(-circuit_width/2 - 0.6, circuit_height/2, 0),
+                   text="V(t)", height=12, box=False, color=vp.color.black)
     
-    resistor = box(pos=vector(0, circuit_height, 0),
-                  size=vector(1.2, 0.25, 0.25),
-                  color=color.red)
-    resistor_label = label(pos=vector(0, circuit_height + 0.4, 0),
-                          text=f"R={R:.1f}Ω", height=11, box=False, color=color.black)
+    objetos.objeto("resistencia", vp.box, pos=vp.vector(0, circuit_height, 0),
+                   size=vp.vector(1.2, 0.25, 0.25),
+                   color=vp.color.red)
+    objetos.objeto("etiqueta_resistencia", vp.label, pos=vp.vector(0, circuit_height + 0.4, 0),
+                   text=f"R={R:.1f}Ω", height=11, box=False, color=vp.color.black)
     
-    inductor = helix(pos=vector(circuit_width/2 - 0.8, circuit_height, 0),
-                    axis=vector(0, -1.2, 0),
-                    radius=0.25, coils=7, thickness=0.06,
-                    color=color.blue)
-    inductor_label = label(pos=vector(circuit_width/2 + 0.6, circuit_height - 0.6, 0),
-                          text=f"L={L:.1f}H", height=11, box=False, color=color.black)
+    objetos.objeto("bobina", vp.helix, pos=vp.vector(circuit_width/2 - 0.8, circuit_height, 0),
+                   axis=vp.vector(0, -1.2, 0),
+                   radius=0.25, coils=7, thickness=0.06,
+                   color=vp.color.blue)
+    objetos.objeto("etiqueta_bobina", vp.label, pos=vp.vector(circuit_width/2 + 0.6, circuit_height - 0.6, 0),
+                   text=f"L={L:.1f}H", height=11, box=False, color=vp.color.black)
     
-    cap1 = box(pos=vector(circuit_width/2, 0.8, 0),
-              size=vector(0.25, 0.6, 0.5), color=color.green)
-    cap2 = box(pos=vector(circuit_width/2, 0.4, 0),
-              size=vector(0.25, 0.6, 0.5), color=color.green)
-    capacitor_label = label(pos=vector(circuit_width/2 + 0.6, 0.6, 0),
-                           text=f"C={C:.2f}F", height=11, box=False, color=color.black)
+    objetos.objeto("placa_1", vp.box, pos=vp.vector(circuit_width/2, 0.8, 0),
+                   size=vp.vector(0.25, 0.6, 0.5), color=vp.color.green)
+    objetos.objeto("placa_2", vp.box, pos=vp.vector(circuit_width/2, 0.4, 0),
+                   size=vp.vector(0.25, 0.6, 0.5), color=vp.color.green)
+    objetos.objeto("etiqueta_condensador", vp.label, pos=vp.vector(circuit_width/2 + 0.6, 0.6, 0),
+                   text=f"C={C:.2f}F", height=11, box=False, color=vp.color.black)
     
     # Cables
-    wire1 = cylinder(pos=vector(-circuit_width/2, circuit_height, 0),
-                    axis=vector(circuit_width/2 - 0.6, 0, 0),
-                    radius=0.04, color=color.gray(0.3))
-    wire2 = cylinder(pos=vector(circuit_width/2 - 0.6, circuit_height, 0),
-                    axis=vector(0.6, 0, 0),
-                    radius=0.04, color=color.gray(0.3))
-    wire3 = cylinder(pos=vector(circuit_width/2, 0, 0),
-                    axis=vector(-circuit_width, 0, 0),
-                    radius=0.04, color=color.gray(0.3))
-    
-    # Múltiples partículas de carga (más visibles)
+    objetos.objeto("cable_1", vp.cylinder, pos=vp.vector(-circuit_width/2, circuit_height, 0),
+                   axis=vp.vector(circuit_width/2 - 0.6, 0, 0),
+                   radius=0.04, color=vp.color.gray(0.3))
+    objetos.objeto("cable_2", vp.cylinder, pos=vp.vector(circuit_width/2 - 0.6, circuit_height, 0),
+                   axis=vp.vector(0.6, 0, 0),
+                   radius=0.04, color=vp.color.gray(0.3))
+    objetos.objeto("cable_3", vp.cylinder, pos=vp.vector(circuit_width/2, 0, 0),
+                   axis=vp.vector(-circuit_width, 0, 0),
+                   radius=0.04, color=vp.color.gray(0.3))
+
+    # Puntos del circuito (arreglo en caché)
+    circuit_path = camino_circuito(circuit_width, circuit_height)
+
+    # Múltiples partículas de carga (más visibles), distribuidas uniformemente
     num_charges = 8
-    charges = []
-    for i in range(num_charges):
-        charge = sphere(radius=0.15, color=color.yellow,
-                       make_trail=True, trail_type="points",
-                       trail_radius=0.05, interval=3, retain=50)
-        charges.append(charge)
+    path_indices = (np.arange(num_charges) * len(circuit_path)) // num_charges
+    charges = [objetos.objeto(f"carga_{i}", vp.sphere, pos=vp.vector(*punto),
+                              radius=0.15, color=vp.color.yellow,
+                              make_trail=True, trail_type="points",
+                              trail_radius=0.05, interval=3, retain=50)
+               for i, punto in enumerate(circuit_path[path_indices])]
     
     # Labels informativos
-    label_Q = label(text=f"Carga: {Q0:.2f} C", pos=vector(0, -1.5, 0),
-                   box=False, height=14, color=color.black)
-    label_I = label(text=f"Corriente: {I0:.2f} A", pos=vector(0, -1.9, 0),
-                   box=False, height=14, color=color.black)
-    label_V = label(text=f"Voltaje: {V(0):.2f} V", pos=vector(0, -2.3, 0),
-                   box=False, height=14, color=color.black)
+    label_Q = objetos.objeto("etiqueta_carga", vp.label, text=f"Carga: {Q0:.2f} C",
+                             pos=vp.vector(0, -1.5, 0), box=False, height=14, color=vp.color.black)
+    label_I = objetos.objeto("etiqueta_corriente", vp.label, text=f"Corriente: {I0:.2f} A",
+                             pos=vp.vector(0, -1.9, 0), box=False, height=14, color=vp.color.black)
+    label_V = objetos.objeto("etiqueta_voltaje", vp.label, text=f"Voltaje: {rlc.voltaje(0, V0, omega):.2f} V",
+                             pos=vp.vector(0, -2.3, 0), box=False, height=14, color=vp.color.black)
     
     # Indicador de tipo de amortiguamiento
-    label_tipo = label(text=f"Régimen: {tipo}", pos=vector(0, -2.7, 0),
-                      box=True, height=12, color=color.black)
-    if tipo == "sobreamortiguado":
-        label_tipo.color = color.blue
-    elif tipo == "subamortiguado":
-        label_tipo.color = color.red
+    label_tipo = objetos.objeto("etiqueta_tipo", vp.label, text=f"Régimen: {tipo}",
+                                pos=vp.vector(0, -2.7, 0), box=True, height=12, color=vp.color.black)
+    mostrar_tipo(label_tipo, tipo)
+
+    # Textos con frecuencia limitada (solo se envían si cambian)
+    textos = [TextoLimitado(label_Q, "Carga: {:.3f} C"),
+              TextoLimitado(label_I, "Corriente: {:.3f} A"),
+              TextoLimitado(label_V, "Voltaje: {:.3f} V"),
+              TextoLimitado(salida_info, "\nTiempo actual: {:.2f} s\n")]
+
+    return SimpleNamespace(p=p, charges=charges, circuit_path=circuit_path,
+                           path_indices=path_indices, intensidad_mostrada=None,
+                           textos=textos, label_tipo=label_tipo,
+                           serie_carga=serie_carga, serie_corriente=serie_corriente)
+
+
+def actualizar_escena(escena, t, estado, dt_fotograma):
+    """Dibuja un fotograma: estado = [Q, I] en el instante t."""
+    texto_Q, texto_I, texto_V, texto_tiempo = escena.textos
+    Q, I = estado
+
+    # Actualizar etiquetas
+    texto_Q.actualizar(Q)
+    texto_I.actualizar(I)
+    texto_V.actualizar(rlc.voltaje(t, escena.p["V0"], escena.p["omega"]))
+    texto_tiempo.actualizar(t)
+
+    # Animar las cargas - velocidad proporcional a la corriente
+    # Factor de escala mejorado para mejor visualización
+    speed_factor = 15.0 * abs(I) + 0.5  # Mínimo 0.5 para que siempre se muevan un poco
+    steps = max(1, int(speed_factor * dt_fotograma * 100))
+
+    # Todas las cargas avanzan a la vez con aritmética modular
+    escena.path_indices = (escena.path_indices + (steps if I > 0 else -steps)) % len(escena.circuit_path)
+    for charge, punto in zip(escena.charges, escena.circuit_path[escena.path_indices]):
+        charge.pos = vp.vector(*punto)
+
+    # Color y tamaño según intensidad de corriente (solo si cambian)
+    intensity = round(min(abs(I) / 1.5, 1.0), 2)
+    if intensity != escena.intensidad_mostrada:
+        escena.intensidad_mostrada = intensity
+        color_carga = vp.vector(1, 1-intensity*0.7, 0.2)
+        radio_carga = 0.12 + intensity * 0.08
+        for charge in escena.charges:
+            charge.color = color_carga
+            charge.radius = radio_carga
+
+
+def aplicar_en_vivo(escena, cambios, tiempos, Q_t, I_t, n):
+    """
+    Aplica a la ejecución en curso los parámetros nuevos: la solución se
+    recalcula desde la muestra n en adelante, con Q e I actuales.
+    """
+    escena.p = dict(escena.p, **{nombre: cambios[nombre] for nombre in PARAMETROS_EN_VIVO})
+    p = escena.p
+    Q_t[n:], I_t[n:] = rlc.solucion_analitica(tiempos[n:], p["R"], p["L"], p["C"], Q_t[n], I_t[n],
+                                              p["V0"], p["omega"], t0=tiempos[n])
+
+
+def texto_muestreo(p, dt):
+    """Paso de muestreo de la solución cerrada y límites de los integradores explícitos."""
+    seleccion = rlc.elegir_integrador(p["R"], p["L"], p["C"], p["omega"], T_FINAL, dt)
+    return texto_seleccion(seleccion, encabezado=f"Solución cerrada muestreada cada dt = {dt:.4g} s")
+
+
+def resolver_en_vivo(escena, tiempos, Q_t, I_t):
+    """Rehace el análisis y redibuja las curvas con la solución actual."""
+    p = escena.p
+    ec_texto, analisis, tipo = analizar_ecuacion_rlc(p["R"], p["L"], p["C"], p["Q0"], p["I0"],
+                                                     p["V0"], p["omega"])
+    ecuacion_params.text = f"Ecuación con parámetros:\n{ec_texto}"
+    analisis_ec.text = analisis + texto_muestreo(p, tiempos[1] - tiempos[0])
+    mostrar_tipo(escena.label_tipo, tipo)
+    escena.serie_carga.reiniciar(tiempos, Q_t)
+    escena.serie_corriente.reiniciar(tiempos, I_t)
+
+
+def simular(ev):
+    global en_vivo
+
+    # Leer parámetros desde sliders
+    p = leer_parametros()
+    R, L, C, Q0, I0, V0, omega = (p[n] for n in ("R", "L", "C", "Q0", "I0", "V0", "omega"))
+
+    # Una configuración ya calculada reutiliza su análisis y su solución
+    clave = clave_parametros("rlc", p)
+    guardado = cache.obtener(clave)
+
+    # Analizar ecuación; el paso de la malla de tiempos sale de las raíces
+    # características: un fotograma si el circuito es lento, menos si es rápido
+    if guardado is None:
+        ec_texto, analisis, tipo = analizar_ecuacion_rlc(R, L, C, Q0, I0, V0, omega)
+        dt = rlc.elegir_integrador(R, L, C, omega, T_FINAL, VELOCIDAD / FPS)["dt_muestreo"]
+        analisis += texto_muestreo(p, dt)
     else:
-        label_tipo.color = color.green
-    
-    created_objects.extend([source, source_label, resistor, resistor_label,
-                           inductor, inductor_label, cap1, cap2, capacitor_label,
-                           wire1, wire2, wire3, label_Q, label_I, label_V, label_tipo])
-    created_objects.extend(charges)
+        ec_texto, analisis = guardado["ec_texto"], guardado["analisis"]
+    ecuacion_params.text = f"Ecuación con parámetros:\n{ec_texto}"
+    analisis_ec.text = analisis
+
+    # ============================
+    # CONFIGURACIÓN DE ESCENA
+    # ============================
+    escena = construir_escena(p)
 
     # ============================
     # VARIABLES DE SIMULACIÓN
     # ============================
-    t = 0
-    dt = 0.005
-    Q = Q0
-    I = I0
-    
-    # Puntos del circuito
-    circuit_path = []
-    for y in np.linspace(0, circuit_height, 25):
-        circuit_path.append(vector(-circuit_width/2, y, 0))
-    for x in np.linspace(-circuit_width/2, circuit_width/2, 35):
-        circuit_path.append(vector(x, circuit_height, 0))
-    for y in np.linspace(circuit_height, 0, 25):
-        circuit_path.append(vector(circuit_width/2, y, 0))
-    for x in np.linspace(circuit_width/2, -circuit_width/2, 35):
-        circuit_path.append(vector(x, 0, 0))
-    
-    # Índices iniciales para cada carga (distribuidas uniformemente)
-    path_indices = [int(i * len(circuit_path) / num_charges) for i in range(num_charges)]
-    for i, charge in enumerate(charges):
-        charge.pos = circuit_path[path_indices[i]]
-    
-    contador_graficas = 0
+    # Solución analítica completa evaluada sobre toda la malla de tiempos;
+    # al terminar se graba entera para poder repetirla sin recalcular
+    if guardado is None:
+        tiempos = np.arange(0, T_FINAL, dt)
+        Q_t, I_t = rlc.solucion_analitica(tiempos, R, L, C, Q0, I0, V0, omega)
+        cache.guardar(clave, dict(ec_texto=ec_texto, analisis=analisis, tipo=tipo,
+                                  datos=np.column_stack([tiempos, Q_t, I_t])))
+    else:
+        # Copia: el modo en vivo puede reescribir las series
+        tiempos, Q_t, I_t = guardado["datos"].T.copy()
+        dt = tiempos[1] - tiempos[0]
+
+    # Gráficas completas en un solo envío, reducidas con LTTB
+    escena.serie_carga.agregar_serie(tiempos, Q_t)
+    escena.serie_corriente.agregar_serie(tiempos, I_t)
 
     # ============================
     # BUCLE DE SIMULACIÓN
@@ -320,59 +427,245 @@ def simular(ev):
         nonlocal running
         running = False
     
-    boton_detener = button(text="Detener simulación", bind=stop_simulation)
-    created_objects.append(boton_detener)
+    boton_detener = vp.button(text="Detener simulación", bind=stop_simulation)
     
-    while running and t < 20:
-        rate(200)
-
-        # EDO: L·Q'' + R·Q' + Q/C = V(t)
-        dI_dt = (V(t) - R*I - Q/C) / L
-
-        # Actualizar corriente y carga
-        I += dI_dt * dt
-        Q += I * dt
-
-        # Actualizar etiquetas
-        label_Q.text = f"Carga: {Q:.3f} C"
-        label_I.text = f"Corriente: {I:.3f} A"
-        label_V.text = f"Voltaje: {V(t):.3f} V"
-        
-        salida_info.text = f"\nTiempo actual: {t:.2f} s\n"
-
-        # Animar las cargas - velocidad proporcional a la corriente
-        # Factor de escala mejorado para mejor visualización
-        speed_factor = 15.0 * abs(I) + 0.5  # Mínimo 0.5 para que siempre se muevan un poco
-        steps = max(1, int(speed_factor * dt * 100))
-        
-        for idx, charge in enumerate(charges):
-            for _ in range(steps):
-                if I > 0:
-                    path_indices[idx] = (path_indices[idx] + 1) % len(circuit_path)
-                else:
-                    path_indices[idx] = (path_indices[idx] - 1) % len(circuit_path)
-            
-            charge.pos = circuit_path[path_indices[idx]]
-            
-            # Color según intensidad de corriente
-            intensity = min(abs(I) / 1.5, 1.0)
-            charge.color = vector(1, 1-intensity*0.7, 0.2)
-            
-            # Tamaño según intensidad
-            charge.radius = 0.12 + intensity * 0.08
-
-        # Agregar puntos a las gráficas
-        contador_graficas += 1
-        if contador_graficas % 3 == 0:
-            curve_carga.plot(t, Q)
-            curve_corriente.plot(t, I)
-
-        t += dt
+    # Un fotograma por iteración: se muestra una muestra de cada `salto`
+    salto = max(1, int(round(VELOCIDAD / (FPS * dt))))
+    dt_fotograma = salto * dt
+    en_vivo = CambiosEnVivo()
+    for n in range(0, len(tiempos), salto):
+        if not running:
+            break
+        vp.rate(FPS)
+
+        # Modo en vivo: la solución se recalcula desde el estado actual
+        cambios = en_vivo.tomar()
+        if cambios is not None:
+            aplicar_en_vivo(escena, cambios, tiempos, Q_t, I_t, n)
+        if en_vivo.listo():
+            resolver_en_vivo(escena, tiempos, Q_t, I_t)
+
+        # Carga y corriente de la solución analítica
+        actualizar_escena(escena, tiempos[n], (Q_t[n], I_t[n]), dt_fotograma)
+
+    for texto in escena.textos:
+        texto.forzar()
+    en_vivo = None
+
+    boton_detener.delete()
+
+    with Grabacion(ARCHIVO_GRABACION, "rlc", ["t", "Q", "I"], p) as grabacion:
+        grabacion.agregar_bloque(tiempos, np.column_stack([Q_t, I_t]))
+
+
+def reproducir(ev):
+    """Repite la última simulación grabada, sin volver a calcularla."""
+    if not os.path.exists(ARCHIVO_GRABACION):
+        salida_info.text = "\nNo hay ninguna simulación grabada todavía\n"
+        return
+    trayectoria = abrir_grabacion(ARCHIVO_GRABACION)
+    escena = construir_escena(trayectoria.parametros)
+    reproductor = Reproductor(trayectoria, VELOCIDAD)
+
+    # Las curvas completas salen directamente del archivo
+    escena.serie_carga.agregar_serie(trayectoria.t, trayectoria["Q"])
+    escena.serie_corriente.agregar_serie(trayectoria.t, trayectoria["I"])
+
+    running = True
+
+    def stop_simulation(ev):
+        nonlocal running
+        running = False
+
+    # Botón para detener y slider para moverse por la grabación
+    boton_detener = vp.button(text="Detener reproducción", bind=stop_simulation)
+    slider_posicion = vp.slider(min=0, max=reproductor.t_final, value=0,
+                                bind=lambda s: reproductor.saltar(s.value))
+
+    for t, estado, _ in reproductor.fotogramas(vp.rate):
+        if not running:
+            break
+        actualizar_escena(escena, t, estado, VELOCIDAD / FPS)
+
+    for texto in escena.textos:
+        texto.forzar()
+    boton_detener.delete()
+    slider_posicion.delete()
+
+
+
+# -------------------------------------------------
+# REDES POR NETLIST
+# -------------------------------------------------
 
+def crear_escena_red():
+    """Pool de barras de tensión y gráfica de la red."""
+    graph_tensiones = vp.graph(title="Red: tensiones de nodo",
+                               xtitle="Tiempo (s)", ytitle="Tensión (V)",
+                               width=650, height=300, align="right")
+    colores = [vp.color.blue, vp.color.green, vp.color.red]
+    curvas = [vp.gcurve(graph=graph_tensiones, color=color, width=2, label="") for color in colores]
+    return SimpleNamespace(
+        barras=objetos.pool("barras_red", lambda: vp.cylinder(axis=vp.vector(0, 1, 0), radius=0.15,
+                                                              color=vp.color.orange)),
+        curvas=curvas, series=[CurvaBufferizada(c) for c in curvas])
+
+
+def netlist_elegida(p):
+    """Texto de la netlist del menú con los valores de los sliders."""
+    R, L, C, V0, omega = (p[n] for n in ("R", "L", "C", "V0", "omega"))
+    if menu_red.selected == "Serie RLC":
+        return serie_rlc(R, L, C, V0, omega)
+    if menu_red.selected == "Escalera LC":
+        return escalera_lc(int(slider_secciones.value), R, L, C, V0, omega)
+    with open(entrada_netlist.text.strip()) as archivo:
+        return archivo.read()
+
+
+def simular_red(ev):
+    """
+    Arma el circuito del menú por análisis nodal modificado y lo integra con
+    TR-BDF2 (motor.mna). Las tensiones de hasta NODOS_MOSTRADOS nodos se
+    dibujan como barras; la gráfica sigue el primer nodo, el del medio y el
+    último. En el circuito serie compara Q e I con la solución cerrada.
+    """
+    global escena_red
+    if escena_red is None:
+        escena_red = crear_escena_red()
+    escena = escena_red
+
+    p = leer_parametros()
+    try:
+        circuito = CircuitoMNA.desde_netlist(netlist_elegida(p))
+    except (OSError, ValueError) as error:
+        salida_info.text = f"\nNo se pudo leer la netlist: {error}\n"
+        return
+    objetos.ocultar()
+
+    serie = menu_red.selected == "Serie RLC"
+    if serie:
+        estado0 = circuito.estado(tensiones={"3": p["Q0"] / p["C"]}, corrientes={"L1": p["I0"]})
+    else:
+        estado0 = circuito.estado()
+    # L-estable: dt solo se limita por la resolución de las fuentes
+    omega_max = circuito.omegas.max(initial=0.0)
+    dt = VELOCIDAD / FPS
+    if omega_max > 0:
+        dt = min(dt, 2 * np.pi / omega_max / PASOS_POR_PERIODO)
+    productor = ProductorPasoFijo(circuito.paso, estado0, dt, {}, capacidad=CAPACIDAD_RED)
+
+    ecuacion_params.text = "Ecuación con parámetros: C·x' + G·x = b(t) (análisis nodal modificado)\n\n"
+    analisis_ec.text = circuito.resumen() + f"dt = {dt:.4g} s\n"
+
+    # Nodos dibujados, repartidos por toda la red
+    nombres = list(circuito.nodos)
+    dibujados = np.unique(np.linspace(0, len(nombres) - 1, min(NODOS_MOSTRADOS, len(nombres))).astype(int))
+    indices = np.array([circuito.nodos[nombres[i]] for i in dibujados])
+    barras = escena.barras.tomar(len(dibujados))
+    ancho = 8.0
+    for barra, x in zip(barras, np.linspace(-ancho / 2, ancho / 2, len(barras))):
+        barra.pos = vp.vector(x, 0, 0)
+    # Altura de 2 para la mayor tensión de las fuentes o del estado inicial
+    referencia = max(np.abs(circuito.amplitudes).max(initial=0.0),
+                     np.abs(estado0[:len(nombres)]).max(initial=0.0))
+    escala = 2.0 / referencia if referencia > 0 else 1.0
+    etiqueta = objetos.objeto("etiqueta_red", vp.label, pos=vp.vector(0, 3.5, 0), text="",
+                              box=False, height=14)
+    texto = TextoLimitado(etiqueta, "Tiempo: {:.2f} s")
+
+    seguidos = [nombres[0], nombres[len(nombres) // 2], nombres[-1]]
+    for curva, serie_curva, nodo in zip(escena.curvas, escena.series, seguidos):
+        curva.label = f"v({nodo})"
+        serie_curva.reiniciar()
+
+    running = True
+    def stop_simulation(ev):
+        nonlocal running
+        running = False
+    boton_detener = vp.button(text="Detener red", bind=stop_simulation)
+
+    for t, estado in fotogramas(productor, vp.rate, VELOCIDAD, T_FINAL):
+        if not running:
+            break
+        for barra, v in zip(barras, estado[indices]):
+            barra.axis = vp.vector(0, escala * v, 0)
+        texto.actualizar(t)
+        for serie_curva, nodo in zip(escena.series, seguidos):
+            serie_curva.agregar(t, estado[circuito.nodos[nodo]])
+
+    for serie_curva in escena.series:
+        serie_curva.enviar()
+    texto.forzar()
     boton_detener.delete()
 
-# Botón para iniciar simulación
-boton_iniciar = button(text="▶ Iniciar simulación", bind=simular)
+    salida_info.text = f"\nRed: {productor.n_pasos} pasos TR-BDF2 de {dt:.4g} s\n"
+    if serie:
+        # El lazo único como caso particular: comparación con la solución cerrada
+        Q, I = rlc.solucion_analitica(np.array([productor.t]), p["R"], p["L"], p["C"], p["Q0"], p["I0"],
+                                      p["V0"], p["omega"])
+        estado = productor.estado[0]
+        salida_info.text += (f"Frente a la solución cerrada en t = {productor.t:.2f} s: "
+                             f"error en Q {abs(circuito.carga(estado, 'C1') - Q[0]):.2e} C, "
+                             f"en I {abs(circuito.corriente(estado, 'L1') - I[0]):.2e} A\n")
+
+
+# -------------------------------------------------
+# RESPUESTA EN FRECUENCIA
+# -------------------------------------------------
+
+def crear_graficas_bode():
+    """Gráficas de amplitud (relativa a C·V₀) y fase de Q_p frente a ω."""
+    graph_amplitud = vp.graph(title="Respuesta en frecuencia: amplitud",
+                              xtitle="ω (rad/s)", ytitle="|Q_p| / (C·V₀)",
+                              width=650, height=300, align="right")
+    curva_amplitud = vp.gcurve(graph=graph_amplitud, color=vp.color.blue, width=2, label="Amplificación")
+    marca_amplitud = vp.gdots(graph=graph_amplitud, color=vp.color.red, radius=4, label="ω actual")
+
+    graph_fase = vp.graph(title="Respuesta en frecuencia: fase",
+                          xtitle="ω (rad/s)", ytitle="Fase (°)",
+                          width=650, height=300, align="right")
+    curva_fase = vp.gcurve(graph=graph_fase, color=vp.color.green, width=2, label="Fase")
+    marca_fase = vp.gdots(graph=graph_fase, color=vp.color.red, radius=4, label="ω actual")
+
+    return SimpleNamespace(amplitud=CurvaBufferizada(curva_amplitud), fase=CurvaBufferizada(curva_fase),
+                           marca_amplitud=marca_amplitud, marca_fase=marca_fase)
+
+
+def mostrar_respuesta_frecuencia(ev):
+    """Amplitud y fase del estado estacionario para los sliders actuales, sin integrar."""
+    global bode
+    if bode is None:
+        bode = crear_graficas_bode()
+
+    p = leer_parametros()
+    R, L, C, omega = p["R"], p["L"], p["C"], p["omega"]
+    res = rlc.resonancia(R, L, C)
+
+    # Una sola evaluación vectorizada sobre todo el rango de ω
+    omega_max = max(2 * res["omega_superior"], 2 * res["omega0"], 1.2 * omega)
+    omegas = np.linspace(0, omega_max, PUNTOS_BODE)
+    amplitud, fase = rlc.respuesta_frecuencia(np.append(omegas, omega), R, L, C)
+    amplitud = np.minimum(amplitud / C, AMPLIFICACION_MAXIMA)
+    fase = np.degrees(fase)
+
+    bode.amplitud.reiniciar(omegas, amplitud[:-1])
+    bode.fase.reiniciar(omegas, fase[:-1])
+    bode.marca_amplitud.data = [[omega, float(amplitud[-1])]]
+    bode.marca_fase.data = [[omega, float(fase[-1])]]
+
+    if res["omega_pico"] > 0:
+        pico = f"ω_r = {res['omega_pico']:.3f} rad/s, amplificación {res['amplitud_pico'] / C:.3f}"
+    else:
+        pico = "sin pico de resonancia"
+    salida_info.text = (f"\nRespuesta en frecuencia: {pico}, Δω = {res['ancho_banda']:.3f} rad/s, "
+                        f"Q = {res['Q']:.3f}\n")
+
+
+def main():
+    crear_interfaz()
+    # Evita que el script se cierre
+    input("Presiona ENTER para salir...")
+
 
-# Evita que el script se cierre
-input("Presiona ENTER para salir...")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -1,220 +1,374 @@
 
 #pip install vpython
-from vpython import *
 import numpy as np
+import os
+import sys
+from types import SimpleNamespace
+
+# Motor numérico compartido (Simulaciones/motor)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from motor import cadena, compilado, masa_resorte
+from motor.buffer import FPS, ProductorPasoFijo, fotogramas
+from motor.graficas import CurvaBufferizada
+from motor.cache import cache_simulacion, clave_parametros
+from motor.grabacion import Grabacion, Reproductor, Trayectoria, abrir as abrir_grabacion
+from motor.grabacion import guardar as guardar_grabacion
+from motor.textos import TextoLimitado
+from motor.vivo import CambiosEnVivo, prediccion
+from motor.interfaz import GestorEscena, cargar_vpython
+from motor.lineal import NOMBRES_INTEGRADORES, texto_seleccion
+from motor.masa_resorte import analizar_ecuacion
+
+# VPython se carga en crear_interfaz(); importar el script no abre ninguna ventana
+vp = None
+
+# Objetos 3D de todas las escenas: se crean una sola vez y cada ejecución
+# los reconfigura (ver motor.interfaz.GestorEscena)
+objetos = GestorEscena()
+
+# Duración y ritmo de la animación
+T_FINAL = 20
+VELOCIDAD = 2.0    # segundos simulados por segundo real
+
+# Integradores del menú: texto -> nombre en masa_resorte.INTEGRADORES
+# ("auto" elige según las raíces características, ver lineal.elegir_integrador)
+MENU_INTEGRADORES = {
+    "Automático (según autovalores)": "auto",
+    "Euler semi-implícito": "euler",
+    "Verlet de velocidades": "verlet",
+    "Yoshida (4º orden)": "yoshida4",
+    "Runge-Kutta 4": "rk4",
+    "Propagador exacto": "exacto",
+}
+# Paso de Euler (el de la simulación original)
+DT_EULER = 0.01
+# Los demás integradores usan el mayor dt, hasta uno por fotograma, cuya
+# deriva relativa de energía no supere este presupuesto
+PRESUPUESTO_DERIVA = 1e-3
+
+# Archivo donde se graba la última simulación (ver motor.grabacion)
+ARCHIVO_GRABACION = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ultima_simulacion.tray")
+COLUMNAS = ["t", "x", "v"]
+
+# Análisis y trayectorias de las últimas configuraciones (ver motor.cache)
+cache = cache_simulacion("masa_resorte")
+
+# Parámetros que los sliders pueden cambiar durante una ejecución
+PARAMETROS_EN_VIVO = ("m", "b", "k", "A", "w")
+# Cambios pendientes de la ejecución en curso (None si no hay ninguna)
+en_vivo = None
+
+# Respuesta en frecuencia: frecuencias evaluadas y tope de la amplificación
+# dibujada (sin amortiguamiento el pico es infinito)
+PUNTOS_BODE = 2000
+AMPLIFICACION_MAXIMA = 100.0
+# Gráficas de amplitud y fase (se crean al pedirlas por primera vez)
+bode = None
+
+# Cadena de N masas: masas dibujadas como máximo (una ventana alrededor de
+# la forzada), separación en equilibrio, pasos por periodo del modo más
+# rápido, estados en el buffer y cada cuántos fotogramas se rehace el perfil
+MASAS_MOSTRADAS = 30
+SEPARACION_CADENA = 1.0
+PASOS_POR_PERIODO = 20
+CAPACIDAD_CADENA = 8
+FOTOGRAMAS_PERFIL = 6
+# Objetos y gráficas de la cadena (se crean la primera vez que se usan)
+escena_cadena = None
 
 # -------------------------------------------------
 # ESCENA BASE
 # -------------------------------------------------
-scene = canvas(title="Sistema Masa-Resorte-Amortiguador",
-               width=1200, height=700, background=color.white)
-
-# Gráfica
-graph_window = graph(title="Posición vs Tiempo", 
-                     xtitle="Tiempo (s)", ytitle="Posición (m)",
-                     width=600, height=400, align="right")
-pos_curve = gcurve(color=color.blue, width=2, label="x(t)")
-
-# lista para llevar los objetos creados en cada ejecución
-created_objects = []
-
-wtext(text="\n--- Parámetros del Sistema ---\n")
-
-# Sliders con valores dinámicos
-# --- Masa ---
-texto_m = wtext(text="Masa (m): 1.00 kg\n")
-def actualizar_m(s):
-    texto_m.text = f"Masa (m): {s.value:.2f} kg\n"
-slider_m = slider(min=0.1, max=5.0, value=1.0, step=0.1, bind=actualizar_m)
-
-# --- Constante del resorte ---
-texto_k = wtext(text="\nConstante del resorte (k): 4.00 N/m\n")
-def actualizar_k(s):
-    texto_k.text = f"\nConstante del resorte (k): {s.value:.2f} N/m\n"
-slider_k = slider(min=0.5, max=20.0, value=4.0, step=0.5, bind=actualizar_k)
-
-# --- Coeficiente de amortiguamiento ---
-texto_b = wtext(text="\nCoeficiente de amortiguamiento (b): 0.30\n")
-def actualizar_b(s):
-    texto_b.text = f"\nCoeficiente de amortiguamiento (b): {s.value:.2f}\n"
-slider_b = slider(min=0.0, max=2.0, value=0.3, step=0.05, bind=actualizar_b)
-
-# --- Posición inicial ---
-texto_x0 = wtext(text="\nPosición inicial (x₀): 1.00 m\n")
-def actualizar_x0(s):
-    texto_x0.text = f"\nPosición inicial (x₀): {s.value:.2f} m\n"
-slider_x0 = slider(min=-2.0, max=2.0, value=1.0, step=0.1, bind=actualizar_x0)
-
-# --- Velocidad inicial ---
-texto_v0 = wtext(text="\nVelocidad inicial (v₀): 0.00 m/s\n")
-def actualizar_v0(s):
-    texto_v0.text = f"\nVelocidad inicial (v₀): {s.value:.2f} m/s\n"
-slider_v0 = slider(min=-5.0, max=5.0, value=0.0, step=0.1, bind=actualizar_v0)
-
-# --- Amplitud de fuerza externa ---
-texto_A = wtext(text="\nAmplitud fuerza externa (A): 1.00\n")
-def actualizar_A(s):
-    texto_A.text = f"\nAmplitud fuerza externa (A): {s.value:.2f}\n"
-slider_A = slider(min=0.0, max=3.0, value=1.0, step=0.1, bind=actualizar_A)
-
-# --- Frecuencia de fuerza externa ---
-texto_w = wtext(text="\nFrecuencia fuerza externa (ω): 1.50 rad/s\n")
-def actualizar_w(s):
-    texto_w.text = f"\nFrecuencia fuerza externa (ω): {s.value:.2f} rad/s\n"
-slider_w = slider(min=0.0, max=5.0, value=1.5, step=0.1, bind=actualizar_w)
-
-wtext(text="\n")
-
-# Mostrar ecuación diferencial general
-ecuacion_text = wtext(text="\nEcuación general: m·x'' + b·x' + k·x = A·cos(ω·t)\n")
-
-# Ecuación con parámetros sustituidos
-ecuacion_params = wtext(text="\nEcuación con parámetros: (calculando...)\n")
-
-# Análisis de la ecuación característica
-analisis_ec = wtext(text="\nAnálisis de la ecuación característica:\n")
-
-# Salidas numéricas
-salida_info = wtext(text="\nTiempo actual: 0.00 s\n")
+def crear_interfaz():
+    """Crea la ventana, las gráficas y los controles (carga VPython)."""
+    global vp, scene, graph_window, pos_curve, pred_curve, texto_m, slider_m, texto_k, slider_k, texto_b
+    global slider_b, texto_x0, slider_x0, texto_v0, slider_v0, texto_A, slider_A, texto_w
+    global slider_w, menu_integrador, ecuacion_text, ecuacion_params, analisis_ec, salida_info
+    global boton_iniciar, boton_repetir, texto_n_masas, slider_n_masas, texto_forzada, slider_forzada
+    vp = cargar_vpython()
+
+    scene = vp.canvas(title="Sistema Masa-Resorte-Amortiguador",
+                      width=1200, height=700, background=vp.color.white)
+
+    # Gráfica
+    graph_window = vp.graph(title="Posición vs Tiempo", 
+                            xtitle="Tiempo (s)", ytitle="Posición (m)",
+                            width=600, height=400, align="right")
+    pos_curve = vp.gcurve(color=vp.color.blue, width=2, label="x(t)")
+    pred_curve = vp.gcurve(color=vp.color.orange, width=1, label="Predicción")
+
+    vp.wtext(text="\n--- Parámetros del Sistema ---\n")
+
+    # Sliders con valores dinámicos
+    # --- Masa ---
+    texto_m = vp.wtext(text="Masa (m): 1.00 kg\n")
+    def actualizar_m(s):
+        texto_m.text = f"Masa (m): {s.value:.2f} kg\n"
+        avisar_cambio()
+    slider_m = vp.slider(min=0.1, max=5.0, value=1.0, step=0.1, bind=actualizar_m)
+
+    # --- Constante del resorte ---
+    texto_k = vp.wtext(text="\nConstante del resorte (k): 4.00 N/m\n")
+    def actualizar_k(s):
+        texto_k.text = f"\nConstante del resorte (k): {s.value:.2f} N/m\n"
+        avisar_cambio()
+    slider_k = vp.slider(min=0.5, max=20.0, value=4.0, step=0.5, bind=actualizar_k)
+
+    # --- Coeficiente de amortiguamiento ---
+    texto_b = vp.wtext(text="\nCoeficiente de amortiguamiento (b): 0.30\n")
+    def actualizar_b(s):
+        texto_b.text = f"\nCoeficiente de amortiguamiento (b): {s.value:.2f}\n"
+        avisar_cambio()
+    slider_b = vp.slider(min=0.0, max=2.0, value=0.3, step=0.05, bind=actualizar_b)
+
+    # --- Posición inicial ---
+    texto_x0 = vp.wtext(text="\nPosición inicial (x₀): 1.00 m\n")
+    def actualizar_x0(s):
+        texto_x0.text = f"\nPosición inicial (x₀): {s.value:.2f} m\n"
+    slider_x0 = vp.slider(min=-2.0, max=2.0, value=1.0, step=0.1, bind=actualizar_x0)
+
+    # --- Velocidad inicial ---
+    texto_v0 = vp.wtext(text="\nVelocidad inicial (v₀): 0.00 m/s\n")
+    def actualizar_v0(s):
+        texto_v0.text = f"\nVelocidad inicial (v₀): {s.value:.2f} m/s\n"
+    slider_v0 = vp.slider(min=-5.0, max=5.0, value=0.0, step=0.1, bind=actualizar_v0)
+
+    # --- Amplitud de fuerza externa ---
+    texto_A = vp.wtext(text="\nAmplitud fuerza externa (A): 1.00\n")
+    def actualizar_A(s):
+        texto_A.text = f"\nAmplitud fuerza externa (A): {s.value:.2f}\n"
+        avisar_cambio()
+    slider_A = vp.slider(min=0.0, max=3.0, value=1.0, step=0.1, bind=actualizar_A)
+
+    # --- Frecuencia de fuerza externa ---
+    texto_w = vp.wtext(text="\nFrecuencia fuerza externa (ω): 1.50 rad/s\n")
+    def actualizar_w(s):
+        texto_w.text = f"\nFrecuencia fuerza externa (ω): {s.value:.2f} rad/s\n"
+        avisar_cambio()
+    slider_w = vp.slider(min=0.0, max=5.0, value=1.5, step=0.1, bind=actualizar_w)
+
+    # --- Integrador ---
+    vp.wtext(text="\nIntegrador: ")
+    menu_integrador = vp.menu(choices=list(MENU_INTEGRADORES), selected="Automático (según autovalores)",
+                              bind=lambda m: None)
+
+    vp.wtext(text="\n")
+
+    # Mostrar ecuación diferencial general
+    ecuacion_text = vp.wtext(text="\nEcuación general: m·x'' + b·x' + k·x = A·cos(ω·t)\n")
+
+    # Ecuación con parámetros sustituidos
+    ecuacion_params = vp.wtext(text="\nEcuación con parámetros: (calculando...)\n")
+
+    # Análisis de la ecuación característica
+    analisis_ec = vp.wtext(text="\nAnálisis de la ecuación característica:\n")
+
+    # Salidas numéricas
+    salida_info = vp.wtext(text="\nTiempo actual: 0.00 s\n")
+
+    # Botón para iniciar simulación
+    boton_iniciar = vp.button(text="Iniciar simulación", bind=simular)
+    # Botón para repetir la última simulación grabada
+    boton_repetir = vp.button(text="⟲ Repetir última", bind=reproducir)
+    # Botón para la respuesta en frecuencia (sin simular)
+    vp.button(text="Respuesta en frecuencia", bind=mostrar_respuesta_frecuencia)
+
+    # --- Cadena de masas (m, k, b, A y ω iguales para todos los elementos) ---
+    vp.wtext(text="\n\n--- Cadena de masas ---\n")
+    texto_n_masas = vp.wtext(text="Número de masas (N): 20\n")
+    def actualizar_n_masas(s):
+        texto_n_masas.text = f"Número de masas (N): {int(s.value)}\n"
+        slider_forzada.max = int(s.value) - 1
+        if slider_forzada.value > slider_forzada.max:
+            slider_forzada.value = slider_forzada.max
+            actualizar_forzada(slider_forzada)
+    slider_n_masas = vp.slider(min=2, max=10000, value=20, step=1, bind=actualizar_n_masas)
+    texto_forzada = vp.wtext(text="\nMasa forzada (x₀, v₀ y la fuerza): 0\n")
+    def actualizar_forzada(s):
+        texto_forzada.text = f"\nMasa forzada (x₀, v₀ y la fuerza): {int(s.value)}\n"
+    slider_forzada = vp.slider(min=0, max=19, value=0, step=1, bind=actualizar_forzada)
+    vp.wtext(text="\n")
+    vp.button(text="Simular cadena", bind=simular_cadena)
+
 
 # -------------------------------------------------
-# FUNCIONES DE ANÁLISIS
+# FUNCIONES DE SIMULACIÓN
 # -------------------------------------------------
 
-def analizar_ecuacion(m, b, k, A, w):
-    """
-    Analiza la ecuación diferencial y determina el tipo de solución
-    Ecuación homogénea: m·x'' + b·x' + k·x = 0
-    Ecuación característica: m·r² + b·r + k = 0
-    """
-    # Ecuación con parámetros
-    if A == 0:
-        ec_texto = f"({m:.2f})·x'' + ({b:.2f})·x' + ({k:.2f})·x = 0\n"
-    else:
-        ec_texto = f"({m:.2f})·x'' + ({b:.2f})·x' + ({k:.2f})·x = ({A:.2f})·cos(({w:.2f})·t)\n"
+def avisar_cambio():
+    """Modo en vivo: anota los valores de los sliders para la ejecución en curso."""
+    if en_vivo is not None:
+        en_vivo.cambiar(leer_parametros())
+
+
+def leer_parametros():
+    """Parámetros actuales de los sliders."""
+    return dict(m=float(slider_m.value), k=float(slider_k.value), b=float(slider_b.value),
+                x0=float(slider_x0.value), v0=float(slider_v0.value),
+                A=float(slider_A.value), w=float(slider_w.value))
+
+
+def construir_escena(p):
+    """Prepara los objetos 3D, las etiquetas y la curva de una ejecución."""
+    # Las curvas se vacían y se reutilizan
+    serie_pos = CurvaBufferizada(pos_curve)
+    serie_pos.reiniciar()
+    serie_prediccion = CurvaBufferizada(pred_curve)
+    serie_prediccion.reiniciar()
+
+    # Ocultar objetos previos (también los de la cadena)
+    objetos.ocultar()
+
+    x0, v0 = p["x0"], p["v0"]
+
+    # Fixed wall
+    wall = objetos.objeto("pared", vp.box, pos=vp.vector(-3, 0, 0), size=vp.vector(0.2, 1, 1),
+                          color=vp.color.gray(0.5))
     
-    # Ecuación característica: m·r² + b·r + k = 0
-    # r = (-b ± sqrt(b² - 4mk)) / (2m)
-    discriminante = b**2 - 4*m*k
+    # Mass
+    mass = objetos.objeto("masa", vp.box, pos=vp.vector(x0, 0, 0), size=vp.vector(0.4, 0.4, 0.4),
+                          color=vp.color.red, make_trail=True, trail_type="points",
+                          trail_radius=0.02, interval=10, retain=200)
     
-    analisis = "\n--- Análisis de la Ecuación Característica ---\n"
-    analisis += f"Ecuación característica: ({m:.2f})·r² + ({b:.2f})·r + ({k:.2f}) = 0\n"
-    analisis += f"Discriminante Δ = b² - 4mk = {discriminante:.4f}\n\n"
+    # Spring (initial)
+    spring = objetos.objeto("resorte", vp.helix, pos=wall.pos + vp.vector(0.1, 0, 0),
+                            axis=mass.pos - (wall.pos + vp.vector(0.1, 0, 0)),
+                            radius=0.15, coils=12, thickness=0.03,
+                            color=vp.color.blue)
     
-    if discriminante > 0:
-        # Dos raíces reales distintas
-        r1 = (-b + np.sqrt(discriminante)) / (2*m)
-        r2 = (-b - np.sqrt(discriminante)) / (2*m)
-        analisis += "🔹 Caso: Sobreamortiguado (dos raíces reales distintas)\n"
-        analisis += f"   r₁ = {r1:.4f}\n"
-        analisis += f"   r₂ = {r2:.4f}\n"
-        analisis += f"   Solución homogénea: x_h(t) = C₁·e^({r1:.4f}·t) + C₂·e^({r2:.4f}·t)\n"
-    elif discriminante == 0:
-        # Raíz real doble
-        r = -b / (2*m)
-        analisis += "🔹 Caso: Críticamente amortiguado (raíz real doble)\n"
-        analisis += f"   r = {r:.4f}\n"
-        analisis += f"   Solución homogénea: x_h(t) = (C₁ + C₂·t)·e^({r:.4f}·t)\n"
-    else:
-        # Raíces complejas conjugadas
-        parte_real = -b / (2*m)
-        parte_imag = np.sqrt(-discriminante) / (2*m)
-        analisis += "🔹 Caso: Subamortiguado (raíces complejas conjugadas)\n"
-        analisis += f"   r = {parte_real:.4f} ± {parte_imag:.4f}i\n"
-        analisis += f"   Solución homogénea: x_h(t) = e^({parte_real:.4f}·t)·[C₁·cos({parte_imag:.4f}·t) + C₂·sin({parte_imag:.4f}·t)]\n"
-        
-        # Frecuencia natural y factor de amortiguamiento
-        w_n = np.sqrt(k/m)
-        zeta = b / (2*np.sqrt(m*k))
-        analisis += f"\n   Frecuencia natural: ω_n = {w_n:.4f} rad/s\n"
-        analisis += f"   Factor de amortiguamiento: ζ = {zeta:.4f}\n"
+    # Equilibrium marker
+    objetos.objeto("equilibrio", vp.cylinder, pos=vp.vector(0, -0.5, 0), axis=vp.vector(0, 1.0, 0),
+                   radius=0.02, color=vp.color.green)
     
-    if A > 0:
-        analisis += f"\n🔹 Solución particular (forzamiento): x_p(t) depende de cos({w:.2f}·t)\n"
-        analisis += "   Solución completa: x(t) = x_h(t) + x_p(t)\n"
+    # Labels informativos
+    label_pos = objetos.objeto("etiqueta_posicion", vp.label, text=f"Posición: {x0:.2f} m",
+                               pos=vp.vector(0, 1.5, 0), box=False, height=16)
+    label_vel = objetos.objeto("etiqueta_velocidad", vp.label, text=f"Velocidad: {v0:.2f} m/s",
+                               pos=vp.vector(0, 1.2, 0), box=False, height=16)
+    label_energia = objetos.objeto("etiqueta_energia", vp.label, text=f"Energía: calculando...",
+                                   pos=vp.vector(0, 0.9, 0), box=False, height=16)
+    label_deriva = objetos.objeto("etiqueta_deriva", vp.label, text="Deriva de energía: ---",
+                                  pos=vp.vector(0, 0.6, 0), box=False, height=12)
+
+    # Textos con frecuencia limitada (solo se envían si cambian)
+    textos = [TextoLimitado(label_pos, "Posición: {:.2f} m"),
+              TextoLimitado(label_vel, "Velocidad: {:.2f} m/s"),
+              TextoLimitado(label_energia, "Energía: {:.2f} J (Ec={:.2f}, Ep={:.2f})"),
+              TextoLimitado(salida_info, "\nTiempo actual: {:.2f} s\n")]
+
+    return SimpleNamespace(p=p, mass=mass, spring=spring, serie_pos=serie_pos, textos=textos,
+                           seleccion=None,
+                           serie_prediccion=serie_prediccion,
+                           texto_deriva=TextoLimitado(label_deriva,
+                                                      "Deriva de energía: {:+.2e} (máx {:.2e})"))
+
+
+def actualizar_escena(escena, t, estado):
+    """Dibuja un fotograma: estado = [x, v] en el instante t."""
+    texto_pos, texto_vel, texto_energia, texto_tiempo = escena.textos
+    x, v = estado
+
+    # Update mass position
+    escena.mass.pos = vp.vector(x, 0, 0)
+
+    # Update spring axis
+    escena.spring.axis = escena.mass.pos - escena.spring.pos
+
+    # Calcular energía total (aproximada)
+    E_cinetica, E_potencial, E_total = masa_resorte.energia(estado, escena.p["m"], escena.p["k"])
+
+    # Update labels
+    texto_pos.actualizar(x)
+    texto_vel.actualizar(v)
+    texto_energia.actualizar(E_total, E_cinetica, E_potencial)
     
-    return ec_texto, analisis
+    # Update time display
+    texto_tiempo.actualizar(t)
+
+    # Agregar punto a la gráfica (se envía por lotes)
+    escena.serie_pos.agregar(t, x)
+
+
+def resolver_en_vivo(escena, t, estado):
+    """Rehace el análisis y la predicción desde el estado actual."""
+    p = escena.p
+    ec_texto, analisis = analizar_ecuacion(p["m"], p["b"], p["k"], p["A"], p["w"])
+    if escena.seleccion is not None:
+        analisis += texto_seleccion(escena.seleccion)
+    ecuacion_params.text = f"\nEcuación con parámetros:\n{ec_texto}"
+    analisis_ec.text = analisis
+
+    tiempos, estados = prediccion("masa_resorte", t, estado, T_FINAL,
+                                  **{n: p[n] for n in PARAMETROS_EN_VIVO})
+    escena.serie_prediccion.reiniciar(tiempos, estados[:, 0])
 
-# -------------------------------------------------
-# FUNCIONES DE SIMULACIÓN
-# -------------------------------------------------
 
-def hide_previous_objects():
-    global created_objects
-    for obj in created_objects:
-        try:
-            obj.visible = False
-        except:
-            pass
-    created_objects = []
+def terminar_escena(escena):
+    """Envía los puntos y textos pendientes."""
+    escena.serie_pos.enviar()
+    for texto in escena.textos + [escena.texto_deriva]:
+        texto.forzar()
+
 
 def simular(ev):
-    global created_objects, pos_curve
+    global en_vivo
 
     # Leer parámetros desde sliders
-    m = float(slider_m.value)
-    k = float(slider_k.value)
-    b = float(slider_b.value)
-    x0 = float(slider_x0.value)
-    v0 = float(slider_v0.value)
-    A = float(slider_A.value)
-    w = float(slider_w.value)
+    p = leer_parametros()
+    m, k, b, A, w = p["m"], p["k"], p["b"], p["A"], p["w"]
+    integrador = MENU_INTEGRADORES[menu_integrador.selected]
+
+    # Una configuración ya simulada se reproduce sin analizar ni integrar
+    clave = clave_parametros(f"masa_resorte:{integrador}", p)
+    guardado = cache.obtener(clave)
+    if guardado is not None:
+        ecuacion_params.text = f"\nEcuación con parámetros:\n{guardado['ec_texto']}"
+        analisis_ec.text = guardado["analisis"]
+        trayectoria = Trayectoria(guardado["datos"], COLUMNAS, "masa_resorte", p)
+        guardar_grabacion(ARCHIVO_GRABACION, trayectoria)
+        reproducir_trayectoria(trayectoria)
+        return
 
     # Analizar ecuación
     ec_texto, analisis = analizar_ecuacion(m, b, k, A, w)
+    # Automático: integrador y dt a partir de las raíces características
+    seleccion = None
+    if integrador == "auto":
+        seleccion = masa_resorte.elegir_integrador(m, b, k, w, T_FINAL, VELOCIDAD / FPS)
+        integrador = seleccion["integrador"]
+        analisis += texto_seleccion(seleccion)
     ecuacion_params.text = f"\nEcuación con parámetros:\n{ec_texto}"
     analisis_ec.text = analisis
 
-    # Limpiar gráfica anterior
-    pos_curve.delete()
-    pos_curve = gcurve(color=color.blue, width=2, label="x(t)")
-
-    # Ocultar objetos previos
-    hide_previous_objects()
-
-    # Función de fuerza externa
-    def F(t):
-        return A * np.cos(w * t)
-
     # ============================
     # CONFIGURACIÓN DE ESCENA
     # ============================
-    
-    # Fixed wall
-    wall = box(pos=vector(-3, 0, 0), size=vector(0.2, 1, 1), color=color.gray(0.5))
-    
-    # Mass
-    mass = box(pos=vector(x0, 0, 0), size=vector(0.4, 0.4, 0.4), 
-               color=color.red, make_trail=True, trail_type="points", 
-               trail_radius=0.02, interval=10, retain=200)
-    
-    # Spring (initial)
-    spring = helix(pos=wall.pos + vector(0.1, 0, 0),
-                   axis=mass.pos - (wall.pos + vector(0.1, 0, 0)),
-                   radius=0.15, coils=12, thickness=0.03,
-                   color=color.blue)
-    
-    # Equilibrium marker
-    eq_marker = cylinder(pos=vector(0, -0.5, 0), axis=vector(0, 1.0, 0),
-                         radius=0.02, color=color.green)
-    
-    # Labels informativos
-    label_pos = label(text=f"Posición: {x0:.2f} m", pos=vector(0, 1.5, 0), 
-                      box=False, height=16)
-    label_vel = label(text=f"Velocidad: {v0:.2f} m/s", pos=vector(0, 1.2, 0), 
-                      box=False, height=16)
-    label_energia = label(text=f"Energía: calculando...", pos=vector(0, 0.9, 0),
-                         box=False, height=16)
-    
-    created_objects.extend([wall, mass, spring, eq_marker, label_pos, label_vel, label_energia])
+    escena = construir_escena(p)
+    escena.seleccion = seleccion
 
     # ============================
     # VARIABLES DE SIMULACIÓN
     # ============================
-    t = 0
-    dt = 0.01
-    x = x0
-    v = v0
+    if seleccion is not None:
+        dt = seleccion["dt"]
+    elif integrador == "euler":
+        dt = DT_EULER      # paso de la física
+    elif integrador == "exacto":
+        dt = VELOCIDAD / FPS    # exacto con cualquier dt: un paso por fotograma
+    else:
+        # Mayor paso que cumple el presupuesto de deriva de energía
+        dt, _ = masa_resorte.dt_maximo(integrador, PRESUPUESTO_DERIVA, T_FINAL, p["x0"], p["v0"],
+                                       m, b, k, A, w, dt_inicial=VELOCIDAD / FPS)
+
+    # Etapa física de paso fijo que escribe en un buffer circular (Euler usa
+    # el bucle escalar de motor.compilado, con Numba si está instalado)
+    productor = ProductorPasoFijo(masa_resorte.INTEGRADORES[integrador], [p["x0"], p["v0"]], dt,
+                                  dict(m=m, b=b, k=k, A=A, w=w),
+                                  avanzar=compilado.avanzar_masa_resorte if integrador == "euler"
+                                  else None)
+    # Telemetría: deriva de energía frente a dE/dt = F·v - b·v², medida
+    # sobre los estados de la física (no los interpolados)
+    balance = masa_resorte.BalanceEnergia(0.0, [p["x0"], p["v0"]], m, b, k, A, w)
 
     # ============================
     # BUCLE DE SIMULACIÓN
@@ -226,53 +380,266 @@ def simular(ev):
         running = False
     
     # Botón para detener
-    boton_detener = button(text="Detener simulación", bind=stop_simulation)
-    created_objects.append(boton_detener)
+    boton_detener = vp.button(text="Detener simulación", bind=stop_simulation)
     
-    while running:
-        rate(200)  # control animation speed
+    # Un fotograma por iteración; la física avanza lo necesario entre ellos.
+    # Cada fotograma se graba para poder repetirlo sin integrar.
+    en_vivo = CambiosEnVivo()
+    with Grabacion(ARCHIVO_GRABACION, "masa_resorte", COLUMNAS,
+                   dict(p, integrador=integrador, dt=dt)) as grabacion:
+        for t, estado in fotogramas(productor, vp.rate, VELOCIDAD, T_FINAL):
+            if not running:
+                break
+            # Modo en vivo: el cambio de un slider rige desde el paso siguiente
+            cambios = en_vivo.tomar()
+            if cambios is not None:
+                cambios = {n: cambios[n] for n in PARAMETROS_EN_VIVO}
+                escena.p = dict(escena.p, **cambios)
+                productor.actualizar_parametros(**cambios)
+                balance.reiniciar(productor.t, productor.estado[0], **cambios)
+                if seleccion is not None:
+                    # Se vuelve a elegir con los parámetros nuevos, sin cambiar
+                    # el dt de la física (un solo paso del dt actual)
+                    q = escena.p
+                    seleccion = escena.seleccion = masa_resorte.elegir_integrador(
+                        q["m"], q["b"], q["k"], q["w"], T_FINAL, dt, pasos_maximos=1)
+                    integrador = seleccion["integrador"]
+                    productor.paso = masa_resorte.INTEGRADORES[integrador]
+                    productor.avanzar = None
+            if en_vivo.listo():
+                resolver_en_vivo(escena, t, estado)
+            # ODE: m x'' + b x' + k x = F(t), estado interpolado del buffer
+            actualizar_escena(escena, t, estado)
+            grabacion.agregar(t, estado)
+            balance.agregar(productor.t, productor.estado[0])
+            escena.texto_deriva.actualizar(balance.deriva, balance.deriva_maxima)
+
+    terminar_escena(escena)
+    texto_tiempo = escena.textos[-1]
+    texto_tiempo.fijar(texto_tiempo.texto +
+                       f"Integrador: {NOMBRES_INTEGRADORES.get(integrador, menu_integrador.selected)}, "
+                       f"dt = {dt:.4g} s, "
+                       f"{productor.n_pasos} pasos, deriva máxima de energía: "
+                       f"{balance.deriva_maxima:.2e}\n")
+    modificada = en_vivo.n_cambios > 0
+    en_vivo = None
 
-        # ODE: m x'' + b x' + k x = F(t)
-        a = (F(t) - b*v - k*x) / m
+    # Limpiar botón de detener
+    boton_detener.delete()
 
-        # Update velocity & position
-        v += a * dt
-        x += v * dt
+    # Solo las ejecuciones completas y sin cambios en vivo se guardan en la caché
+    if running and not modificada:
+        cache.guardar(clave, dict(ec_texto=ec_texto, analisis=analisis,
+                                  datos=np.array(abrir_grabacion(ARCHIVO_GRABACION).datos)))
 
-        # Update mass position
-        mass.pos = vector(x, 0, 0)
 
-        # Update spring axis
-        spring.axis = mass.pos - spring.pos
+def reproducir(ev):
+    """Repite la última simulación grabada, sin volver a integrar."""
+    if not os.path.exists(ARCHIVO_GRABACION):
+        salida_info.text = "\nNo hay ninguna simulación grabada todavía\n"
+        return
+    reproducir_trayectoria(abrir_grabacion(ARCHIVO_GRABACION))
 
-        # Calcular energía total (aproximada)
-        E_cinetica = 0.5 * m * v**2
-        E_potencial = 0.5 * k * x**2
-        E_total = E_cinetica + E_potencial
 
-        # Update labels
-        label_pos.text = f"Posición: {x:.2f} m"
-        label_vel.text = f"Velocidad: {v:.2f} m/s"
-        label_energia.text = f"Energía: {E_total:.2f} J (Ec={E_cinetica:.2f}, Ep={E_potencial:.2f})"
-        
-        # Update time display
-        salida_info.text = f"\nTiempo actual: {t:.2f} s\n"
+def reproducir_trayectoria(trayectoria):
+    """Dibuja una trayectoria ya calculada al ritmo de la pantalla."""
+    escena = construir_escena(trayectoria.parametros)
+    reproductor = Reproductor(trayectoria, VELOCIDAD)
 
-        # Agregar punto a la gráfica (cada cierto tiempo para no saturar)
-        if int(t/dt) % 2 == 0:  # cada 2 iteraciones
-            pos_curve.plot(t, x)
+    running = True
 
-        t += dt
-        
-        # Detener después de un tiempo razonable
-        if t > 20:
-            running = False
+    def stop_simulation(ev):
+        nonlocal running
+        running = False
 
-    # Limpiar botón de detener
+    # Botón para detener y slider para moverse por la grabación
+    boton_detener = vp.button(text="Detener reproducción", bind=stop_simulation)
+    slider_posicion = vp.slider(min=0, max=reproductor.t_final, value=0,
+                                bind=lambda s: reproductor.saltar(s.value))
+
+    for t, estado, salto in reproductor.fotogramas(vp.rate):
+        if not running:
+            break
+        if salto:
+            # Rehacer la curva hasta el instante mostrado
+            i = trayectoria.indice_en(t)
+            escena.serie_pos.reiniciar(trayectoria.t[:i], trayectoria["x"][:i])
+        actualizar_escena(escena, t, estado)
+
+    terminar_escena(escena)
     boton_detener.delete()
+    slider_posicion.delete()
+
+
+# -------------------------------------------------
+# CADENA DE MASAS
+# -------------------------------------------------
+
+def crear_escena_cadena():
+    """Pools de masas, resortes y paredes y gráficas de la cadena."""
+    graph_perfil = vp.graph(title="Cadena: desplazamiento de cada masa",
+                            xtitle="Masa", ytitle="x (m)",
+                            width=600, height=300, align="right")
+    curva_perfil = vp.gcurve(graph=graph_perfil, color=vp.color.blue, width=2, label="x(i)")
+    graph_forzada = vp.graph(title="Cadena: masa forzada",
+                             xtitle="Tiempo (s)", ytitle="x (m)",
+                             width=600, height=300, align="right")
+    curva_forzada = vp.gcurve(graph=graph_forzada, color=vp.color.red, width=2, label="x forzada")
+
+    return SimpleNamespace(
+        cajas=objetos.pool("cajas_cadena", lambda: vp.box(size=vp.vector(0.4, 0.4, 0.4),
+                                                          color=vp.color.red)),
+        resortes=objetos.pool("resortes_cadena", lambda: vp.helix(radius=0.15, coils=8, thickness=0.03,
+                                                                  color=vp.color.blue)),
+        paredes=objetos.pool("paredes_cadena", lambda: vp.box(size=vp.vector(0.2, 1, 1),
+                                                              color=vp.color.gray(0.5))),
+        perfil=CurvaBufferizada(curva_perfil), forzada=CurvaBufferizada(curva_forzada))
+
+
+def simular_cadena(ev):
+    """
+    N masas entre dos paredes con los m, k y b de los sliders; x₀, v₀ y la
+    fuerza A·cos(ω·t) se aplican a la masa elegida. Toda la cadena se
+    integra con el paso implícito de motor.cadena y solo se dibuja una
+    ventana de MASAS_MOSTRADAS masas alrededor de la forzada.
+    """
+    global escena_cadena
+    if escena_cadena is None:
+        escena_cadena = crear_escena_cadena()
+    escena = escena_cadena
+    objetos.ocultar()
+
+    p = leer_parametros()
+    n = int(slider_n_masas.value)
+    forzada = min(int(slider_forzada.value), n - 1)
+    parametros = dict(cadena.coeficientes_cadena(n, p["m"], p["k"], p["b"],
+                                                 cadena.forzamiento(n, forzada, p["A"])), w=p["w"])
+    estado0 = np.zeros(2 * n)
+    estado0[forzada], estado0[n + forzada] = p["x0"], p["v0"]
+
+    ecuacion_params.text = "\nEcuación con parámetros: M·x'' + B·x' + K·x = A·cos(ω·t)\n"
+    analisis_ec.text = "\n" + cadena.analizar_cadena(parametros["m"], parametros["b"], parametros["k"],
+                                                     parametros["A"], p["w"])
+
+    # Implícito: el dt solo se limita por precisión en el modo más rápido
+    dt = min(VELOCIDAD / FPS,
+             2 * np.pi / cadena.omega_maxima(parametros["m"], parametros["k"]) / PASOS_POR_PERIODO)
+    productor = ProductorPasoFijo(cadena.paso_trapecio, estado0, dt, parametros,
+                                  capacidad=CAPACIDAD_CADENA)
+
+    # Ventana de masas dibujadas; sus vecinas (o las paredes) sujetan los resortes extremos
+    n_dibujadas = min(MASAS_MOSTRADAS, n)
+    inicio = int(np.clip(forzada - n_dibujadas // 2, 0, n - n_dibujadas))
+    fin = inicio + n_dibujadas
+    centro = inicio + (n_dibujadas - 1) / 2
+    cajas = escena.cajas.tomar(n_dibujadas)
+    resortes = escena.resortes.tomar(n_dibujadas + 1)
+    paredes = escena.paredes.tomar((inicio == 0) + (fin == n))
+    bordes = [i for i, hay in ((-1, inicio == 0), (n, fin == n)) if hay]
+    for pared, i in zip(paredes, bordes):
+        pared.pos = vp.vector((i - centro) * SEPARACION_CADENA, 0, 0)
+    for caja, i in zip(cajas, range(inicio, fin)):
+        caja.color = vp.color.orange if i == forzada else vp.color.red
+    etiqueta = objetos.objeto("etiqueta_cadena", vp.label, pos=vp.vector(0, 1.5, 0), text="",
+                              box=False, height=14)
+    texto = TextoLimitado(etiqueta, "Tiempo: {:.2f} s   Energía: {:.4f} J")
+    escena.perfil.reiniciar()
+    escena.forzada.reiniciar()
+
+    running = True
+    def stop_simulation(ev):
+        nonlocal running
+        running = False
+    boton_detener = vp.button(text="Detener cadena", bind=stop_simulation)
+
+    indices = np.arange(inicio - 1, fin + 1)
+    contador = 0
+    for t, estado in fotogramas(productor, vp.rate, VELOCIDAD, T_FINAL):
+        if not running:
+            break
+        x = estado[:n]
+        # Posición en pantalla de las masas de la ventana y de sus dos vecinas
+        desplazamiento = np.zeros(len(indices))
+        dentro = (indices >= 0) & (indices < n)
+        desplazamiento[dentro] = x[indices[dentro]]
+        posiciones = (indices - centro) * SEPARACION_CADENA + desplazamiento
+        for caja, X in zip(cajas, posiciones[1:-1]):
+            caja.pos = vp.vector(X, 0, 0)
+        for resorte, X0, X1 in zip(resortes, posiciones[:-1], posiciones[1:]):
+            resorte.pos = vp.vector(X0, 0, 0)
+            resorte.axis = vp.vector(X1 - X0, 0, 0)
+
+        E = cadena.energia(estado, parametros["m"], parametros["k"])[2]
+        texto.actualizar(t, float(E))
+        escena.forzada.agregar(t, x[forzada])
+        contador += 1
+        if contador % FOTOGRAMAS_PERFIL == 0:
+            escena.perfil.reiniciar(np.arange(n), x)
+
+    escena.forzada.enviar()
+    texto.forzar()
+    boton_detener.delete()
+    salida_info.text = (f"\nCadena de {n} masas ({n_dibujadas} dibujadas): "
+                        f"{productor.n_pasos} pasos implícitos de {dt:.4g} s\n")
+
+
+# -------------------------------------------------
+# RESPUESTA EN FRECUENCIA
+# -------------------------------------------------
+
+def crear_graficas_bode():
+    """Gráficas de amplitud (relativa a A/k) y fase de x_p frente a ω."""
+    graph_amplitud = vp.graph(title="Respuesta en frecuencia: amplitud",
+                              xtitle="ω (rad/s)", ytitle="|x_p| / (A/k)",
+                              width=600, height=300, align="right")
+    curva_amplitud = vp.gcurve(graph=graph_amplitud, color=vp.color.blue, width=2, label="Amplificación")
+    marca_amplitud = vp.gdots(graph=graph_amplitud, color=vp.color.red, radius=4, label="ω actual")
+
+    graph_fase = vp.graph(title="Respuesta en frecuencia: fase",
+                          xtitle="ω (rad/s)", ytitle="Fase (°)",
+                          width=600, height=300, align="right")
+    curva_fase = vp.gcurve(graph=graph_fase, color=vp.color.green, width=2, label="Fase")
+    marca_fase = vp.gdots(graph=graph_fase, color=vp.color.red, radius=4, label="ω actual")
+
+    return SimpleNamespace(amplitud=CurvaBufferizada(curva_amplitud), fase=CurvaBufferizada(curva_fase),
+                           marca_amplitud=marca_amplitud, marca_fase=marca_fase)
+
+
+def mostrar_respuesta_frecuencia(ev):
+    """Amplitud y fase del estado estacionario para los sliders actuales, sin integrar."""
+    global bode
+    if bode is None:
+        bode = crear_graficas_bode()
+
+    p = leer_parametros()
+    m, b, k, w = p["m"], p["b"], p["k"], p["w"]
+    res = masa_resorte.resonancia(m, b, k)
+
+    # Una sola evaluación vectorizada sobre todo el rango de ω
+    omega_max = max(2 * res["omega_superior"], 2 * res["omega0"], 1.2 * w)
+    omegas = np.linspace(0, omega_max, PUNTOS_BODE)
+    amplitud, fase = masa_resorte.respuesta_frecuencia(np.append(omegas, w), m, b, k)
+    amplitud = np.minimum(amplitud * k, AMPLIFICACION_MAXIMA)
+    fase = np.degrees(fase)
+
+    bode.amplitud.reiniciar(omegas, amplitud[:-1])
+    bode.fase.reiniciar(omegas, fase[:-1])
+    bode.marca_amplitud.data = [[w, float(amplitud[-1])]]
+    bode.marca_fase.data = [[w, float(fase[-1])]]
+
+    if res["omega_pico"] > 0:
+        pico = f"ω_r = {res['omega_pico']:.3f} rad/s, amplificación {res['amplitud_pico'] * k:.3f}"
+    else:
+        pico = "sin pico de resonancia"
+    salida_info.text = (f"\nRespuesta en frecuencia: {pico}, Δω = {res['ancho_banda']:.3f} rad/s, "
+                        f"Q = {res['Q']:.3f}\n")
+
+
+def main():
+    crear_interfaz()
+    # Evita que el script se cierre
+    input("Presiona ENTER para salir...")
 
-# Botón para iniciar simulación
-boton_iniciar = button(text="Iniciar simulación", bind=simular)
 
-# Evita que el script se cierre
-input("Presiona ENTER para salir...")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -1,269 +1,390 @@
 
 #pip install vpython
-from vpython import *
 import numpy as np
+import os
+import sys
+from types import SimpleNamespace
+
+# Motor numérico compartido (Simulaciones/motor)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from motor import compilado, mezcla
+from motor.buffer import FPS, ProductorPasoFijo, fotogramas
+from motor.graficas import CurvaBufferizada
+from motor.cache import cache_simulacion, clave_parametros
+from motor.grabacion import Grabacion, Reproductor, Trayectoria, abrir as abrir_grabacion
+from motor.grabacion import guardar as guardar_grabacion
+from motor.textos import TextoLimitado
+from motor.vivo import CambiosEnVivo, prediccion
+from motor.interfaz import GestorEscena, cargar_vpython
+from motor.mezcla import analizar_ecuaciones
+from motor.red_mezcla import tanques_en_serie
+
+# VPython se carga en crear_interfaz(); importar el script no abre ninguna ventana
+vp = None
+
+# Objetos 3D de todas las escenas: se crean una sola vez y cada ejecución
+# los reconfigura (ver motor.interfaz.GestorEscena)
+objetos = GestorEscena()
+
+# Duración y ritmo de la animación
+T_FINAL = 200
+VELOCIDAD = 3.0    # segundos simulados por segundo real
+
+# Archivo donde se graba la última simulación (ver motor.grabacion)
+ARCHIVO_GRABACION = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ultima_simulacion.tray")
+COLUMNAS = ["t", "C", "H"]
+
+# Análisis y trayectorias de las últimas configuraciones (ver motor.cache)
+cache = cache_simulacion("mezcla")
+
+# Parámetros que los sliders pueden cambiar durante una ejecución
+PARAMETROS_EN_VIVO = ("Qin", "Qout", "Cin", "radio")
+# Cambios pendientes de la ejecución en curso (None si no hay ninguna)
+en_vivo = None
+
+# Red de tanques en serie (motor.red_mezcla): tanques dibujados, horizonte
+# en tiempos de residencia de toda la red y duración máxima de la animación
+# (s reales)
+TANQUES_MOSTRADOS = 12
+TIEMPOS_RESIDENCIA = 3
+DURACION_MAXIMA_RED = 60
+# Gráfica de concentraciones de la red (se crea la primera vez que se usa)
+graficas_red = None
 
 # -------------------------------------------------
 # ESCENA BASE
 # -------------------------------------------------
-scene = canvas(title="Tanque de mezcla: concentración y nivel",
-               width=1000, height=700, background=color.gray(0.2))
-scene.center = vector(0, 2, 0)
-
-# Gráficas
-graph_altura = graph(title="Altura vs Tiempo", 
-                     xtitle="Tiempo (s)", ytitle="Altura (m)",
-                     width=650, height=300, align="right")
-curve_altura = gcurve(color=color.cyan, width=2, label="H(t)")
-curve_altura_teorica = gcurve(color=color.yellow, width=2, label="H(t) - Teórica", dot=True, dot_radius=3)
-
-graph_concentracion = graph(title="Concentración vs Tiempo", 
-                            xtitle="Tiempo (s)", ytitle="Concentración (g/L)",
+def crear_interfaz():
+    """Crea la ventana, las gráficas y los controles (carga VPython)."""
+    global vp, scene, graph_altura, curve_altura, curve_altura_teorica, graph_concentracion
+    global curve_conc, curve_conc_teorica, pred_altura, pred_conc, texto_Qin, slider_Qin, texto_Qout, slider_Qout
+    global texto_Cin, slider_Cin, texto_h0, slider_h0, texto_radio, slider_radio, ecuacion_text
+    global ecuacion_text2, ecuacion_text3, ecuacion_text4, ecuacion_text5, ecuacion_params
+    global analisis_ec, salida_info, boton_iniciar, boton_repetir
+    global texto_n_tanques, slider_n_tanques, texto_recirculacion, slider_recirculacion
+    vp = cargar_vpython()
+
+    scene = vp.canvas(title="Tanque de mezcla: concentración y nivel",
+                      width=1000, height=700, background=vp.color.gray(0.2))
+    scene.center = vp.vector(0, 2, 0)
+
+    # Gráficas
+    graph_altura = vp.graph(title="Altura vs Tiempo", 
+                            xtitle="Tiempo (s)", ytitle="Altura (m)",
                             width=650, height=300, align="right")
-curve_conc = gcurve(color=color.orange, width=2, label="C(t)")
-curve_conc_teorica = gcurve(color=color.red, width=2, label="C(t) - Teórica", dot=True, dot_radius=3)
-
-# lista para llevar los objetos creados en cada ejecución
-created_objects = []
-
-wtext(text="\n--- Parámetros del Tanque de Mezcla ---\n")
-
-# Sliders con valores dinámicos
-# --- Caudal de entrada ---
-texto_Qin = wtext(text="Caudal de entrada (Qin): 0.025 m³/s\n")
-def actualizar_Qin(s):
-    texto_Qin.text = f"Caudal de entrada (Qin): {s.value:.3f} m³/s\n"
-slider_Qin = slider(min=0.005, max=0.1, value=0.025, step=0.005, bind=actualizar_Qin)
-
-# --- Caudal de salida ---
-texto_Qout = wtext(text="\nCaudal de salida (Qout): 0.015 m³/s\n")
-def actualizar_Qout(s):
-    texto_Qout.text = f"\nCaudal de salida (Qout): {s.value:.3f} m³/s\n"
-slider_Qout = slider(min=0.005, max=0.1, value=0.015, step=0.005, bind=actualizar_Qout)
-
-# --- Concentración de entrada ---
-texto_Cin = wtext(text="\nConcentración de entrada (Cin): 8.00 g/L\n")
-def actualizar_Cin(s):
-    texto_Cin.text = f"\nConcentración de entrada (Cin): {s.value:.2f} g/L\n"
-slider_Cin = slider(min=0.0, max=20.0, value=8.0, step=0.5, bind=actualizar_Cin)
-
-# --- Altura inicial del agua ---
-texto_h0 = wtext(text="\nAltura inicial del agua: 0.50 m\n")
-def actualizar_h0(s):
-    texto_h0.text = f"\nAltura inicial del agua: {s.value:.2f} m\n"
-slider_h0 = slider(min=0.1, max=3.5, value=0.5, step=0.1, bind=actualizar_h0)
-
-# --- Radio del tanque ---
-texto_radio = wtext(text="\nRadio del tanque: 1.50 m\n")
-def actualizar_radio(s):
-    texto_radio.text = f"\nRadio del tanque: {s.value:.2f} m\n"
-slider_radio = slider(min=0.5, max=3.0, value=1.5, step=0.1, bind=actualizar_radio)
-
-wtext(text="\n")
-
-# Mostrar ecuaciones diferenciales generales
-ecuacion_text = wtext(text="\n--- Ecuaciones Diferenciales ---\n")
-ecuacion_text2 = wtext(text="Sistema acoplado:\n")
-ecuacion_text3 = wtext(text="  dC/dt = (Qin·Cin - Qout·C) / V(t)\n")
-ecuacion_text4 = wtext(text="  dH/dt = (Qin - Qout) / A\n")
-ecuacion_text5 = wtext(text="donde V(t) = A·H(t)\n\n")
-
-# Ecuaciones con parámetros
-ecuacion_params = wtext(text="Ecuaciones con parámetros: (presiona 'Iniciar simulación')\n\n")
-
-# Análisis de las ecuaciones
-analisis_ec = wtext(text="")
-
-# Salidas numéricas
-salida_info = wtext(text="\nTiempo: 0.0 s | Nivel: 0.0 m | Concentración: 0.0 g/L\n")
+    curve_altura = vp.gcurve(color=vp.color.cyan, width=2, label="H(t)")
+    curve_altura_teorica = vp.gcurve(color=vp.color.yellow, width=2, label="H(t) - Teórica", dot=True, dot_radius=3)
+    pred_altura = vp.gcurve(color=vp.color.white, width=1, label="H(t) - Predicción")
+
+    graph_concentracion = vp.graph(title="Concentración vs Tiempo", 
+                                   xtitle="Tiempo (s)", ytitle="Concentración (g/L)",
+                                   width=650, height=300, align="right")
+    curve_conc = vp.gcurve(color=vp.color.orange, width=2, label="C(t)")
+    curve_conc_teorica = vp.gcurve(color=vp.color.red, width=2, label="C(t) - Teórica", dot=True, dot_radius=3)
+    pred_conc = vp.gcurve(color=vp.color.white, width=1, label="C(t) - Predicción")
+
+    vp.wtext(text="\n--- Parámetros del Tanque de Mezcla ---\n")
+
+    # Sliders con valores dinámicos
+    # --- Caudal de entrada ---
+    texto_Qin = vp.wtext(text="Caudal de entrada (Qin): 0.025 m³/s\n")
+    def actualizar_Qin(s):
+        texto_Qin.text = f"Caudal de entrada (Qin): {s.value:.3f} m³/s\n"
+        avisar_cambio()
+    slider_Qin = vp.slider(min=0.005, max=0.1, value=0.025, step=0.005, bind=actualizar_Qin)
+
+    # --- Caudal de salida ---
+    texto_Qout = vp.wtext(text="\nCaudal de salida (Qout): 0.015 m³/s\n")
+    def actualizar_Qout(s):
+        texto_Qout.text = f"\nCaudal de salida (Qout): {s.value:.3f} m³/s\n"
+        avisar_cambio()
+    slider_Qout = vp.slider(min=0.005, max=0.1, value=0.015, step=0.005, bind=actualizar_Qout)
+
+    # --- Concentración de entrada ---
+    texto_Cin = vp.wtext(text="\nConcentración de entrada (Cin): 8.00 g/L\n")
+    def actualizar_Cin(s):
+        texto_Cin.text = f"\nConcentración de entrada (Cin): {s.value:.2f} g/L\n"
+        avisar_cambio()
+    slider_Cin = vp.slider(min=0.0, max=20.0, value=8.0, step=0.5, bind=actualizar_Cin)
+
+    # --- Altura inicial del agua ---
+    texto_h0 = vp.wtext(text="\nAltura inicial del agua: 0.50 m\n")
+    def actualizar_h0(s):
+        texto_h0.text = f"\nAltura inicial del agua: {s.value:.2f} m\n"
+    slider_h0 = vp.slider(min=0.1, max=3.5, value=0.5, step=0.1, bind=actualizar_h0)
+
+    # --- Radio del tanque ---
+    texto_radio = vp.wtext(text="\nRadio del tanque: 1.50 m\n")
+    def actualizar_radio(s):
+        texto_radio.text = f"\nRadio del tanque: {s.value:.2f} m\n"
+        avisar_cambio()
+    slider_radio = vp.slider(min=0.5, max=3.0, value=1.5, step=0.1, bind=actualizar_radio)
+
+    vp.wtext(text="\n")
+
+    # Mostrar ecuaciones diferenciales generales
+    ecuacion_text = vp.wtext(text="\n--- Ecuaciones Diferenciales ---\n")
+    ecuacion_text2 = vp.wtext(text="Sistema acoplado:\n")
+    ecuacion_text3 = vp.wtext(text="  dC/dt = Qin·(Cin - C) / V(t)\n")
+    ecuacion_text4 = vp.wtext(text="  dH/dt = (Qin - Qout) / A\n")
+    ecuacion_text5 = vp.wtext(text="donde V(t) = A·H(t)\n\n")
+
+    # Ecuaciones con parámetros
+    ecuacion_params = vp.wtext(text="Ecuaciones con parámetros: (presiona 'Iniciar simulación')\n\n")
+
+    # Análisis de las ecuaciones
+    analisis_ec = vp.wtext(text="")
+
+    # Salidas numéricas
+    salida_info = vp.wtext(text="\nTiempo: 0.0 s | Nivel: 0.0 m | Concentración: 0.0 g/L\n")
+
+    # Botón para iniciar simulación
+    boton_iniciar = vp.button(text="▶ Iniciar simulación", bind=simular)
+    # Botón para repetir la última simulación grabada
+    boton_repetir = vp.button(text="⟲ Repetir última", bind=reproducir)
+
+    # --- Red de tanques en serie (Qin, Qout, Cin, h0 y radio de los sliders) ---
+    vp.wtext(text="\n\n--- Red de tanques de mezcla en serie ---\n")
+    texto_n_tanques = vp.wtext(text="Número de tanques: 20\n")
+    def actualizar_n_tanques(s):
+        texto_n_tanques.text = f"Número de tanques: {int(s.value)}\n"
+    slider_n_tanques = vp.slider(min=2, max=500, value=20, step=1, bind=actualizar_n_tanques)
+    texto_recirculacion = vp.wtext(text="\nRecirculación del último al primero: 0.000 m³/s\n")
+    def actualizar_recirculacion(s):
+        texto_recirculacion.text = f"\nRecirculación del último al primero: {s.value:.3f} m³/s\n"
+    slider_recirculacion = vp.slider(min=0.0, max=0.1, value=0.0, step=0.005, bind=actualizar_recirculacion)
+    vp.wtext(text="\n")
+    vp.button(text="▶ Simular red de mezcla", bind=simular_red)
+
 
 # -------------------------------------------------
-# ANÁLISIS DE LAS ECUACIONES
+# FUNCIONES DE SIMULACIÓN
 # -------------------------------------------------
-def analizar_ecuaciones(Qin, Qout, Cin, h0, A):
-    """
-    Analiza el sistema de ecuaciones diferenciales del tanque de mezcla.
-    
-    Sistema:
-    1) dH/dt = (Qin - Qout) / A
-    2) dC/dt = (Qin·Cin - Qout·C) / (A·H)
-    
-    Soluciones analíticas:
-    """
-    
-    texto = "\n--- Análisis del Sistema ---\n\n"
-    
-    # Ecuación de altura (independiente, lineal)
-    texto += "🔹 Ecuación de Altura (EDO lineal de primer orden):\n"
-    texto += f"   dH/dt = ({Qin:.3f} - {Qout:.3f}) / {A:.4f}\n"
+
+# Conversión de concentración a color
+def concentration_to_color(C, Cmax=20):
+    """Color entre azul (0 g/L) y rojo (Cmax g/L)."""
+    ratio = min(max(C / Cmax, 0), 1)
+    return vp.vector(ratio, 0.4 + 0.4*(1 - ratio), 1 - ratio)
+
+def avisar_cambio():
+    """Modo en vivo: anota los valores de los sliders para la ejecución en curso."""
+    if en_vivo is not None:
+        en_vivo.cambiar(leer_parametros())
+
+
+def leer_parametros():
+    """Parámetros actuales de los sliders."""
+    return dict(Qin=float(slider_Qin.value), Qout=float(slider_Qout.value),
+                Cin=float(slider_Cin.value), h0=float(slider_h0.value),
+                radio=float(slider_radio.value))
+
+
+def construir_escena(p):
+    """Prepara el tanque, las etiquetas y las curvas de una ejecución."""
+    water_height0 = p["h0"]
+    tank_radius = p["radio"]
+    tank_height = mezcla.ALTURA_TANQUE      # m
+
+    # Las curvas se vacían y se reutilizan
+    series = [CurvaBufferizada(curva) for curva in (curve_altura, curve_conc, curve_altura_teorica,
+                                                     curve_conc_teorica, pred_altura, pred_conc)]
+    for serie in series:
+        serie.reiniciar()
+
+    # Ocultar objetos previos (también los de la red)
+    objetos.ocultar()
+
+    # Tanque
+    tank = objetos.objeto("tanque", vp.cylinder, pos=vp.vector(0, 0, 0), axis=vp.vector(0, tank_height, 0),
+                          radius=tank_radius, opacity=0.15, color=vp.color.white)
     
-    delta_Q = Qin - Qout
+    # Líquido
+    water = objetos.objeto("liquido", vp.cylinder, pos=vp.vector(0, 0, 0),
+                           axis=vp.vector(0, water_height0, 0),
+                           radius=tank_radius*0.99, color=vp.color.cyan, opacity=0.8)
     
-    if abs(delta_Q) < 1e-6:
-        texto += f"   dH/dt = 0 (nivel constante)\n"
-        texto += f"   Solución: H(t) = {h0:.2f} m (constante)\n\n"
-        H_final = h0
-        comportamiento_H = "constante"
-    else:
-        k_H = delta_Q / A
-        texto += f"   dH/dt = {k_H:.6f} m/s\n"
-        texto += f"   Solución: H(t) = {h0:.2f} + {k_H:.6f}·t\n"
-        
-        if delta_Q > 0:
-            texto += f"   ⬆️ El tanque se LLENA (Qin > Qout)\n\n"
-            comportamiento_H = "llenado"
-            H_final = None  # dependerá de cuándo se llene
-        else:
-            t_vaciado = -h0 / k_H
-            texto += f"   ⬇️ El tanque se VACÍA (Qin < Qout)\n"
-            texto += f"   Tiempo de vaciado: {t_vaciado:.2f} s\n\n"
-            comportamiento_H = "vaciado"
-            H_final = 0
+    # Entradas y salidas
+    inlet = objetos.objeto("entrada", vp.cylinder, pos=vp.vector(-tank_radius-0.5, tank_height*0.9, 0),
+                           axis=vp.vector(0.6, 0, 0), radius=0.05, color=vp.color.blue)
+    objetos.objeto("salida", vp.cylinder, pos=vp.vector(tank_radius+0.1, 0, 0),
+                   axis=vp.vector(0.6, 0, 0), radius=0.05, color=vp.color.red)
     
-    # Ecuación de concentración (depende de H(t))
-    texto += "🔹 Ecuación de Concentración (EDO no lineal):\n"
-    texto += f"   dC/dt = ({Qin:.3f}·{Cin:.2f} - {Qout:.3f}·C) / (A·H(t))\n"
+    # Gota de entrada
+    drop = objetos.objeto("gota", vp.sphere, pos=inlet.pos + vp.vector(0.6, 0, 0),
+                          radius=0.06, color=vp.color.blue, make_trail=True, retain=10)
     
-    if abs(delta_Q) < 1e-6:
-        # Caso especial: volumen constante
-        texto += f"   Con H(t) constante, V = {A*h0:.4f} m³:\n"
-        tau = (A * h0) / Qout
-        C_eq = (Qin / Qout) * Cin
-        texto += f"   dC/dt = ({Qin*Cin:.4f} - {Qout:.3f}·C) / {A*h0:.4f}\n"
-        texto += f"   Solución (exponencial):\n"
-        texto += f"   C(t) = {C_eq:.2f}·(1 - e^(-t/{tau:.2f}))\n"
-        texto += f"   Concentración de equilibrio: C_eq = {C_eq:.2f} g/L\n"
-        texto += f"   Constante de tiempo: τ = {tau:.2f} s\n\n"
-    else:
-        texto += f"   Solución compleja (depende de H(t) variable)\n"
-        if Qin > Qout:
-            C_final_estimado = Cin * (Qin / Qout)
-            texto += f"   C(t) → {Cin:.2f} g/L (tiende a Cin al llenarse)\n\n"
-        else:
-            texto += f"   C(t) evoluciona hasta vaciarse\n\n"
+    # Texto informativo
+    info = objetos.objeto("etiqueta_info", vp.label, pos=vp.vector(0, tank_height + 0.7, 0),
+                          text="", height=16, box=False, color=vp.color.white)
     
-    return texto, comportamiento_H, delta_Q / A if abs(delta_Q) > 1e-6 else 0
-
+    # Indicador de concentración (barra de color)
+    conc_indicator = objetos.objeto("indicador", vp.box, pos=vp.vector(tank_radius+1, tank_height/2, 0),
+                                    size=vp.vector(0.3, tank_height, 0.3),
+                                    color=concentration_to_color(0))
+    objetos.objeto("etiqueta_indicador", vp.label, pos=vp.vector(tank_radius+1.5, tank_height+0.3, 0),
+                   text="Conc.", height=12, box=False, color=vp.color.white)
+
+    return SimpleNamespace(
+        p=p, A=np.pi * tank_radius**2, tank_height=tank_height,
+        # Estado desde el que se mide la solución teórica (cambia en vivo)
+        t_ref=0.0, C_ref=0.0, H_ref=water_height0,
+        tank=tank, water=water, inlet=inlet, drop=drop, conc_indicator=conc_indicator,
+        contador_graficas=0, error_C_max=0.0,
+        # Textos con frecuencia limitada (solo se envían si cambian)
+        texto_info=TextoLimitado(info, "t = {:.1f} s\nNivel: {:.2f} m\nC(t): {:.2f} g/L"),
+        texto_salida=TextoLimitado(salida_info, "\nTiempo: {:.1f} s | Nivel: {:.2f} m | Concentración: {:.2f} g/L\n"),
+        serie_altura=series[0], serie_conc=series[1],
+        serie_altura_teorica=series[2], serie_conc_teorica=series[3],
+        serie_pred_altura=series[4], serie_pred_conc=series[5])
+
+
+def actualizar_escena(escena, t, estado):
+    """
+    Dibuja un fotograma: estado = [C, H] en el instante t.
+    Devuelve False si el tanque se vació o se llenó.
+    """
+    p = escena.p
+    C, water_height = estado
+
+    # Condiciones de parada
+    if water_height <= 0:
+        escena.water.axis = vp.vector(0, 0, 0)
+        escena.texto_info.fijar(f"Tanque vacío.\nTiempo: {t:.1f}s\nC: {C:.2f} g/L")
+        return False
+    if water_height >= escena.tank_height:
+        escena.water.axis = vp.vector(0, escena.tank_height, 0)
+        escena.texto_info.fijar(f"Tanque lleno.\nTiempo: {t:.1f}s\nC: {C:.2f} g/L")
+        return False
+
+    # Actualiza color del líquido
+    escena.water.color = concentration_to_color(C)
+
+    # Actualiza nivel del agua
+    escena.water.axis = vp.vector(0, water_height, 0)
+
+    # Actualiza indicador de concentración
+    escena.conc_indicator.color = concentration_to_color(C)
+
+    # Movimiento de la gota
+    escena.drop.pos.x += 0.08
+    if escena.drop.pos.x > escena.inlet.pos.x + 0.6:
+        escena.drop.pos = escena.inlet.pos + vp.vector(0, 0, 0)
+        escena.drop.clear_trail()
+
+    # Calcular valores teóricos (solución exacta, también con volumen variable)
+    C_teorica, H_teorica = mezcla.solucion_analitica(t - escena.t_ref, p["Qin"], p["Qout"], p["Cin"],
+                                                     escena.H_ref, escena.A, C0=escena.C_ref)
+    escena.error_C_max = max(escena.error_C_max, abs(C - C_teorica))
 
-def altura_teorica(t, h0, k_H):
-    """Calcula H(t) = h0 + k_H·t"""
-    return h0 + k_H * t
+    # Texto informativo
+    escena.texto_info.actualizar(t, water_height, C)
+    
+    # Actualizar información general
+    escena.texto_salida.actualizar(t, water_height, C)
+
+    # Agregar puntos a las gráficas (se envían por lotes)
+    escena.contador_graficas += 1
+    escena.serie_altura.agregar(t, water_height)
+    escena.serie_conc.agregar(t, C)
+    # Graficar soluciones teóricas
+    if escena.contador_graficas % 2 == 0:
+        escena.serie_altura_teorica.agregar(t, H_teorica)
+        escena.serie_conc_teorica.agregar(t, C_teorica)
+    return True
+
+
+def aplicar_en_vivo(escena, productor, cambios, t, estado):
+    """Aplica a la ejecución en curso los parámetros nuevos, desde el estado actual."""
+    cambios = {n: cambios[n] for n in PARAMETROS_EN_VIVO}
+    escena.p = dict(escena.p, **cambios)
+    escena.A = np.pi * cambios["radio"]**2
+    escena.tank.radius = cambios["radio"]
+    escena.water.radius = cambios["radio"] * 0.99
+    # La solución teórica sigue desde aquí con los parámetros nuevos
+    escena.t_ref = t
+    escena.C_ref, escena.H_ref = (float(c) for c in estado)
+    productor.actualizar_parametros(Qin=cambios["Qin"], Qout=cambios["Qout"],
+                                    Cin=cambios["Cin"], A=escena.A)
+
+
+def resolver_en_vivo(escena, t, estado):
+    """Rehace el análisis y la predicción desde el estado actual."""
+    p = escena.p
+    ecuacion_params.text = texto_ecuaciones(p["Qin"], p["Qout"], p["Cin"], escena.A)
+    texto_analisis, _, _ = analizar_ecuaciones(p["Qin"], p["Qout"], p["Cin"], float(estado[1]),
+                                               escena.A, C0=float(estado[0]))
+    analisis_ec.text = texto_analisis
 
+    tiempos, estados = prediccion("mezcla", t, estado, T_FINAL, Qin=p["Qin"], Qout=p["Qout"],
+                                  Cin=p["Cin"], A=escena.A)
+    escena.serie_pred_conc.reiniciar(tiempos, estados[:, 0])
+    escena.serie_pred_altura.reiniciar(tiempos, estados[:, 1])
 
-def concentracion_teorica_volumen_constante(t, Cin, Qin, Qout, V):
-    """
-    Para volumen constante (Qin = Qout):
-    C(t) = C_eq·(1 - e^(-t/τ))
-    donde C_eq = (Qin/Qout)·Cin y τ = V/Qout
-    """
-    C_eq = (Qin / Qout) * Cin
-    tau = V / Qout
-    return C_eq * (1 - np.exp(-t / tau))
 
+def terminar_escena(escena):
+    """Envía los puntos y textos pendientes y el error frente a la solución exacta."""
+    for serie in (escena.serie_altura, escena.serie_conc,
+                  escena.serie_altura_teorica, escena.serie_conc_teorica):
+        serie.enviar()
+    for texto in (escena.texto_info, escena.texto_salida):
+        texto.forzar()
+    escena.texto_salida.fijar(escena.texto_salida.texto +
+                              f"Error máximo de C(t) numérica vs analítica: {escena.error_C_max:.2e} g/L\n")
 
-# -------------------------------------------------
-# FUNCIONES DE SIMULACIÓN
-# -------------------------------------------------
 
-# Limpiar objetos anteriores
-def hide_previous_objects():
-    global created_objects
-    for obj in created_objects:
-        try:
-            obj.visible = False
-        except:
-            pass
-    created_objects = []
+def texto_ecuaciones(Qin, Qout, Cin, A):
+    """Ecuaciones con los parámetros sustituidos."""
+    return (f"Ecuaciones con parámetros:\n"
+            f"  dC/dt = {Qin:.3f}·({Cin:.2f} - C) / (A·H)\n"
+            f"  dH/dt = ({Qin:.3f} - {Qout:.3f}) / {A:.4f}\n"
+            f"  dH/dt = {(Qin-Qout)/A:.6f} m/s\n\n")
 
-# Conversión de concentración a color
-def concentration_to_color(C, Cmax=20):
-    """Color entre azul (0 g/L) y rojo (Cmax g/L)."""
-    ratio = min(max(C / Cmax, 0), 1)
-    return vector(ratio, 0.4 + 0.4*(1 - ratio), 1 - ratio)
 
 # Simulación
 def simular(ev):
-    global created_objects, curve_altura, curve_conc, curve_altura_teorica, curve_conc_teorica
+    global en_vivo
 
     # Leer parámetros desde sliders
-    Qin = float(slider_Qin.value)
-    Qout = float(slider_Qout.value)
-    Cin = float(slider_Cin.value)
-    water_height0 = float(slider_h0.value)
-    tank_radius = float(slider_radio.value)
-    
-    # Parámetros calculados
-    tank_height = 4.0      # m
-    A = np.pi * tank_radius**2  # área transversal (m²)
-    V0 = A * water_height0  # volumen inicial
+    p = leer_parametros()
+    Qin, Qout, Cin = p["Qin"], p["Qout"], p["Cin"]
+    water_height0 = p["h0"]
+    A = np.pi * p["radio"]**2  # área transversal (m²)
 
     # Construir ecuaciones con parámetros
-    ec_texto = (f"Ecuaciones con parámetros:\n"
-                f"  dC/dt = ({Qin:.3f}·{Cin:.2f} - {Qout:.3f}·C) / (A·H)\n"
-                f"  dH/dt = ({Qin:.3f} - {Qout:.3f}) / {A:.4f}\n"
-                f"  dH/dt = {(Qin-Qout)/A:.6f} m/s\n\n")
-    ecuacion_params.text = ec_texto
-    
+    ecuacion_params.text = texto_ecuaciones(Qin, Qout, Cin, A)
+
+    # Una configuración ya simulada se reproduce sin analizar ni integrar
+    clave = clave_parametros("mezcla", p)
+    guardado = cache.obtener(clave)
+    if guardado is not None:
+        analisis_ec.text = guardado["texto_analisis"]
+        trayectoria = Trayectoria(guardado["datos"], COLUMNAS, "mezcla", p)
+        guardar_grabacion(ARCHIVO_GRABACION, trayectoria)
+        reproducir_trayectoria(trayectoria)
+        return
+
     # Análisis del sistema
     texto_analisis, comportamiento_H, k_H = analizar_ecuaciones(Qin, Qout, Cin, water_height0, A)
     analisis_ec.text = texto_analisis
 
-    # Limpiar gráficas anteriores
-    curve_altura.delete()
-    curve_conc.delete()
-    curve_altura_teorica.delete()
-    curve_conc_teorica.delete()
-    curve_altura = gcurve(color=color.cyan, width=2, label="H(t)")
-    curve_conc = gcurve(color=color.orange, width=2, label="C(t)")
-    curve_altura_teorica = gcurve(color=color.yellow, width=2, label="H(t) - Teórica", dot=True, dot_radius=3)
-    curve_conc_teorica = gcurve(color=color.red, width=2, label="C(t) - Teórica", dot=True, dot_radius=3)
-
-    # Ocultar objetos previos
-    hide_previous_objects()
-
     # ============================
     # CONFIGURACIÓN DE ESCENA
     # ============================
-    
-    # Crear tanque
-    tank = cylinder(pos=vector(0, 0, 0), axis=vector(0, tank_height, 0),
-                    radius=tank_radius, opacity=0.15, color=color.white)
-    
-    # Crear líquido
-    water = cylinder(pos=vector(0, 0, 0), axis=vector(0, water_height0, 0),
-                     radius=tank_radius*0.99, color=color.cyan, opacity=0.8)
-    
-    # Entradas y salidas
-    inlet = cylinder(pos=vector(-tank_radius-0.5, tank_height*0.9, 0),
-                     axis=vector(0.6, 0, 0), radius=0.05, color=color.blue)
-    outlet = cylinder(pos=vector(tank_radius+0.1, 0, 0),
-                      axis=vector(0.6, 0, 0), radius=0.05, color=color.red)
-    
-    # Gota de entrada
-    drop = sphere(pos=inlet.pos + vector(0.6, 0, 0),
-                  radius=0.06, color=color.blue, make_trail=True, retain=10)
-    
-    # Texto informativo
-    info = label(pos=vector(0, tank_height + 0.7, 0),
-                 text="", height=16, box=False, color=color.white)
-    
-    # Indicador de concentración (barra de color)
-    conc_indicator = box(pos=vector(tank_radius+1, tank_height/2, 0), 
-                         size=vector(0.3, tank_height, 0.3), 
-                         color=concentration_to_color(0))
-    conc_label = label(pos=vector(tank_radius+1.5, tank_height+0.3, 0),
-                       text="Conc.", height=12, box=False, color=color.white)
-    
-    created_objects.extend([tank, water, inlet, outlet, drop, info, conc_indicator, conc_label])
+    escena = construir_escena(p)
 
     # ============================
     # VARIABLES DE SIMULACIÓN
     # ============================
-    t = 0
-    dt = 0.05
+    dt = 0.05          # paso de la física
     C = 0.0        # g/L (inicialmente pura)
-    water_height = water_height0
-    contador_graficas = 0
+
+    # Etapa física de paso fijo que escribe en un buffer circular
+    # (bucle escalar de motor.compilado, con Numba si está instalado)
+    productor = ProductorPasoFijo(mezcla.paso_euler, [C, water_height0], dt,
+                                  dict(Qin=Qin, Qout=Qout, Cin=Cin, A=A),
+                                  detener=mezcla.tanque_lleno_o_vacio,
+                                  avanzar=compilado.avanzar_mezcla)
 
     # ============================
     # BUCLE DE SIMULACIÓN
@@ -275,86 +396,192 @@ def simular(ev):
         running = False
     
     # Botón para detener
-    boton_detener = button(text="Detener simulación", bind=stop_simulation)
-    created_objects.append(boton_detener)
-    
-    volumen_constante = abs(Qin - Qout) < 1e-6
+    boton_detener = vp.button(text="Detener simulación", bind=stop_simulation)
     
-    while running:
-        rate(60)
-
-        # EDO de concentración
-        V_actual = A * water_height
-        dCdt = (Qin*Cin - Qout*C) / V_actual if V_actual > 0 else 0
-        C += dCdt * dt
-
-        # EDO de nivel (balance de volumen)
-        dHdt = (Qin - Qout) / A
-        water_height += dHdt * dt
-        t += dt
-
-        # Condiciones de parada
-        if water_height <= 0:
-            water_height = 0
-            info.text = f"Tanque vacío.\nTiempo: {t:.1f}s\nC: {C:.2f} g/L"
-            break
-        if water_height >= tank_height:
-            water_height = tank_height
-            info.text = f"Tanque lleno.\nTiempo: {t:.1f}s\nC: {C:.2f} g/L"
-            break
+    # Un fotograma por iteración; la física avanza lo necesario entre ellos.
+    # Cada fotograma se graba para poder repetirlo sin integrar.
+    en_vivo = CambiosEnVivo()
+    with Grabacion(ARCHIVO_GRABACION, "mezcla", COLUMNAS, p) as grabacion:
+        for t, estado in fotogramas(productor, vp.rate, VELOCIDAD, T_FINAL):
+            if not running:
+                break
+            # Modo en vivo: el cambio de un slider rige desde el paso siguiente
+            cambios = en_vivo.tomar()
+            if cambios is not None:
+                aplicar_en_vivo(escena, productor, cambios, t, estado)
+            if en_vivo.listo():
+                resolver_en_vivo(escena, t, estado)
+            # EDO de concentración y de nivel, estado interpolado del buffer
+            grabacion.agregar(t, estado)
+            if not actualizar_escena(escena, t, estado):
+                break
+
+    terminar_escena(escena)
+    modificada = en_vivo.n_cambios > 0
+    en_vivo = None
+
+    # Limpiar botón de detener
+    boton_detener.delete()
+
+    # Solo las ejecuciones completas y sin cambios en vivo se guardan en la caché
+    if running and not modificada:
+        cache.guardar(clave, dict(texto_analisis=texto_analisis,
+                                  datos=np.array(abrir_grabacion(ARCHIVO_GRABACION).datos)))
+
+
+# Repetición
+def reproducir(ev):
+    """Repite la última simulación grabada, sin volver a integrar."""
+    if not os.path.exists(ARCHIVO_GRABACION):
+        salida_info.text = "\nNo hay ninguna simulación grabada todavía\n"
+        return
+    reproducir_trayectoria(abrir_grabacion(ARCHIVO_GRABACION))
+
+
+def reproducir_trayectoria(trayectoria):
+    """Dibuja una trayectoria ya calculada al ritmo de la pantalla."""
+    p = trayectoria.parametros
+    escena = construir_escena(p)
+    reproductor = Reproductor(trayectoria, VELOCIDAD)
+
+    running = True
 
-        # Actualiza color del líquido
-        water.color = concentration_to_color(C)
-
-        # Actualiza nivel del agua
-        water.axis = vector(0, water_height, 0)
-
-        # Actualiza indicador de concentración
-        conc_indicator.color = concentration_to_color(C)
-
-        # Movimiento de la gota
-        drop.pos.x += 0.08
-        if drop.pos.x > inlet.pos.x + 0.6:
-            drop.pos = inlet.pos + vector(0, 0, 0)
-            drop.clear_trail()
-
-        # Calcular valores teóricos
-        H_teorica = altura_teorica(t, water_height0, k_H)
-        H_teorica = max(0, min(H_teorica, tank_height))
-        
-        if volumen_constante:
-            C_teorica = concentracion_teorica_volumen_constante(t, Cin, Qin, Qout, V0)
-        else:
-            C_teorica = C  # Aproximación (la solución exacta es compleja)
-
-        # Texto informativo
-        info.text = (f"t = {t:.1f} s\n"
-                     f"Nivel: {water_height:.2f} m\n"
-                     f"C(t): {C:.2f} g/L")
-        
-        # Actualizar información general
-        salida_info.text = f"\nTiempo: {t:.1f} s | Nivel: {water_height:.2f} m | Concentración: {C:.2f} g/L\n"
-
-        # Agregar puntos a las gráficas
-        contador_graficas += 1
-        if contador_graficas % 3 == 0:
-            curve_altura.plot(t, water_height)
-            curve_conc.plot(t, C)
-            # Graficar soluciones teóricas
-            if contador_graficas % 6 == 0:
-                curve_altura_teorica.plot(t, H_teorica)
-                if volumen_constante:
-                    curve_conc_teorica.plot(t, C_teorica)
-        
-        # Límite de tiempo de simulación
-        if t > 200:
+    def stop_simulation(ev):
+        nonlocal running
+        running = False
+
+    # Botón para detener y slider para moverse por la grabación
+    boton_detener = vp.button(text="Detener reproducción", bind=stop_simulation)
+    slider_posicion = vp.slider(min=0, max=reproductor.t_final, value=0,
+                                bind=lambda s: reproductor.saltar(s.value))
+
+    for t, estado, salto in reproductor.fotogramas(vp.rate):
+        if not running:
             break
+        if salto:
+            # Rehacer las curvas hasta el instante mostrado
+            i = trayectoria.indice_en(t)
+            tiempos = trayectoria.t[:i]
+            C_teorica, H_teorica = mezcla.solucion_analitica(
+                tiempos[::2], p["Qin"], p["Qout"], p["Cin"], p["h0"], escena.A)
+            escena.serie_altura.reiniciar(tiempos, trayectoria["H"][:i])
+            escena.serie_conc.reiniciar(tiempos, trayectoria["C"][:i])
+            escena.serie_altura_teorica.reiniciar(tiempos[::2], H_teorica)
+            escena.serie_conc_teorica.reiniciar(tiempos[::2], C_teorica)
+        actualizar_escena(escena, t, estado)
+
+    terminar_escena(escena)
+    boton_detener.delete()
+    slider_posicion.delete()
 
-    # Limpiar botón de detener
+
+# -------------------------------------------------
+# RED DE TANQUES DE MEZCLA
+# -------------------------------------------------
+
+def crear_graficas_red():
+    """Concentración del primer tanque, el del medio y el último frente al tiempo."""
+    graph_red = vp.graph(title="Red de mezcla: concentraciones",
+                         xtitle="Tiempo (s)", ytitle="Concentración (g/L)",
+                         width=650, height=300, align="right")
+    colores = [vp.color.blue, vp.color.green, vp.color.red]
+    curvas = [vp.gcurve(graph=graph_red, color=color, width=2, label="") for color in colores]
+    return SimpleNamespace(curvas=curvas, series=[CurvaBufferizada(c) for c in curvas])
+
+
+def construir_escena_red(p, n_mostrados):
+    """Dibuja n_mostrados tanques en fila unidos por tuberías, con los objetos de los pools."""
+    objetos.ocultar()
+    R, h0 = p["radio"], p["h0"]
+    altura = mezcla.ALTURA_TANQUE
+    separacion = 3 * R
+    x0 = -separacion * (n_mostrados - 1) / 2
+    tanques = objetos.pool("tanques_red", lambda: vp.cylinder(opacity=0.15, color=vp.color.white))
+    aguas = objetos.pool("aguas_red", lambda: vp.cylinder(opacity=0.8))
+    tuberias = objetos.pool("tuberias_red", lambda: vp.cylinder(radius=0.05, color=vp.color.gray(0.7)))
+    tanques, aguas = tanques.tomar(n_mostrados), aguas.tomar(n_mostrados)
+    for i, (tanque, agua) in enumerate(zip(tanques, aguas)):
+        base = vp.vector(x0 + i * separacion, 0, 0)
+        tanque.pos, tanque.axis, tanque.radius = base, vp.vector(0, altura, 0), R
+        agua.pos, agua.axis, agua.radius = base, vp.vector(0, h0, 0), R * 0.99
+        agua.color = concentration_to_color(0)
+    for i, tuberia in enumerate(tuberias.tomar(n_mostrados - 1)):
+        tuberia.pos = vp.vector(x0 + i * separacion + R, 0.1, 0)
+        tuberia.axis = vp.vector(separacion - 2 * R, 0, 0)
+    label_t = objetos.objeto("etiqueta_red", vp.label, pos=vp.vector(0, altura + 0.7, 0), text="",
+                             height=16, box=False, color=vp.color.white)
+    return SimpleNamespace(aguas=aguas,
+                           texto=TextoLimitado(label_t, "t = {:.1f} s\nC del último tanque: {:.2f} g/L"))
+
+
+def simular_red(ev):
+    """
+    Cascada de tanques con la alimentación en el primero y la descarga en el
+    último (motor.red_mezcla). Toda la red se resuelve de una vez: de forma
+    exacta si los volúmenes son constantes (Qin = Qout) y con RK45 si no.
+    Se dibujan hasta TANQUES_MOSTRADOS tanques repartidos por la red.
+    """
+    global graficas_red
+    if graficas_red is None:
+        graficas_red = crear_graficas_red()
+
+    p = leer_parametros()
+    n_tanques = int(slider_n_tanques.value)
+    A = np.pi * p["radio"]**2
+    red = tanques_en_serie(n_tanques, A, p["Qin"], p["Cin"], p["h0"], Q_salida=p["Qout"],
+                           recirculacion=float(slider_recirculacion.value))
+
+    # Horizonte de varios tiempos de residencia, o hasta que un tanque se llena o se vacía
+    t_final = min(TIEMPOS_RESIDENCIA * n_tanques * A * p["h0"] / p["Qin"], red.instante_final())
+    # Una muestra por fotograma; las redes lentas se aceleran hasta DURACION_MAXIMA_RED
+    n_fotogramas = int(min(t_final / VELOCIDAD, DURACION_MAXIMA_RED) * FPS) + 1
+    resultado = red.resolver(0.0, t_final, puntos=max(n_fotogramas, 2))
+    t, C, H = resultado["t"], resultado["C"], resultado["H"]
+
+    mostrados = np.unique(np.linspace(0, n_tanques - 1, min(TANQUES_MOSTRADOS, n_tanques)).astype(int))
+    escena = construir_escena_red(p, len(mostrados))
+    seguidos = [0, n_tanques // 2, n_tanques - 1]
+    for curva, serie, i in zip(graficas_red.curvas, graficas_red.series, seguidos):
+        curva.label = f"C{i + 1}"
+        serie.reiniciar()
+
+    running = True
+    def stop_simulation(ev):
+        nonlocal running
+        running = False
+    boton_detener = vp.button(text="Detener red", bind=stop_simulation)
+
+    for k in range(len(t)):
+        if not running:
+            break
+        vp.rate(FPS)
+        for agua, i in zip(escena.aguas, mostrados):
+            agua.axis = vp.vector(0, H[k, i], 0)
+            agua.color = concentration_to_color(C[k, i])
+        escena.texto.actualizar(t[k], C[k, -1])
+        for serie, i in zip(graficas_red.series, seguidos):
+            serie.agregar(t[k], C[k, i])
+
+    for serie in graficas_red.series:
+        serie.enviar()
+    escena.texto.forzar()
     boton_detener.delete()
 
-# Botón para iniciar simulación
-boton_iniciar = button(text="▶ Iniciar simulación", bind=simular)
+    if resultado["metodo"] == "exacto":
+        metodo = "solución exacta (exponencial de matriz, volúmenes constantes)"
+        final = f"C estacionaria del último tanque: {red.estacionario()[-1]:.3f} g/L\n"
+    else:
+        metodo = f"RK45 con volumen variable, {resultado['n_pasos']} pasos"
+        final = ""
+    salida_info.text = (f"\nRed de {n_tanques} tanques en serie, {len(mostrados)} dibujados: {metodo}\n"
+                        f"t = {t[-1]:.1f} s, C del último tanque: {C[-1, -1]:.3f} g/L\n" + final)
+
+
+def main():
+    crear_interfaz()
+    # Evita que el script se cierre
+    input("Presiona ENTER para salir...")
+
 
-# Evita que el script se cierre
-input("Presiona ENTER para salir...")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
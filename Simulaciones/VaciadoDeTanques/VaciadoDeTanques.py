@@ -1,306 +1,598 @@
 
 #pip install vpython
-from vpython import *
 import numpy as np
-
-# -------------------------------------------------
-# ESCENA BASE
-# -------------------------------------------------
-scene = canvas(title="Vaciado de un tanque cilíndrico",
-               width=900, height=600, background=color.white)
-
-# Gráficas
-graph_altura = graph(title="Altura vs Tiempo", 
-                     xtitle="Tiempo (s)", ytitle="Altura (m)",
-                     width=650, height=300, align="right")
-curve_altura = gcurve(color=color.blue, width=2, label="h(t) - Numérica")
-curve_altura_teorica = gcurve(color=color.red, width=2, label="h(t) - Teórica", dot=True, dot_radius=3)
-
-graph_volumen = graph(title="Volumen vs Tiempo", 
-                      xtitle="Tiempo (s)", ytitle="Volumen (m³)",
-                      width=650, height=300, align="right")
-curve_volumen = gcurve(color=color.green, width=2, label="V(t)")
+import os
+import sys
+from types import SimpleNamespace
+
+# Motor numérico compartido (Simulaciones/motor)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from motor import red_tanques, torricelli
+from motor.buffer import FPS
+from motor.graficas import CurvaBufferizada
+from motor.cache import cache_simulacion, clave_parametros
+from motor.grabacion import Grabacion, Reproductor, Trayectoria, abrir as abrir_grabacion
+from motor.grabacion import guardar as guardar_grabacion
+from motor.textos import TextoLimitado
+from motor.vivo import CambiosEnVivo, prediccion
+from motor.interfaz import GestorEscena, cargar_vpython
+from motor.torricelli import analizar_ecuacion, dhdt, solucion_teorica
+
+# VPython se carga en crear_interfaz(); importar el script no abre ninguna ventana
+vp = None
 
 # Constante gravitacional
 g = 9.8  # m/s²
 
-# lista para llevar los objetos creados en cada ejecución
-created_objects = []
+# Objetos 3D de todas las escenas: se crean una sola vez y cada ejecución
+# los reconfigura (ver motor.interfaz.GestorEscena)
+objetos = GestorEscena()
+
+# Segundos simulados por segundo real
+VELOCIDAD = 1.0
+
+# Archivo donde se graba la última simulación (ver motor.grabacion)
+ARCHIVO_GRABACION = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ultima_simulacion.tray")
+COLUMNAS = ["t", "h", "V"]
+
+# Análisis y trayectorias de las últimas configuraciones (ver motor.cache)
+cache = cache_simulacion("torricelli")
+
+# Parámetros que los sliders pueden cambiar durante una ejecución
+PARAMETROS_EN_VIVO = ("R", "r", "Cd")
+# Cambios pendientes de la ejecución en curso (None si no hay ninguna)
+en_vivo = None
+
+# Red de tanques: tanques dibujados (los primeros en orden de anchura),
+# curvas de nivel y duración máxima de la animación en segundos reales
+TANQUES_MOSTRADOS = 15
+CURVAS_RED = 4
+DURACION_MAXIMA_RED = 60.0
+TOPOLOGIAS = {"Árbol binario": red_tanques.arbol_binario, "Cadena": red_tanques.cadena}
+# Tanques máximos de cada topología: una cadena tarda ~n/2 veces lo que un
+# tanque solo y necesita ~20·n pasos de RK45 con las n alturas guardadas en
+# cada uno, así que más de 200 no se resuelven en un tiempo interactivo
+TANQUES_MAXIMOS = {"Árbol binario": 4095, "Cadena": 200}
+# Horizonte de la red: tantas veces el vaciado de un tanque solo como
+# tanques tiene su camino más largo (red.profundidad())
+VACIADOS_POR_NIVEL = 2
+# Gráficas de la red (se crean la primera vez que se usan)
+graficas_red = None
 
-wtext(text="\n--- Parámetros del modelo ---\n")
+# -------------------------------------------------
+# ESCENA BASE
+# -------------------------------------------------
+def crear_interfaz():
+    """Crea la ventana, las gráficas y los controles (carga VPython)."""
+    global vp, scene, graph_altura, curve_altura, curve_altura_teorica, pred_altura, graph_volumen
+    global curve_volumen, texto_h0, slider_h0, texto_R, slider_R, texto_r, slider_r, texto_Cd
+    global slider_Cd, ecuacion_general, ecuacion_general2, ecuacion_general3, ecuacion_params
+    global solucion_analitica, salida_info, salida_areas, boton, boton_repetir
+    global texto_n_tanques, slider_n_tanques, menu_topologia, boton_red
+    vp = cargar_vpython()
+
+    scene = vp.canvas(title="Vaciado de un tanque cilíndrico",
+                      width=900, height=600, background=vp.color.white)
+
+    # Gráficas
+    graph_altura = vp.graph(title="Altura vs Tiempo", 
+                            xtitle="Tiempo (s)", ytitle="Altura (m)",
+                            width=650, height=300, align="right")
+    curve_altura = vp.gcurve(color=vp.color.blue, width=2, label="h(t) - Numérica")
+    curve_altura_teorica = vp.gcurve(color=vp.color.red, width=2, label="h(t) - Teórica", dot=True, dot_radius=3)
+    pred_altura = vp.gcurve(color=vp.color.orange, width=1, label="h(t) - Predicción")
+
+    graph_volumen = vp.graph(title="Volumen vs Tiempo", 
+                             xtitle="Tiempo (s)", ytitle="Volumen (m³)",
+                             width=650, height=300, align="right")
+    curve_volumen = vp.gcurve(color=vp.color.green, width=2, label="V(t)")
+
+    vp.wtext(text="\n--- Parámetros del modelo ---\n")
+
+    # Sliders con valores dinámicos
+    # --- Altura inicial ---
+    texto_h0 = vp.wtext(text="Altura inicial (h₀): 2.00 m\n")
+    def actualizar_h0(s):
+        texto_h0.text = f"Altura inicial (h₀): {s.value:.2f} m\n"
+    slider_h0 = vp.slider(min=0.5, max=10, value=2, step=0.1, bind=actualizar_h0)
+
+    # --- Radio del tanque ---
+    texto_R = vp.wtext(text="\nRadio del tanque (R): 0.50 m\n")
+    def actualizar_R(s):
+        texto_R.text = f"\nRadio del tanque (R): {s.value:.2f} m\n"
+        avisar_cambio()
+    slider_R = vp.slider(min=0.2, max=2.5, value=0.5, step=0.05, bind=actualizar_R)
+
+    # --- Radio del orificio de salida ---
+    texto_r = vp.wtext(text="\nRadio del orificio (r): 0.05 m\n")
+    def actualizar_r(s):
+        texto_r.text = f"\nRadio del orificio (r): {s.value:.4f} m\n"
+        avisar_cambio()
+    slider_r = vp.slider(min=0.005, max=0.2, value=0.05, step=0.005, bind=actualizar_r)
+
+    # --- Coeficiente de descarga ---
+    texto_Cd = vp.wtext(text="\nCoeficiente de descarga (Cd): 0.62\n")
+    def actualizar_Cd(s):
+        texto_Cd.text = f"\nCoeficiente de descarga (Cd): {s.value:.2f}\n"
+        avisar_cambio()
+    slider_Cd = vp.slider(min=0.3, max=1.0, value=0.62, step=0.02, bind=actualizar_Cd)
+
+    vp.wtext(text="\n")
+
+    # Mostrar ecuación diferencial general
+    ecuacion_general = vp.wtext(text="\n--- Ecuación Diferencial ---\n")
+    ecuacion_general2 = vp.wtext(text="Forma general: dh/dt = -(Cd·A_orificio/A_tanque)·√(2gh)\n")
+    ecuacion_general3 = vp.wtext(text="donde: A_orificio = π·r², A_tanque = π·R²\n\n")
+
+    # Ecuación con parámetros sustituidos
+    ecuacion_params = vp.wtext(text="Ecuación con parámetros: (presiona 'Iniciar simulación')\n\n")
+
+    # Solución analítica
+    solucion_analitica = vp.wtext(text="")
+
+    # Salidas numéricas
+    salida_info = vp.wtext(text="Tiempo total: ---\n")
+    salida_areas = vp.wtext(text="")
+
+    # Botón para iniciar simulación
+    boton = vp.button(text="▶ Iniciar simulación", bind=simular)
+    # Botón para repetir la última simulación grabada
+    boton_repetir = vp.button(text="⟲ Repetir última", bind=reproducir)
+
+    # --- Red de tanques en cascada (mismos R, r y Cd en todos) ---
+    vp.wtext(text="\n\n--- Red de tanques ---\n")
+    texto_n_tanques = vp.wtext(text="Tanques en la red: 63\n")
+    def actualizar_n_tanques(s):
+        texto_n_tanques.text = f"Tanques en la red: {int(s.value)}\n"
+    slider_n_tanques = vp.slider(min=3, max=TANQUES_MAXIMOS["Árbol binario"], value=63, step=1,
+                                 bind=actualizar_n_tanques)
+    vp.wtext(text="\nTopología: ")
+    def actualizar_topologia(m):
+        # Cada topología tiene su propio máximo de tanques
+        slider_n_tanques.max = TANQUES_MAXIMOS[m.selected]
+        if slider_n_tanques.value > slider_n_tanques.max:
+            slider_n_tanques.value = slider_n_tanques.max
+            actualizar_n_tanques(slider_n_tanques)
+    menu_topologia = vp.menu(choices=list(TOPOLOGIAS), selected="Árbol binario",
+                             bind=actualizar_topologia)
+    vp.wtext(text="  ")
+    boton_red = vp.button(text="▶ Simular red de tanques", bind=simular_red)
 
-# Sliders con valores dinámicos
-# --- Altura inicial ---
-texto_h0 = wtext(text="Altura inicial (h₀): 2.00 m\n")
-def actualizar_h0(s):
-    texto_h0.text = f"Altura inicial (h₀): {s.value:.2f} m\n"
-slider_h0 = slider(min=0.5, max=10, value=2, step=0.1, bind=actualizar_h0)
 
-# --- Radio del tanque ---
-texto_R = wtext(text="\nRadio del tanque (R): 0.50 m\n")
-def actualizar_R(s):
-    texto_R.text = f"\nRadio del tanque (R): {s.value:.2f} m\n"
-slider_R = slider(min=0.2, max=2.5, value=0.5, step=0.05, bind=actualizar_R)
+# -------------------------------------------------
+# FUNCIONES DE SIMULACIÓN
+# -------------------------------------------------
 
-# --- Radio del orificio de salida ---
-texto_r = wtext(text="\nRadio del orificio (r): 0.05 m\n")
-def actualizar_r(s):
-    texto_r.text = f"\nRadio del orificio (r): {s.value:.4f} m\n"
-slider_r = slider(min=0.005, max=0.2, value=0.05, step=0.005, bind=actualizar_r)
+def avisar_cambio():
+    """Modo en vivo: anota los valores de los sliders para la ejecución en curso."""
+    if en_vivo is not None:
+        en_vivo.cambiar(leer_parametros())
 
-# --- Coeficiente de descarga ---
-texto_Cd = wtext(text="\nCoeficiente de descarga (Cd): 0.62\n")
-def actualizar_Cd(s):
-    texto_Cd.text = f"\nCoeficiente de descarga (Cd): {s.value:.2f}\n"
-slider_Cd = slider(min=0.3, max=1.0, value=0.62, step=0.02, bind=actualizar_Cd)
 
-wtext(text="\n")
+def leer_parametros():
+    """Parámetros actuales de los sliders."""
+    return dict(h0=float(slider_h0.value), R=float(slider_R.value),
+                r=float(slider_r.value), Cd=float(slider_Cd.value))
 
-# Mostrar ecuación diferencial general
-ecuacion_general = wtext(text="\n--- Ecuación Diferencial ---\n")
-ecuacion_general2 = wtext(text="Forma general: dh/dt = -(Cd·A_orificio/A_tanque)·√(2gh)\n")
-ecuacion_general3 = wtext(text="donde: A_orificio = π·r², A_tanque = π·R²\n\n")
 
-# Ecuación con parámetros sustituidos
-ecuacion_params = wtext(text="Ecuación con parámetros: (presiona 'Iniciar simulación')\n\n")
+def construir_escena(p):
+    """Prepara el tanque, las etiquetas y las curvas de una ejecución."""
+    h0, R, r, Cd = p["h0"], p["R"], p["r"], p["Cd"]
+    A_tanque = np.pi * R**2
+    A_orificio = np.pi * r**2
 
-# Solución analítica
-solucion_analitica = wtext(text="")
+    # Las curvas se vacían y se reutilizan
+    series = [CurvaBufferizada(curva) for curva in (curve_altura, curve_volumen,
+                                                     curve_altura_teorica, pred_altura)]
+    for serie in series:
+        serie.reiniciar()
 
-# Salidas numéricas
-salida_info = wtext(text="Tiempo total: ---\n")
-salida_areas = wtext(text="")
+    # Ocultar objetos previos (también los de la red)
+    objetos.ocultar()
 
-# -------------------------------------------------
-# ANÁLISIS DE LA ECUACIÓN
-# -------------------------------------------------
-def analizar_ecuacion(h0, Cd, A_orificio, A_tanque, g):
-    """
-    Analiza la ecuación diferencial y encuentra su solución analítica.
-    
-    Ecuación: dh/dt = -k·√h  donde k = Cd·(A_orificio/A_tanque)·√(2g)
-    
-    Solución por separación de variables:
-    ∫ dh/√h = -k ∫ dt
-    2√h = -kt + C
-    
-    Con condición inicial h(0) = h₀:
-    2√h₀ = C
-    
-    Por lo tanto:
-    √h = √h₀ - (k/2)·t
-    h(t) = (√h₀ - (k/2)·t)²
-    
-    El tanque se vacía cuando h = 0:
-    √h₀ - (k/2)·t_final = 0
-    t_final = 2√h₀ / k
-    """
-    
-    k = Cd * (A_orificio / A_tanque) * np.sqrt(2 * g)
+    # Tanque cilíndrico exterior (solo el borde)
+    tanque = objetos.objeto("tanque", vp.cylinder, pos=vp.vector(0, 0, 0), axis=vp.vector(0, h0*1.2, 0),
+                            radius=R, opacity=0.15, color=vp.color.gray(0.5))
     
-    # Tiempo teórico de vaciado
-    t_final_teorico = 2 * np.sqrt(h0) / k
+    # Agua
+    agua = objetos.objeto("agua", vp.cylinder, pos=vp.vector(0, 0, 0), axis=vp.vector(0, h0, 0),
+                          radius=R * 0.98, color=vp.color.cyan, opacity=0.7)
     
-    texto = "\n--- Solución Analítica ---\n"
-    texto += f"Simplificando: dh/dt = -k·√h\n"
-    texto += f"donde k = Cd·(A_orificio/A_tanque)·√(2g) = {k:.6f}\n\n"
+    # Orificio de salida (visual)
+    objetos.objeto("orificio", vp.cylinder, pos=vp.vector(R*0.7, 0, 0), axis=vp.vector(0.3, 0, 0),
+                   radius=r, color=vp.color.red, opacity=0.8)
+    objetos.objeto("etiqueta_orificio", vp.label, pos=vp.vector(R*0.85, -0.3, 0),
+                   text=f"Orificio: r={r:.3f}m",
+                   height=10, box=False, color=vp.color.red)
     
-    texto += "📐 Resolución por separación de variables:\n"
-    texto += "∫ dh/√h = -k ∫ dt\n"
-    texto += "2√h = -kt + C\n"
-    texto += f"Con h(0) = {h0:.2f}, obtenemos C = {2*np.sqrt(h0):.4f}\n\n"
+    # Etiquetas
+    label_h = objetos.objeto("etiqueta_altura", vp.label, text=f"Altura: {h0:.2f} m",
+                             pos=vp.vector(0, h0*1.3, 0), box=False, height=16)
+    label_v = objetos.objeto("etiqueta_volumen", vp.label, text=f"Volumen: {A_tanque*h0:.3f} m³",
+                             pos=vp.vector(0, h0*1.2, 0), box=False, height=14)
+    label_t = objetos.objeto("etiqueta_tiempo", vp.label, text=f"Tiempo: 0.00 s",
+                             pos=vp.vector(0, h0*1.1, 0), box=False, height=14)
+    label_error = objetos.objeto("etiqueta_error", vp.label, text=f"Error: 0.00%",
+                                 pos=vp.vector(0, h0*1.0, 0), box=False, height=12, color=vp.color.orange)
+
+    # Línea de referencia del fondo
+    objetos.objeto("fondo", vp.cylinder, pos=vp.vector(-R*1.2, 0, 0), axis=vp.vector(R*2.4, 0, 0),
+                   radius=0.02, color=vp.color.green)
+
+    # Textos con frecuencia limitada (solo se envían si cambian)
+    textos = [TextoLimitado(label_h, "Altura: {:.3f} m"),
+              TextoLimitado(label_v, "Volumen: {:.4f} m³"),
+              TextoLimitado(label_t, "Tiempo: {:.2f} s"),
+              TextoLimitado(label_error, "Error vs teórica: {:.2f}%")]
+
+    return SimpleNamespace(
+        p=p, A_tanque=A_tanque, A_orificio=A_orificio,
+        k=Cd * (A_orificio / A_tanque) * np.sqrt(2 * g),
+        # Estado desde el que se mide la solución teórica (cambia en vivo)
+        t_ref=0.0, h_ref=h0,
+        tanque=tanque, agua=agua, textos=textos, contador_graficas=0,
+        serie_altura=series[0], serie_volumen=series[1],
+        serie_altura_teorica=series[2], serie_prediccion=series[3])
+
+
+def actualizar_escena(escena, tiempo_total, h):
+    """Dibuja un fotograma con la altura h en el instante tiempo_total."""
+    texto_h, texto_v, texto_t, texto_error = escena.textos
+
+    # Calcular volumen actual
+    volumen = escena.A_tanque * h
     
-    texto += "🎯 Solución general:\n"
-    texto += f"h(t) = (√{h0:.2f} - {k/2:.6f}·t)²\n"
-    texto += f"h(t) = ({np.sqrt(h0):.4f} - {k/2:.6f}·t)²\n\n"
+    # Calcular altura teórica
+    h_teorica = solucion_teorica(tiempo_total - escena.t_ref, escena.h_ref, escena.k)
     
-    texto += "⏱️  Tiempo teórico de vaciado:\n"
-    texto += f"t_final = 2√h₀ / k = 2√{h0:.2f} / {k:.6f}\n"
-    texto += f"t_final = {t_final_teorico:.2f} segundos\n\n"
+    # Calcular error porcentual
+    if h_teorica > 0:
+        error = abs(h - h_teorica) / h_teorica * 100
+    else:
+        error = 0
+
+    # Actualizar visualización del agua
+    escena.agua.axis = vp.vector(0, h, 0)
     
-    return texto, k, t_final_teorico
-
-
-def solucion_teorica(t, h0, k):
+    # Actualizar etiquetas
+    texto_h.actualizar(h)
+    texto_v.actualizar(volumen)
+    texto_t.actualizar(tiempo_total)
+    texto_error.actualizar(error)
+
+    # Agregar puntos a las gráficas (se envían por lotes)
+    escena.contador_graficas += 1
+    escena.serie_altura.agregar(tiempo_total, h)
+    escena.serie_volumen.agregar(tiempo_total, volumen)
+    # Graficar solución teórica cada 6 fotogramas
+    if escena.contador_graficas % 6 == 0:
+        escena.serie_altura_teorica.agregar(tiempo_total, h_teorica)
+
+
+def aplicar_en_vivo(escena, cambios, tiempo_total, h):
     """
-    Calcula la altura teórica en el tiempo t usando la solución analítica.
-    h(t) = (√h₀ - (k/2)·t)²
+    Aplica a la ejecución en curso los parámetros nuevos y vuelve a
+    resolver desde la altura actual. Devuelve la solución nueva.
     """
-    raiz = np.sqrt(h0) - (k/2) * t
-    if raiz < 0:
-        return 0
-    return raiz**2
+    escena.p = dict(escena.p, **{n: cambios[n] for n in PARAMETROS_EN_VIVO})
+    R, r, Cd = escena.p["R"], escena.p["r"], escena.p["Cd"]
+    escena.A_tanque = np.pi * R**2
+    escena.A_orificio = np.pi * r**2
+    escena.k = Cd * (escena.A_orificio / escena.A_tanque) * np.sqrt(2 * g)
+    escena.tanque.radius = R
+    escena.agua.radius = R * 0.98
+    # La solución teórica sigue desde aquí con los parámetros nuevos
+    escena.t_ref, escena.h_ref = tiempo_total, h
+    return torricelli.vaciar(h, Cd, escena.A_orificio, escena.A_tanque, g)
+
+
+def resolver_en_vivo(escena, tiempo_total, h):
+    """Rehace el análisis y la predicción desde la altura actual."""
+    Cd = escena.p["Cd"]
+    mostrar_ecuacion(Cd, escena.A_orificio, escena.A_tanque)
+    texto_analisis, _, _ = analizar_ecuacion(h, Cd, escena.A_orificio, escena.A_tanque, g)
+    solucion_analitica.text = texto_analisis
 
+    tiempos, estados = prediccion("torricelli", tiempo_total, [h], np.inf, Cd=Cd,
+                                  A_orificio=escena.A_orificio, A_tanque=escena.A_tanque, g=g)
+    escena.serie_prediccion.reiniciar(tiempos, estados[:, 0])
 
-# -------------------------------------------------
-# ECUACIÓN DIFERENCIAL
-# -------------------------------------------------
-def dhdt(h, Cd, A_orificio, A_tanque, g):
-    """
-    Ecuación de Torricelli para vaciado de tanque:
-    dh/dt = -(Cd·A_orificio/A_tanque)·√(2gh)
-    """
-    if h <= 0:
-        return 0
-    return -(Cd * A_orificio / A_tanque) * np.sqrt(2 * g * h)
 
+def terminar_escena(escena):
+    """Envía los puntos y textos pendientes."""
+    for serie in (escena.serie_altura, escena.serie_volumen, escena.serie_altura_teorica):
+        serie.enviar()
+    for texto in escena.textos:
+        texto.forzar()
 
-# Limpiar objetos anteriores
-def hide_previous_objects():
-    global created_objects
-    for obj in created_objects:
-        try:
-            obj.visible = False
-        except:
-            pass
-    created_objects = []
+
+def mostrar_ecuacion(Cd, A_orificio, A_tanque):
+    """Muestra las áreas y la ecuación con los parámetros sustituidos."""
+    salida_areas.text = (f"Área del tanque: {A_tanque:.4f} m²\n"
+                        f"Área del orificio: {A_orificio:.6f} m²\n"
+                        f"Relación A_orificio/A_tanque: {A_orificio/A_tanque:.6f}\n\n")
+
+    coef = Cd * A_orificio / A_tanque
+    ecuacion_params.text = (f"Ecuación con parámetros:\n"
+                            f"dh/dt = -({Cd:.2f}·{A_orificio:.6f}/{A_tanque:.4f})·√(2·{g}·h)\n"
+                            f"dh/dt = -({coef:.6f})·√({2*g:.2f}·h)\n"
+                            f"dh/dt ≈ -{coef:.6f}·√({2*g:.1f}h)\n\n")
 
 
 # Simulación
 def simular(ev):
-    global created_objects, curve_altura, curve_volumen, curve_altura_teorica
+    global en_vivo
 
     # Leer parámetros desde sliders
-    h0 = float(slider_h0.value)
-    R = float(slider_R.value)
-    r = float(slider_r.value)
-    Cd = float(slider_Cd.value)
+    p = leer_parametros()
+    h0, R, r, Cd = p["h0"], p["R"], p["r"], p["Cd"]
 
     # Calcular áreas
     A_tanque = np.pi * R**2
     A_orificio = np.pi * r**2
-    
-    # Mostrar información de áreas
-    salida_areas.text = (f"Área del tanque: {A_tanque:.4f} m²\n"
-                        f"Área del orificio: {A_orificio:.6f} m²\n"
-                        f"Relación A_orificio/A_tanque: {A_orificio/A_tanque:.6f}\n\n")
-    
-    # Construir ecuación con parámetros sustituidos
-    coef = Cd * A_orificio / A_tanque
-    ec_texto = (f"Ecuación con parámetros:\n"
-                f"dh/dt = -({Cd:.2f}·{A_orificio:.6f}/{A_tanque:.4f})·√(2·{g}·h)\n"
-                f"dh/dt = -({coef:.6f})·√({2*g:.2f}·h)\n"
-                f"dh/dt ≈ -{coef:.6f}·√({2*g:.1f}h)\n\n")
-    ecuacion_params.text = ec_texto
-    
-    # Análisis de la ecuación
-    texto_analisis, k, t_final_teorico = analizar_ecuacion(h0, Cd, A_orificio, A_tanque, g)
-    solucion_analitica.text = texto_analisis
 
-    # Limpiar gráficas anteriores
-    curve_altura.delete()
-    curve_volumen.delete()
-    curve_altura_teorica.delete()
-    curve_altura = gcurve(color=color.blue, width=2, label="h(t) - Numérica")
-    curve_volumen = gcurve(color=color.green, width=2, label="V(t)")
-    curve_altura_teorica = gcurve(color=color.red, width=2, label="h(t) - Teórica", dot=True, dot_radius=3)
+    # Mostrar áreas y ecuación con parámetros sustituidos
+    mostrar_ecuacion(Cd, A_orificio, A_tanque)
 
-    # Ocultar objetos previos
-    hide_previous_objects()
+    # Una configuración ya simulada se reproduce sin analizar ni integrar
+    clave = clave_parametros("torricelli", p)
+    guardado = cache.obtener(clave)
+    if guardado is not None:
+        solucion_analitica.text = guardado["texto_analisis"]
+        trayectoria = Trayectoria(guardado["datos"], COLUMNAS, "torricelli", p)
+        guardar_grabacion(ARCHIVO_GRABACION, trayectoria)
+        reproducir_trayectoria(trayectoria)
+        salida_info.text = guardado["resumen"]
+        return
 
-    # Crear tanque cilíndrico exterior (solo el borde)
-    tanque = cylinder(pos=vector(0, 0, 0), axis=vector(0, h0*1.2, 0),
-                      radius=R, opacity=0.15, color=color.gray(0.5))
-    
-    # Crear agua
-    agua = cylinder(pos=vector(0, 0, 0), axis=vector(0, h0, 0),
-                    radius=R * 0.98, color=color.cyan, opacity=0.7)
-    
-    # Crear orificio de salida (visual)
-    orificio = cylinder(pos=vector(R*0.7, 0, 0), axis=vector(0.3, 0, 0),
-                       radius=r, color=color.red, opacity=0.8)
-    orificio_label = label(pos=vector(R*0.85, -0.3, 0),
-                          text=f"Orificio: r={r:.3f}m", 
-                          height=10, box=False, color=color.red)
-    
-    # Etiquetas
-    label_h = label(text=f"Altura: {h0:.2f} m",
-                    pos=vector(0, h0*1.3, 0), box=False, height=16)
-    label_v = label(text=f"Volumen: {A_tanque*h0:.3f} m³",
-                    pos=vector(0, h0*1.2, 0), box=False, height=14)
-    label_t = label(text=f"Tiempo: 0.00 s",
-                    pos=vector(0, h0*1.1, 0), box=False, height=14)
-    label_error = label(text=f"Error: 0.00%",
-                       pos=vector(0, h0*1.0, 0), box=False, height=12, color=color.orange)
+    # Análisis de la ecuación
+    texto_analisis, k, t_final_teorico = analizar_ecuacion(h0, Cd, A_orificio, A_tanque, g)
+    solucion_analitica.text = texto_analisis
 
-    # Línea de referencia del fondo
-    fondo = cylinder(pos=vector(-R*1.2, 0, 0), axis=vector(R*2.4, 0, 0),
-                    radius=0.02, color=color.green)
+    escena = construir_escena(p)
 
-    created_objects.extend([tanque, agua, orificio, orificio_label, 
-                           label_h, label_v, label_t, label_error, fondo])
+    # Resolver dh/dt con Dormand-Prince 5(4) hasta el evento h = 0
+    solucion = torricelli.vaciar(h0, Cd, A_orificio, A_tanque, g)
+    t_vaciado = solucion.t_evento if solucion.t_evento is not None else solucion.t[-1]
+    # Instante en que empieza la solución actual (cambia en modo en vivo)
+    t_inicio = 0.0
+    n_pasos, n_rechazados = solucion.n_pasos, solucion.n_rechazados
 
-    # Variables de simulación
-    h = h0
-    dt = 0.01
+    # Variables de simulación (dt es solo el paso de la animación)
+    dt = VELOCIDAD / FPS
     tiempo_total = 0.0
-    contador_graficas = 0
-    
+    h = h0
+
     # Botón para detener
     running = True
     def stop_simulation(ev):
         nonlocal running
         running = False
     
-    boton_detener = button(text="Detener simulación", bind=stop_simulation)
-    created_objects.append(boton_detener)
-
-    # Loop de simulación
-    while h > 0.001 and running:
-        rate(100)
-
-        # Método de Euler para resolver dh/dt
-        dh = dhdt(h, Cd, A_orificio, A_tanque, g) * dt
-        h = max(h + dh, 0)
-
-        tiempo_total += dt
-
-        # Calcular volumen actual
-        volumen = A_tanque * h
-        
-        # Calcular altura teórica
-        h_teorica = solucion_teorica(tiempo_total, h0, k)
-        
-        # Calcular error porcentual
-        if h_teorica > 0:
-            error = abs(h - h_teorica) / h_teorica * 100
-        else:
-            error = 0
-
-        # Actualizar visualización del agua
-        agua.axis = vector(0, h, 0)
-        
-        # Actualizar etiquetas
-        label_h.text = f"Altura: {h:.3f} m"
-        label_v.text = f"Volumen: {volumen:.4f} m³"
-        label_t.text = f"Tiempo: {tiempo_total:.2f} s"
-        label_error.text = f"Error vs teórica: {error:.2f}%"
-
-        # Agregar puntos a las gráficas (cada cierto tiempo para no saturar)
-        contador_graficas += 1
-        if contador_graficas % 5 == 0:  # cada 5 iteraciones
-            curve_altura.plot(tiempo_total, h)
-            curve_volumen.plot(tiempo_total, volumen)
-            # Graficar solución teórica cada 10 puntos
-            if contador_graficas % 10 == 0:
-                curve_altura_teorica.plot(tiempo_total, h_teorica)
+    boton_detener = vp.button(text="Detener simulación", bind=stop_simulation)
+
+    # Loop de simulación; cada fotograma se graba para poder repetirlo
+    en_vivo = CambiosEnVivo()
+    with Grabacion(ARCHIVO_GRABACION, "torricelli", COLUMNAS, p) as grabacion:
+        while tiempo_total < t_vaciado and running:
+            vp.rate(FPS)
+
+            # Modo en vivo: se vuelve a resolver desde la altura actual
+            cambios = en_vivo.tomar()
+            if cambios is not None and h > torricelli.H_MINIMA:
+                solucion = aplicar_en_vivo(escena, cambios, tiempo_total, h)
+                t_inicio = tiempo_total
+                t_vaciado = t_inicio + (solucion.t_evento if solucion.t_evento is not None
+                                        else solucion.t[-1])
+                n_pasos += solucion.n_pasos
+                n_rechazados += solucion.n_rechazados
+            if en_vivo.listo():
+                resolver_en_vivo(escena, tiempo_total, h)
+
+            # Altura interpolada de la solución adaptativa
+            tiempo_total = min(tiempo_total + dt, t_vaciado)
+            h = max(float(solucion(tiempo_total - t_inicio)[0]), 0)
+
+            actualizar_escena(escena, tiempo_total, h)
+            grabacion.agregar(tiempo_total, [h, escena.A_tanque * h])
+
+    terminar_escena(escena)
+    modificada = en_vivo.n_cambios > 0
+    en_vivo = None
 
     # Limpiar botón de detener
     boton_detener.delete()
 
+    # Con cambios en vivo, el tiempo teórico es el del último tramo
+    if modificada:
+        t_final_teorico = escena.t_ref + 2 * np.sqrt(escena.h_ref) / escena.k
+
     # Mostrar resultados finales
-    diferencia_tiempo = abs(tiempo_total - t_final_teorico)
+    diferencia_tiempo = abs(t_vaciado - t_final_teorico)
     porcentaje_dif = (diferencia_tiempo / t_final_teorico) * 100
+    dentro_tolerancia = diferencia_tiempo / t_final_teorico <= torricelli.TOLERANCIA_VACIADO
     
-    salida_info.text = (f"⏱️  Tiempo de vaciado (numérico): {tiempo_total:.2f} s\n"
+    salida_info.text = (f"⏱️  Tiempo de vaciado (numérico): {t_vaciado:.2f} s\n"
                        f"⏱️  Tiempo teórico: {t_final_teorico:.2f} s\n"
-                       f"📊 Diferencia: {diferencia_tiempo:.2f} s ({porcentaje_dif:.2f}%)\n"
+                       f"📊 Diferencia: {diferencia_tiempo:.2e} s ({porcentaje_dif:.4f}%)"
+                       f" {'✅' if dentro_tolerancia else '⚠️'}\n"
+                       f"🔢 Pasos RK45: {n_pasos} aceptados, {n_rechazados} rechazados\n"
                        f"📊 Volumen inicial: {A_tanque*h0:.4f} m³\n"
-                       f"📉 Velocidad promedio de vaciado: {h0/tiempo_total:.4f} m/s\n\n")
+                       f"📉 Velocidad promedio de vaciado: {h0/t_vaciado:.4f} m/s\n\n")
+
+    # Solo las ejecuciones completas y sin cambios en vivo se guardan en la caché
+    if running and not modificada:
+        cache.guardar(clave, dict(texto_analisis=texto_analisis, resumen=salida_info.text,
+                                  datos=np.array(abrir_grabacion(ARCHIVO_GRABACION).datos)))
+
+
+# Repetición
+def reproducir(ev):
+    """Repite la última simulación grabada, sin volver a integrar."""
+    if not os.path.exists(ARCHIVO_GRABACION):
+        salida_info.text = "No hay ninguna simulación grabada todavía\n"
+        return
+    reproducir_trayectoria(abrir_grabacion(ARCHIVO_GRABACION))
+
+
+def reproducir_trayectoria(trayectoria):
+    """Dibuja una trayectoria ya calculada al ritmo de la pantalla."""
+    escena = construir_escena(trayectoria.parametros)
+    reproductor = Reproductor(trayectoria, VELOCIDAD, FPS)
+
+    running = True
+    def stop_simulation(ev):
+        nonlocal running
+        running = False
+
+    # Botón para detener y slider para moverse por la grabación
+    boton_detener = vp.button(text="Detener reproducción", bind=stop_simulation)
+    slider_posicion = vp.slider(min=0, max=reproductor.t_final, value=0,
+                                bind=lambda s: reproductor.saltar(s.value))
+
+    for tiempo_total, estado, salto in reproductor.fotogramas(vp.rate):
+        if not running:
+            break
+        if salto:
+            # Rehacer las curvas hasta el instante mostrado
+            i = trayectoria.indice_en(tiempo_total)
+            t = trayectoria.t[:i]
+            escena.serie_altura.reiniciar(t, trayectoria["h"][:i])
+            escena.serie_volumen.reiniciar(t, trayectoria["V"][:i])
+            escena.serie_altura_teorica.reiniciar(
+                t[::6], solucion_teorica(t[::6], escena.p["h0"], escena.k))
+        actualizar_escena(escena, tiempo_total, estado[0])
+
+    terminar_escena(escena)
+    boton_detener.delete()
+    slider_posicion.delete()
+
+
+# -------------------------------------------------
+# RED DE TANQUES
+# -------------------------------------------------
+
+def crear_graficas_red():
+    """Altura de algunos tanques y volumen total de la red frente al tiempo."""
+    graph_niveles = vp.graph(title="Red de tanques: alturas",
+                             xtitle="Tiempo (s)", ytitle="Altura (m)",
+                             width=650, height=300, align="right")
+    colores = [vp.color.blue, vp.color.red, vp.color.green, vp.color.orange]
+    curvas = [vp.gcurve(graph=graph_niveles, color=colores[i % len(colores)], width=2, label="")
+              for i in range(CURVAS_RED)]
+    graph_total = vp.graph(title="Red de tanques: volumen total",
+                           xtitle="Tiempo (s)", ytitle="Volumen (m³)",
+                           width=650, height=300, align="right")
+    curva_total = vp.gcurve(graph=graph_total, color=vp.color.purple, width=2, label="V total")
+    return SimpleNamespace(curvas=curvas, niveles=[CurvaBufferizada(c) for c in curvas],
+                           total=CurvaBufferizada(curva_total))
+
+
+def posiciones_red(topologia, n_mostrados, R, h0):
+    """Posición del fondo de cada tanque dibujado: por niveles o en escalera."""
+    if topologia == "Cadena":
+        i = np.arange(n_mostrados)
+        return np.column_stack([i * 3 * R, -i * 1.5 * h0])
+    nivel = red_tanques.niveles_arbol(n_mostrados)
+    en_nivel = np.arange(n_mostrados) - (2**nivel - 1)
+    ancho = 2**nivel.max()
+    x = (en_nivel + 0.5) * (ancho / 2**nivel) - ancho / 2
+    return np.column_stack([x * 2.5 * R, -nivel * 1.5 * h0])
+
+
+def construir_escena_red(p, topologia, n_mostrados):
+    """Dibuja los primeros n_mostrados tanques de la red con los objetos de los pools."""
+    objetos.ocultar()
+    h0, R, r = p["h0"], p["R"], p["r"]
+    tanques = objetos.pool("tanques_red", lambda: vp.cylinder(opacity=0.15, color=vp.color.gray(0.5)))
+    aguas = objetos.pool("aguas_red", lambda: vp.cylinder(color=vp.color.cyan, opacity=0.7))
+    orificios = objetos.pool("orificios_red", lambda: vp.cylinder(color=vp.color.red))
+    tanques, aguas, orificios = (pool.tomar(n_mostrados) for pool in (tanques, aguas, orificios))
+    posiciones = posiciones_red(topologia, n_mostrados, R, h0)
+    for tanque, agua, orificio, (x, y) in zip(tanques, aguas, orificios, posiciones):
+        base = vp.vector(x, y, 0)
+        tanque.pos, tanque.axis, tanque.radius = base, vp.vector(0, h0 * 1.2, 0), R
+        agua.pos, agua.axis, agua.radius = base, vp.vector(0, h0, 0), R * 0.98
+        orificio.pos, orificio.axis, orificio.radius = base, vp.vector(0, -0.3, 0), r
+    label_t = objetos.objeto("etiqueta_red", vp.label, text="Tiempo: 0.00 s",
+                             pos=vp.vector(0, h0 * 1.6, 0), box=False, height=14)
+    return SimpleNamespace(aguas=aguas, textos=[TextoLimitado(label_t, "Tiempo: {:.2f} s")])
+
+
+def simular_red(ev):
+    """
+    Resuelve toda la red como un solo sistema vectorizado y anima solo los
+    primeros TANQUES_MOSTRADOS tanques; las gráficas siguen CURVAS_RED
+    tanques (uno por nivel en el árbol) y el volumen total.
+    """
+    global graficas_red
+    if graficas_red is None:
+        graficas_red = crear_graficas_red()
+
+    p = leer_parametros()
+    topologia = menu_topologia.selected
+    n_tanques = min(int(slider_n_tanques.value), TANQUES_MAXIMOS[topologia])
+    red = TOPOLOGIAS[topologia](n_tanques, p["R"], p["r"], p["Cd"], g=g)
+
+    # Todos los tanques empiezan llenos hasta h0; t_vaciado es el de un tanque solo
+    t_vaciado = np.sqrt(2 * p["h0"] / g) * (p["R"] / p["r"])**2 / p["Cd"]
+    t_maximo = VACIADOS_POR_NIVEL * red.profundidad() * t_vaciado
+    solucion = red.resolver(p["h0"], t_maximo)
+    t_fin = solucion.t_evento if solucion.t_evento is not None else solucion.t[-1]
+
+    n_mostrados = min(TANQUES_MOSTRADOS, n_tanques)
+    escena = construir_escena_red(p, topologia, n_mostrados)
+    # Tanques de las curvas: la raíz de cada nivel del árbol, o repartidos en la cadena
+    if topologia == "Cadena":
+        seguidos = np.unique(np.linspace(0, n_tanques - 1, CURVAS_RED).astype(int))
+    else:
+        seguidos = 2**np.arange(CURVAS_RED) - 1
+        seguidos = seguidos[seguidos < n_tanques]
+    for curva, serie, i in zip(graficas_red.curvas, graficas_red.niveles, range(CURVAS_RED)):
+        serie.reiniciar()
+        curva.label = f"h{seguidos[i]}" if i < len(seguidos) else ""
+    graficas_red.total.reiniciar()
+
+    running = True
+    def stop_simulation(ev):
+        nonlocal running
+        running = False
+    boton_detener = vp.button(text="Detener red", bind=stop_simulation)
+
+    # Las redes largas se aceleran para que la animación no pase de DURACION_MAXIMA_RED
+    dt = max(VELOCIDAD, t_fin / DURACION_MAXIMA_RED) / FPS
+    tiempo_total = 0.0
+    while tiempo_total < t_fin and running:
+        vp.rate(FPS)
+        tiempo_total = min(tiempo_total + dt, t_fin)
+        h = np.maximum(solucion(tiempo_total), 0)
+        for agua, h_i in zip(escena.aguas, h[:n_mostrados]):
+            agua.axis = vp.vector(0, h_i, 0)
+        escena.textos[0].actualizar(tiempo_total)
+        for serie, i in zip(graficas_red.niveles, seguidos):
+            serie.agregar(tiempo_total, h[i])
+        graficas_red.total.agregar(tiempo_total, red.volumen(h).sum())
+
+    for serie in graficas_red.niveles + [graficas_red.total]:
+        serie.enviar()
+    escena.textos[0].forzar()
+    boton_detener.delete()
+
+    if solucion.t_evento is not None:
+        vaciado = f"⏱️  Vaciado de toda la red: {t_fin:.2f} s\n"
+    else:
+        vaciado = f"⏱️  La red no se vació en {t_fin:.2f} s\n"
+    salida_info.text = (f"🌊 Red ({topologia.lower()}) de {n_tanques} tanques, {n_mostrados} dibujados\n"
+                        + vaciado +
+                        f"🔢 Pasos RK45: {solucion.n_pasos} aceptados, {solucion.n_rechazados} rechazados, "
+                        f"{solucion.n_evaluaciones} evaluaciones del sistema\n\n")
+
 
+def main():
+    crear_interfaz()
+    # Evita que el script se cierre
+    input("Presiona ENTER para salir...")
 
-# Botón para iniciar simulación
-boton = button(text="▶ Iniciar simulación", bind=simular)
 
-# Evita que el script se cierre
-input("Presiona ENTER para salir...")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""
+Motor numérico de las simulaciones.
+
+Contiene los modelos de cada simulación escritos sin VPython, de modo que
+pueden ejecutarse sin abrir ninguna ventana. El estado de cada modelo es un
+arreglo de NumPy de forma (N, dim_estado): N configuraciones de parámetros
+avanzan juntas en un único paso vectorizado. Las funciones de análisis
+(analizar_ecuacion y similares) también están aquí y devuelven solo texto.
+
+Módulos:
+    lote         Utilidades para preparar y avanzar lotes de configuraciones
+    integradores Integradores de paso variable (Dormand-Prince 5(4))
+    compilado    Bucles escalares de una trayectoria, con Numba opcional
+    lineal       Solución exacta de a·y'' + b·y' + c·y = F·cos(ω·t), respuesta en
+                 frecuencia y propagador exacto de paso fijo
+    masa_resorte m·x'' + b·x' + k·x = A·cos(ω·t)
+    cadena       Cadena de N masas y N + 1 resortes con operadores tridiagonales
+    rlc          L·Q'' + R·Q' + Q/C = V₀·cos(ω·t)
+    mna          Redes R/L/C por netlist con análisis nodal modificado disperso
+    torricelli   dh/dt = -(Cd·A_orificio/A_tanque)·√(2gh)
+    red_tanques  Redes de tanques de Torricelli en cascada (árbol, cadena o cualquier grafo)
+    mezcla       dC/dt = Qin·(Cin - C) / V(t),  dH/dt = (Qin - Qout) / A
+    red_mezcla   Redes de tanques de mezcla unidos por tuberías, exacta con volumen constante
+    buffer       Buffer circular entre la física de paso fijo y el dibujo
+    graficas     Envío de gráficas por lotes con reducción LTTB
+    textos       Textos en pantalla con frecuencia limitada
+    interfaz     Carga diferida de VPython y objetos de la escena reutilizados entre ejecuciones
+    grabacion    Grabación de trayectorias en archivos mapeados y reproducción
+    cache        Caché LRU de resultados indexada por los parámetros
+    vivo         Cambios de parámetros durante una ejecución y predicción
+    barrido      Barridos de parámetros del tanque de mezcla en paralelo
+    montecarlo   Incertidumbre del tiempo de vaciado por Monte Carlo
+    benchmark    Rendimiento y error de cada modelo (python -m motor.benchmark)
+"""
@@ -0,0 +1,161 @@
+"""
+Barridos de parámetros del tanque de mezcla en un pool de procesos.
+
+La malla de los cinco parámetros de la simulación (Qin, Qout, Cin, h₀ y
+radio del tanque) se divide en bloques que se evalúan en paralelo con
+concurrent.futures. Cada bloque usa el modelo sin ventana (motor.mezcla) y
+sus resultados se escriben en cuanto llegan en un único archivo .npy con un
+campo por columna, mapeado en memoria. Los bloques de la malla se generan
+por índice y solo se envían unos pocos por proceso a la vez, así que la
+malla completa nunca tiene que caber en memoria.
+
+Ejemplo:
+    from motor.barrido import barrido_mezcla
+    resultado = barrido_mezcla("mapa.npy",
+                               Qin=np.linspace(0.005, 0.1, 20),
+                               Qout=np.linspace(0.005, 0.1, 20),
+                               Cin=8.0, h0=np.linspace(0.1, 3.5, 35),
+                               radio=np.linspace(0.5, 3.0, 26))
+    resultado["t_final"], resultado["C_final"]
+"""
+import concurrent.futures
+import os
+
+import numpy as np
+
+from . import lote, mezcla
+
+PARAMETROS_BARRIDO = ("Qin", "Qout", "Cin", "h0", "radio")
+
+# Columnas del archivo de resultados
+TIPO_RESULTADO = np.dtype([
+    ("Qin", "f8"), ("Qout", "f8"), ("Cin", "f8"), ("h0", "f8"), ("radio", "f8"),
+    ("t_final", "f8"),   # instante de llenado/vaciado (o t_maximo si no ocurre)
+    ("C_final", "f8"),   # concentración en t_final (g/L); si se vació, su límite con V → 0
+    ("H_final", "f8"),   # nivel en t_final (m)
+    ("estado", "i1"),    # +1 se llenó, -1 se vació, 0 no ocurrió antes de t_maximo
+])
+
+# Configuraciones por bloque enviado a cada proceso
+TAMANO_BLOQUE = 10000
+# Bloques en curso por proceso: uno calculándose y otro esperando en la cola
+BLOQUES_POR_PROCESO = 2
+# Horizonte máximo de cada simulación (s)
+T_MAXIMO = 3600.0
+
+
+def _ejes(Qin, Qout, Cin, h0, radio):
+    return [np.atleast_1d(np.asarray(v, dtype=float)) for v in (Qin, Qout, Cin, h0, radio)]
+
+
+def _bloque_malla(ejes, inicio, fin):
+    """Filas [inicio, fin) del producto cartesiano, sin construir la malla entera."""
+    indices = np.unravel_index(np.arange(inicio, fin), [len(e) for e in ejes])
+    return {nombre: eje[i] for nombre, eje, i in zip(PARAMETROS_BARRIDO, ejes, indices)}
+
+
+def malla_parametros(Qin, Qout, Cin, h0, radio):
+    """Producto cartesiano de los cinco parámetros, como arreglos planos."""
+    ejes = _ejes(Qin, Qout, Cin, h0, radio)
+    return _bloque_malla(ejes, 0, int(np.prod([len(e) for e in ejes])))
+
+
+def evaluar_bloque(parametros, metodo="analitico", dt=0.05, t_maximo=T_MAXIMO,
+                   altura_tanque=mezcla.ALTURA_TANQUE):
+    """
+    Evalúa un bloque de configuraciones y devuelve un arreglo TIPO_RESULTADO.
+
+    metodo: "analitico" usa mezcla.valores_finales (sin integrar);
+            "euler" integra el lote con mezcla.paso_euler y paso dt, como
+            la simulación interactiva.
+
+    Las configuraciones parten de C = 0. Si el tanque se vacía, la EDO de
+    la concentración es singular en V = 0 y C solo llega a Cin en ese
+    instante (con exponente Qin/|q| puede ser muy pequeño cerca del
+    final), así que C_final es ese límite con los dos métodos: Cin si
+    Qin > 0, la concentración inicial si no. Los últimos pasos de Euler
+    antes de vaciarse, con Qin·dt/V > 1, no lo representan.
+    """
+    Qin, Qout, Cin = parametros["Qin"], parametros["Qout"], parametros["Cin"]
+    h0, radio = parametros["h0"], parametros["radio"]
+    A = np.pi * radio**2
+
+    if metodo == "analitico":
+        t_instante = mezcla.instante_final(Qin, Qout, h0, A, altura_tanque)
+        t_fin = np.minimum(t_instante, t_maximo)
+        C_fin, H_fin = mezcla.solucion_analitica(t_fin, Qin, Qout, Cin, h0, A,
+                                                 altura_tanque=altura_tanque)
+        estado = np.where(t_instante <= t_maximo, np.where(Qin > Qout, 1, -1), 0)
+    elif metodo == "euler":
+        p = lote.parametros_lote(Qin=Qin, Qout=Qout, Cin=Cin, A=A)
+        resultado = lote.simular_lote(mezcla.paso_euler, lote.estado_lote(0.0, h0), p, dt,
+                                      t_maximo, guardar_cada=int(round(t_maximo / dt)),
+                                      detener=mezcla.tanque_lleno_o_vacio)
+        t_fin = resultado["t_fin"]
+        C_fin, H_fin = resultado["estados"][-1].T
+        H_fin = np.clip(H_fin, 0, altura_tanque)
+        estado = np.where(H_fin >= altura_tanque, 1, np.where(H_fin <= 0, -1, 0))
+        C_fin = np.where(estado == -1, np.where(Qin > 0, Cin, 0.0), C_fin)
+    else:
+        raise ValueError(f"Método desconocido: {metodo!r} (use 'analitico' o 'euler')")
+
+    salida = np.empty(len(Qin), dtype=TIPO_RESULTADO)
+    for nombre in PARAMETROS_BARRIDO:
+        salida[nombre] = parametros[nombre]
+    salida["t_final"] = t_fin
+    salida["C_final"] = C_fin
+    salida["H_final"] = H_fin
+    salida["estado"] = estado
+    return salida
+
+
+def _evaluar_en_proceso(bloque, opciones):
+    """Tarea de un proceso del pool (debe ser una función de módulo)."""
+    return evaluar_bloque(bloque, **opciones)
+
+
+def barrido_mezcla(archivo, Qin, Qout, Cin, h0, radio, procesos=None,
+                   tamano_bloque=TAMANO_BLOQUE, **opciones):
+    """
+    Recorre la malla Qin × Qout × Cin × h₀ × radio en paralelo.
+
+    archivo:  ruta del .npy de resultados (se sobrescribe)
+    procesos: número de procesos (por defecto, uno por núcleo)
+    opciones: se pasan a evaluar_bloque (metodo, dt, t_maximo, altura_tanque)
+
+    Devuelve el archivo abierto como memmap de solo lectura.
+    """
+    ejes = _ejes(Qin, Qout, Cin, h0, radio)
+    total = int(np.prod([len(e) for e in ejes]))
+    salida = np.lib.format.open_memmap(archivo, mode="w+", dtype=TIPO_RESULTADO, shape=(total,))
+
+    rangos = ((inicio, min(inicio + tamano_bloque, total))
+              for inicio in range(0, total, tamano_bloque))
+    procesos = procesos or os.cpu_count() or 1
+
+    if procesos == 1:
+        for inicio, fin in rangos:
+            salida[inicio:fin] = evaluar_bloque(_bloque_malla(ejes, inicio, fin), **opciones)
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=procesos) as pool:
+            en_curso = {}
+
+            def escribir(tareas):
+                # Cada bloque se escribe en el archivo en cuanto termina
+                for tarea in tareas:
+                    inicio, fin = en_curso.pop(tarea)
+                    salida[inicio:fin] = tarea.result()
+
+            # Un bloque nuevo se genera solo cuando termina otro
+            for inicio, fin in rangos:
+                if len(en_curso) >= BLOQUES_POR_PROCESO * procesos:
+                    hechas, _ = concurrent.futures.wait(
+                        en_curso, return_when=concurrent.futures.FIRST_COMPLETED)
+                    escribir(hechas)
+                tarea = pool.submit(_evaluar_en_proceso, _bloque_malla(ejes, inicio, fin), opciones)
+                en_curso[tarea] = (inicio, fin)
+            escribir(list(concurrent.futures.as_completed(en_curso)))
+
+    salida.flush()
+    del salida
+    return np.load(archivo, mmap_mode="r")
@@ -0,0 +1,428 @@
+"""
+Benchmark sin ventana de los cuatro modelos.
+
+Mide, para varios dt y tamaños de lote, el rendimiento de la función
+derivada de cada modelo y de su bucle de integración, y el error frente a
+la solución de referencia cuando existe:
+
+    masa_resorte  solución exacta (motor.lineal)
+    rlc           solución exacta (motor.lineal)
+    torricelli    solucion_teorica() y tiempo de vaciado 2√h₀/k
+    mezcla        solución exacta con volumen variable (también para una
+                  red de un solo tanque, que debe reproducirla)
+
+Para N = 1 también mide el bucle escalar de motor.compilado (con Numba si
+está instalado, si no en Python puro), y compara los integradores de
+masa_resorte con el mayor dt que cumple un presupuesto de deriva de energía.
+Con --barrido mide además cómo escala motor.barrido con el número de
+procesos (aceleración frente a un solo proceso).
+
+Uso (desde la carpeta Simulaciones):
+    python -m motor.benchmark --salida resultados.json
+    python -m motor.benchmark --rapido
+    python -m motor.benchmark --barrido 1 2 4 8
+
+Los resultados se guardan en JSON para comparar entre versiones.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from . import barrido, compilado, lineal, lote, masa_resorte, mezcla, rlc, torricelli
+from .red_mezcla import RedMezcla
+
+G = 9.8
+
+# Rangos de los sliders de cada simulación, de donde se sortean los lotes
+RANGOS = {
+    "masa_resorte": dict(m=(0.1, 5.0), b=(0.0, 2.0), k=(0.5, 20.0), A=(0.0, 3.0), w=(0.0, 5.0),
+                         x0=(-2.0, 2.0), v0=(-5.0, 5.0)),
+    "rlc": dict(R=(0.1, 50.0), L=(0.1, 5.0), C=(0.01, 1.0), V0=(0.0, 20.0), omega=(0.0, 10.0),
+                Q0=(0.0, 5.0), I0=(-2.0, 2.0)),
+    "torricelli": dict(h0=(0.5, 10.0), R=(0.2, 2.5), r=(0.005, 0.2), Cd=(0.3, 1.0)),
+    "mezcla": dict(Qin=(0.005, 0.1), Qout=(0.005, 0.1), Cin=(0.0, 20.0), h0=(0.1, 3.5),
+                   radio=(0.5, 3.0)),
+}
+
+DTS = (0.01, 0.001)
+LOTES = (1, 100, 10000)
+T_FINAL = 5.0
+# Instantes guardados para medir el error
+MUESTRAS_ERROR = 10
+# Deriva relativa de energía admitida al comparar integradores de masa_resorte
+PRESUPUESTO_DERIVA = 1e-3
+# Malla del barrido de escalado: puntos por eje de Qin, Qout, h₀ y radio
+# (Cin fijo), integrada con Euler como la simulación
+PUNTOS_EJE_BARRIDO = 12
+DT_BARRIDO = 0.5
+T_MAXIMO_BARRIDO = 600.0
+# Horizonte de la red de un solo tanque (se corta antes si se llena o vacía)
+T_MAXIMO_RED = 5000.0
+
+
+def _sortear(modelo, N, rng):
+    return {nombre: rng.uniform(a, b, N) for nombre, (a, b) in RANGOS[modelo].items()}
+
+
+def _medir(funcion, repeticiones=1):
+    """Ejecuta funcion() y devuelve (resultado, segundos del mejor intento)."""
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion()
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return resultado, mejor
+
+
+def _preparar(modelo, p):
+    """Devuelve (paso, derivadas, estado0, parametros, detener) del modelo."""
+    if modelo == "masa_resorte":
+        parametros = lote.parametros_lote(m=p["m"], b=p["b"], k=p["k"], A=p["A"], w=p["w"])
+        return (masa_resorte.paso_euler, masa_resorte.derivadas,
+                lote.estado_lote(p["x0"], p["v0"]), parametros, None)
+    if modelo == "rlc":
+        parametros = lote.parametros_lote(R=p["R"], L=p["L"], C=p["C"], V0=p["V0"], omega=p["omega"])
+        return (rlc.paso_euler, rlc.derivadas,
+                lote.estado_lote(p["Q0"], p["I0"]), parametros, None)
+    if modelo == "torricelli":
+        parametros = lote.parametros_lote(Cd=p["Cd"], A_orificio=np.pi*p["r"]**2,
+                                          A_tanque=np.pi*p["R"]**2, g=G)
+        return (torricelli.paso_euler, torricelli.derivadas,
+                lote.estado_lote(p["h0"]), parametros, torricelli.tanque_vacio)
+    if modelo == "mezcla":
+        parametros = lote.parametros_lote(Qin=p["Qin"], Qout=p["Qout"], Cin=p["Cin"],
+                                          A=np.pi*p["radio"]**2)
+        return (mezcla.paso_euler, mezcla.derivadas,
+                lote.estado_lote(0.0, p["h0"]), parametros, mezcla.tanque_lleno_o_vacio)
+    raise ValueError(f"Modelo desconocido: {modelo!r}")
+
+
+def _estables(modelo, p, dt):
+    """
+    Máscara de las configuraciones que Euler semi-implícito integra sin
+    diverger con ese dt: radio espectral de su matriz de amplificación ≤ 1
+    (lineal.matriz_amplificacion). Los rangos de RLC incluyen circuitos
+    rígidos que divergen con dt = 0.01; su "error" solo mediría el
+    crecimiento exponencial, así que se cuentan aparte.
+    """
+    coeficientes = {"masa_resorte": lambda: (p["m"], p["b"], p["k"]),
+                    "rlc": lambda: (p["L"], p["R"], 1 / p["C"])}
+    N = len(next(iter(p.values())))
+    if modelo not in coeficientes:
+        return np.ones(N, dtype=bool)
+    G = lineal.matriz_amplificacion("euler", *coeficientes[modelo](), dt)
+    radio = np.max(np.abs(np.linalg.eigvals(G)), axis=-1)
+    return radio <= 1 + lineal.TOLERANCIA_ESTABILIDAD
+
+
+def _error(modelo, p, t, estados):
+    """Error absoluto máximo de la primera componente frente a la referencia."""
+    if modelo == "masa_resorte":
+        referencia = np.array([masa_resorte.solucion_analitica(
+            t, p["m"][i], p["b"][i], p["k"][i], p["x0"][i], p["v0"][i], p["A"][i], p["w"][i])[0]
+            for i in range(len(p["m"]))]).T
+    elif modelo == "rlc":
+        referencia = np.array([rlc.solucion_analitica(
+            t, p["R"][i], p["L"][i], p["C"][i], p["Q0"][i], p["I0"][i], p["V0"][i], p["omega"][i])[0]
+            for i in range(len(p["R"]))]).T
+    elif modelo == "torricelli":
+        k = p["Cd"] * (p["r"]/p["R"])**2 * np.sqrt(2*G)
+        referencia = torricelli.solucion_teorica(t[:, None], p["h0"], k)
+    else:
+        A = np.pi * p["radio"]**2
+        referencia, _ = mezcla.solucion_analitica(t[:, None], p["Qin"], p["Qout"], p["Cin"],
+                                                  p["h0"], A)
+    return float(np.max(np.abs(estados[:, :, 0] - referencia)))
+
+
+def medir_modelo(modelo, dt, N, t_final=T_FINAL, semilla=0):
+    """Mide un modelo con un dt y un tamaño de lote. Devuelve un diccionario."""
+    rng = np.random.default_rng(semilla)
+    p = _sortear(modelo, N, rng)
+    paso, derivadas, estado0, parametros, detener = _preparar(modelo, p)
+    n_pasos = int(round(t_final / dt))
+
+    # Función derivada sola
+    repeticiones_rhs = max(1, min(1000, 100000 // N))
+    _, t_rhs = _medir(lambda: [derivadas(0.0, estado0, **parametros)
+                               for _ in range(repeticiones_rhs)])
+
+    # Bucle de integración completo
+    guardar_cada = max(1, n_pasos // MUESTRAS_ERROR)
+    resultado, t_total = _medir(lambda: lote.simular_lote(paso, estado0, parametros, dt, t_final,
+                                                          guardar_cada=guardar_cada,
+                                                          detener=detener))
+    pasos_hechos = int(round(resultado["t"][-1] / dt))
+    estables = _estables(modelo, p, dt)
+    error = (_error(modelo, {n: v[estables] for n, v in p.items()}, resultado["t"],
+                    resultado["estados"][:, estables]) if estables.any() else float("nan"))
+
+    return {
+        "modelo": modelo,
+        "integrador": "euler",
+        "dt": dt,
+        "N": N,
+        "pasos": pasos_hechos,
+        "tiempo_total_s": t_total,
+        "pasos_por_segundo": pasos_hechos / t_total,
+        "configuraciones_paso_por_segundo": pasos_hechos * N / t_total,
+        "evaluaciones_derivada_por_segundo": repeticiones_rhs * N / t_rhs,
+        "error_max": error,
+        "divergentes": int(N - estables.sum()),
+    }
+
+
+def medir_compilado(modelo, dt, t_final=T_FINAL, semilla=0):
+    """Mide el núcleo escalar de motor.compilado con una sola configuración."""
+    rng = np.random.default_rng(semilla)
+    p = _sortear(modelo, 1, rng)
+    _, _, estado0, parametros, _ = _preparar(modelo, p)
+
+    # La primera llamada incluye la compilación con Numba; no se cuenta
+    compilado.trayectoria(modelo, estado0, dt, dt, **parametros)
+    resultado, t_total = _medir(lambda: compilado.trayectoria(modelo, estado0, dt, t_final,
+                                                              **parametros), repeticiones=3)
+    pasos_hechos = len(resultado["t"]) - 1
+
+    return {
+        "modelo": modelo,
+        "integrador": "euler_numba" if compilado.numba_disponible() else "euler_escalar",
+        "dt": dt,
+        "N": 1,
+        "pasos": pasos_hechos,
+        "tiempo_total_s": t_total,
+        "pasos_por_segundo": pasos_hechos / t_total,
+        "configuraciones_paso_por_segundo": pasos_hechos / t_total,
+        "evaluaciones_derivada_por_segundo": None,
+        "error_max": _error(modelo, p, resultado["t"], resultado["estados"][:, None, :]),
+        "divergentes": int(not _estables(modelo, p, dt)[0]),
+    }
+
+
+def medir_integradores_masa_resorte(presupuesto=PRESUPUESTO_DERIVA, t_final=T_FINAL, semilla=0):
+    """
+    Cada integrador de masa_resorte con el mayor dt cuya deriva de energía
+    no supera el presupuesto (masa_resorte.dt_maximo), y lo que cuesta
+    integrar una configuración con ese dt.
+    """
+    rng = np.random.default_rng(semilla)
+    p = _sortear("masa_resorte", 1, rng)
+    _, _, estado0, parametros, _ = _preparar("masa_resorte", p)
+    escalares = {nombre: float(valor[0]) for nombre, valor in parametros.items()}
+
+    resultados = []
+    for nombre, paso in masa_resorte.INTEGRADORES.items():
+        if nombre == "exacto":
+            # Sin error de discretización: lo que mediría deriva_energia es
+            # solo el error de la cuadratura del trabajo, así que basta el dt
+            # más grueso
+            dt, deriva = 0.5, None
+        else:
+            dt, deriva = masa_resorte.dt_maximo(nombre, presupuesto, t_final, float(p["x0"][0]),
+                                                float(p["v0"][0]), dt_inicial=0.5, **escalares)
+        resultado, t_total = _medir(lambda: lote.simular_lote(paso, estado0, parametros, dt, t_final),
+                                    repeticiones=3)
+        pasos_hechos = len(resultado["t"]) - 1
+        resultados.append({
+            "modelo": "masa_resorte",
+            "integrador": nombre,
+            "dt": dt,
+            "N": 1,
+            "pasos": pasos_hechos,
+            "tiempo_total_s": t_total,
+            "pasos_por_segundo": pasos_hechos / t_total,
+            "configuraciones_paso_por_segundo": pasos_hechos / t_total,
+            "evaluaciones_derivada_por_segundo": None,
+            "error_max": _error("masa_resorte", p, resultado["t"], resultado["estados"]),
+            "deriva_energia": deriva,
+        })
+    return resultados
+
+
+def medir_torricelli_adaptativo(semilla=0, n_casos=20):
+    """Dormand-Prince con evento h = 0 frente al tiempo de vaciado teórico."""
+    rng = np.random.default_rng(semilla)
+    p = _sortear("torricelli", n_casos, rng)
+    pasos = 0
+    error_relativo = 0.0
+    inicio = time.perf_counter()
+    for i in range(n_casos):
+        A_orificio = np.pi * p["r"][i]**2
+        A_tanque = np.pi * p["R"][i]**2
+        solucion = torricelli.vaciar(p["h0"][i], p["Cd"][i], A_orificio, A_tanque, G)
+        k = p["Cd"][i] * (A_orificio / A_tanque) * np.sqrt(2*G)
+        t_teorico = 2 * np.sqrt(p["h0"][i]) / k
+        error_relativo = max(error_relativo, abs(solucion.t_evento - t_teorico) / t_teorico)
+        pasos += solucion.n_pasos
+    t_total = time.perf_counter() - inicio
+    return {
+        "modelo": "torricelli",
+        "integrador": "dormand_prince",
+        "dt": None,
+        "N": n_casos,
+        "pasos": pasos,
+        "tiempo_total_s": t_total,
+        "pasos_por_segundo": pasos / t_total,
+        "configuraciones_paso_por_segundo": pasos / t_total,
+        "evaluaciones_derivada_por_segundo": None,
+        "error_max": error_relativo,
+    }
+
+
+def medir_red_un_tanque(semilla=0, n_casos=20):
+    """
+    motor.red_mezcla con un solo tanque frente a mezcla.solucion_analitica,
+    con Qin ≠ Qout (volumen variable): los dos balances deben coincidir.
+    error_max es la mayor diferencia de C en g/L mientras el tanque tiene
+    líquido.
+    """
+    rng = np.random.default_rng(semilla)
+    p = _sortear("mezcla", n_casos, rng)
+    pasos = 0
+    error = 0.0
+    inicio = time.perf_counter()
+    for i in range(n_casos):
+        A = np.pi * p["radio"][i]**2
+        red = RedMezcla(A, p["h0"][i], Q_entrada=p["Qin"][i], C_entrada=p["Cin"][i],
+                        Q_salida=p["Qout"][i], n_tanques=1)
+        r = red.resolver(C0=0.0, t_final=T_MAXIMO_RED)
+        C, _ = mezcla.solucion_analitica(r["t"], p["Qin"][i], p["Qout"][i], p["Cin"][i],
+                                         p["h0"][i], A)
+        # En el instante en que el tanque queda vacío (V = 0) la EDO es singular
+        con_liquido = r["H"][:, 0] > 0
+        error = max(error, float(np.max(np.abs(r["C"][con_liquido, 0] - C[con_liquido]))))
+        pasos += r["n_pasos"]
+    t_total = time.perf_counter() - inicio
+    return {
+        "modelo": "mezcla",
+        "integrador": "red_1_tanque",
+        "dt": None,
+        "N": n_casos,
+        "pasos": pasos,
+        "tiempo_total_s": t_total,
+        "pasos_por_segundo": pasos / t_total,
+        "configuraciones_paso_por_segundo": pasos / t_total,
+        "evaluaciones_derivada_por_segundo": None,
+        "error_max": error,
+    }
+
+
+def medir_barrido(procesos=(1, 2, 4), puntos_eje=PUNTOS_EJE_BARRIDO):
+    """
+    Tiempo de motor.barrido.barrido_mezcla con distintos números de
+    procesos sobre la misma malla. La aceleración es relativa al primer
+    número de procesos, y error_max es la mayor diferencia de C_final
+    frente a esa ejecución (debe ser 0).
+    """
+    r = RANGOS["mezcla"]
+    ejes = {n: np.linspace(*r[n], puntos_eje) for n in ("Qin", "Qout", "h0", "radio")}
+    total = puntos_eje**4
+    # Bloques pequeños para que haya trabajo para todos los procesos
+    tamano_bloque = max(total // 64, 1)
+    resultados = []
+    with tempfile.TemporaryDirectory() as directorio:
+        referencia = None
+        for n in procesos:
+            archivo = os.path.join(directorio, f"barrido_{n}.npy")
+            inicio = time.perf_counter()
+            mapa = barrido.barrido_mezcla(archivo, Cin=8.0, procesos=n, tamano_bloque=tamano_bloque,
+                                          metodo="euler", dt=DT_BARRIDO, t_maximo=T_MAXIMO_BARRIDO,
+                                          **ejes)
+            t_total = time.perf_counter() - inicio
+            C_final = np.array(mapa["C_final"])
+            del mapa
+            if referencia is None:
+                referencia = (t_total, C_final)
+            resultados.append({
+                "modelo": "mezcla",
+                "integrador": f"barrido x{n}",
+                "dt": DT_BARRIDO,
+                "N": total,
+                "pasos": int(round(T_MAXIMO_BARRIDO / DT_BARRIDO)),
+                "tiempo_total_s": t_total,
+                "pasos_por_segundo": T_MAXIMO_BARRIDO / DT_BARRIDO / t_total,
+                "configuraciones_paso_por_segundo": total * T_MAXIMO_BARRIDO / DT_BARRIDO / t_total,
+                "evaluaciones_derivada_por_segundo": None,
+                "error_max": float(np.nanmax(np.abs(C_final - referencia[1]))),
+                "procesos": n,
+                "aceleracion": referencia[0] / t_total,
+                "nucleos": os.cpu_count(),
+            })
+    return resultados
+
+
+def ejecutar(dts=DTS, lotes=LOTES, t_final=T_FINAL, modelos=tuple(RANGOS), semilla=0):
+    """Ejecuta todo el benchmark y devuelve la lista de resultados."""
+    resultados = []
+    for modelo in modelos:
+        for dt in dts:
+            for N in lotes:
+                resultados.append(medir_modelo(modelo, dt, N, t_final, semilla))
+            if 1 in lotes:
+                resultados.append(medir_compilado(modelo, dt, t_final, semilla))
+    if "masa_resorte" in modelos:
+        resultados.extend(medir_integradores_masa_resorte(t_final=t_final, semilla=semilla))
+    if "torricelli" in modelos:
+        resultados.append(medir_torricelli_adaptativo(semilla))
+    if "mezcla" in modelos:
+        resultados.append(medir_red_un_tanque(semilla))
+    return resultados
+
+
+def _entorno():
+    return {
+        "fecha": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "numpy": np.__version__,
+        "numba": compilado.numba_disponible(),
+        "plataforma": platform.platform(),
+        "procesador": platform.processor(),
+    }
+
+
+def _imprimir(resultados):
+    print(f"{'modelo':<13}{'integrador':<16}{'dt':>8}{'N':>7}{'pasos':>8}"
+          f"{'t (s)':>9}{'pasos/s':>11}{'conf·pasos/s':>14}{'error máx':>12}{'divergen':>10}")
+    for r in resultados:
+        dt = "-" if r["dt"] is None else f"{r['dt']:g}"
+        print(f"{r['modelo']:<13}{r['integrador']:<16}{dt:>8}{r['N']:>7}{r['pasos']:>8}"
+              f"{r['tiempo_total_s']:>9.3f}{r['pasos_por_segundo']:>11.0f}"
+              f"{r['configuraciones_paso_por_segundo']:>14.3g}{r['error_max']:>12.3e}"
+              f"{r.get('divergentes', 0):>10}"
+              + (f"  aceleración {r['aceleracion']:.2f}x" if "aceleracion" in r else ""))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark sin ventana de los modelos")
+    parser.add_argument("--salida", help="archivo JSON donde guardar los resultados")
+    parser.add_argument("--rapido", action="store_true",
+                        help="solo dt = 0.01, lotes de 1 y 100 y t_final = 1 s")
+    parser.add_argument("--modelos", nargs="+", choices=tuple(RANGOS), default=tuple(RANGOS))
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--barrido", type=int, nargs="*", metavar="PROCESOS",
+                        help="mide también el escalado del barrido del tanque de mezcla con "
+                             "estos números de procesos (por defecto 1, 2 y 4)")
+    args = parser.parse_args(argv)
+
+    if args.rapido:
+        resultados = ejecutar((0.01,), (1, 100), 1.0, args.modelos, args.semilla)
+    else:
+        resultados = ejecutar(modelos=args.modelos, semilla=args.semilla)
+    if args.barrido is not None:
+        resultados.extend(medir_barrido(tuple(args.barrido) or (1, 2, 4)))
+    _imprimir(resultados)
+
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as archivo:
+            json.dump({"entorno": _entorno(), "resultados": resultados}, archivo,
+                      indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
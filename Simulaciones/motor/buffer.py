@@ -0,0 +1,189 @@
+"""
+Separación entre el paso físico y la frecuencia de dibujo.
+
+La etapa física (ProductorPasoFijo) avanza con su propio dt fijo y escribe
+cada estado en un BufferCircular acotado. La etapa de dibujo lee del buffer
+al ritmo de la pantalla e interpola entre los dos estados que rodean el
+instante mostrado; si la física produjo más estados de los que caben, los
+más antiguos se descartan (se saltan fotogramas, no se frena la física).
+
+Así el dt elegido por precisión ya no decide cuánto dura una simulación en
+tiempo real: eso lo fija `velocidad` (segundos simulados por segundo real).
+"""
+import numpy as np
+
+# Capacidad por defecto del buffer (estados)
+CAPACIDAD_BUFFER = 256
+# Fotogramas por segundo de la etapa de dibujo
+FPS = 60
+
+
+class BufferCircular:
+    """
+    Buffer circular de capacidad fija con pares (t, estado).
+
+    Cuando está lleno, agregar() sobrescribe el estado más antiguo.
+    """
+
+    def __init__(self, capacidad, dim_estado):
+        self.capacidad = capacidad
+        self.tiempos = np.empty(capacidad)
+        self.estados = np.empty((capacidad, dim_estado))
+        self.inicio = 0
+        self.tamano = 0
+
+    def __len__(self):
+        return self.tamano
+
+    @property
+    def lleno(self):
+        return self.tamano == self.capacidad
+
+    def vaciar(self):
+        self.inicio = 0
+        self.tamano = 0
+
+    def agregar(self, t, estado):
+        fin = (self.inicio + self.tamano) % self.capacidad
+        self.tiempos[fin] = t
+        self.estados[fin] = estado
+        if self.lleno:
+            self.inicio = (self.inicio + 1) % self.capacidad
+        else:
+            self.tamano += 1
+
+    def _indice(self, i):
+        return (self.inicio + i) % self.capacidad
+
+    @property
+    def t_primero(self):
+        return self.tiempos[self.inicio]
+
+    @property
+    def t_ultimo(self):
+        return self.tiempos[self._indice(self.tamano - 1)]
+
+    def interpolar(self, t):
+        """
+        Estado en el instante t, interpolado linealmente entre los dos
+        estados del buffer que lo rodean. Los estados anteriores al intervalo
+        usado se descartan. Fuera del rango devuelve el extremo más cercano.
+        """
+        if self.tamano == 0:
+            raise IndexError("El buffer está vacío")
+        if t <= self.t_primero:
+            return self.estados[self.inicio].copy()
+        if t >= self.t_ultimo:
+            ultimo = self._indice(self.tamano - 1)
+            self.inicio = ultimo
+            self.tamano = 1
+            return self.estados[ultimo].copy()
+
+        orden = self._indice(np.arange(self.tamano))
+        i = int(np.searchsorted(self.tiempos[orden], t, side="right")) - 1
+        a, b = orden[i], orden[i + 1]
+        fraccion = (t - self.tiempos[a]) / (self.tiempos[b] - self.tiempos[a])
+        estado = self.estados[a] + fraccion * (self.estados[b] - self.estados[a])
+
+        # El consumidor ya no necesitará los estados anteriores a `a`
+        self.inicio = a
+        self.tamano -= i
+        return estado
+
+
+class ProductorPasoFijo:
+    """
+    Etapa física de paso fijo para una sola configuración.
+
+    paso:       función de paso del modelo (ver motor.lote)
+    estado0:    estado inicial, forma (dim_estado,)
+    parametros: diccionario con los parámetros del paso
+    detener:    función opcional detener(estado, **parametros) -> máscara,
+                con la misma firma que en motor.lote.simular_lote
+    t0:         instante del estado inicial; el paso n cae en t0 + n·dt
+    avanzar:    función opcional avanzar(n0, estado, dt, n_pasos, **parametros)
+                -> (estados, terminado) que da varios pasos de una vez (los
+                núcleos de motor.compilado); sustituye a paso y detener
+    """
+
+    def __init__(self, paso, estado0, dt, parametros, capacidad=CAPACIDAD_BUFFER,
+                 detener=None, t0=0.0, avanzar=None):
+        self.paso = paso
+        self.dt = dt
+        self.parametros = parametros
+        self.detener = detener
+        self.avanzar = avanzar
+        self.t0 = t0
+        self.t = t0
+        self.n_pasos = 0
+        self.estado = np.array(estado0, dtype=float).reshape(1, -1)
+        self.terminado = False
+        self.buffer = BufferCircular(capacidad, self.estado.shape[1])
+        self.buffer.agregar(self.t, self.estado[0])
+
+    def actualizar_parametros(self, **cambios):
+        """
+        Cambia parámetros sin reiniciar: los pasos siguientes parten del
+        estado actual con los valores nuevos (modo en vivo).
+        """
+        self.parametros = dict(self.parametros, **cambios)
+
+    def producir_hasta(self, t_objetivo):
+        """Avanza la física con pasos dt hasta cubrir t_objetivo."""
+        if self.avanzar is not None:
+            self._avanzar_hasta(t_objetivo)
+            return
+        while self.t < t_objetivo and not self.terminado:
+            self.estado = self.paso(self.t, self.estado, self.dt, **self.parametros)
+            self.n_pasos += 1
+            self.t = self.t0 + self.n_pasos * self.dt
+            self.buffer.agregar(self.t, self.estado[0])
+            if self.detener is not None and self.detener(self.estado, **self.parametros)[0]:
+                self.terminado = True
+
+    def _avanzar_hasta(self, t_objetivo):
+        """Como producir_hasta, pero con todos los pasos en una sola llamada."""
+        if self.terminado or self.t >= t_objetivo:
+            return
+        # Menor número de pasos n con t0 + (n_pasos + n)·dt >= t_objetivo
+        t_relativo = t_objetivo - self.t0
+        n = max(int(np.ceil(t_relativo / self.dt)) - self.n_pasos, 1)
+        while n > 1 and (self.n_pasos + n - 1) * self.dt >= t_relativo:
+            n -= 1
+        while (self.n_pasos + n) * self.dt < t_relativo:
+            n += 1
+
+        # Los núcleos miden el tiempo en pasos: t = n0·dt, con n0 fraccionario si t0 ≠ 0
+        n0 = self.n_pasos + self.t0 / self.dt if self.t0 else self.n_pasos
+        estados, self.terminado = self.avanzar(n0, self.estado[0], self.dt, n, **self.parametros)
+        hechos = len(estados)
+        # Solo los últimos `capacidad` estados caben en el buffer
+        primero = max(hechos - self.buffer.capacidad, 0)
+        for i in range(primero, hechos):
+            self.buffer.agregar(self.t0 + (self.n_pasos + i + 1) * self.dt, estados[i])
+        self.n_pasos += hechos
+        self.t = self.t0 + self.n_pasos * self.dt
+        self.estado = estados[-1:].copy()
+
+
+def fotogramas(productor, rate, velocidad=1.0, t_final=None, fps=FPS):
+    """
+    Generador de la etapa de dibujo: produce (t, estado) una vez por fotograma.
+
+    rate:      función que limita los fotogramas por segundo (vpython.rate)
+    velocidad: segundos simulados por segundo real
+
+    Termina al alcanzar t_final o cuando el productor se detiene; en ese
+    caso el último fotograma es el último estado calculado.
+    """
+    t_vista = productor.t
+    while t_final is None or t_vista < t_final:
+        rate(fps)
+        t_vista += velocidad / fps
+        if t_final is not None:
+            t_vista = min(t_vista, t_final)
+        productor.producir_hasta(t_vista)
+        if productor.terminado and t_vista >= productor.t:
+            yield productor.t, productor.estado[0].copy()
+            return
+        yield t_vista, productor.buffer.interpolar(t_vista)
@@ -0,0 +1,149 @@
+"""
+Caché de resultados indexada por los valores de los sliders.
+
+La clave de una ejecución es el nombre del modelo más sus parámetros
+redondeados a DECIMALES, de modo que 0.30000000000000004 y 0.3 (lo que
+devuelve un slider tras varios pasos) den la misma entrada. Cada entrada es
+un diccionario con los textos del análisis y la trayectoria calculada.
+
+CacheLRU guarda las últimas `capacidad` entradas en memoria (OrderedDict,
+se descarta la usada hace más tiempo). Si se indica un directorio, cada
+entrada también se escribe en un .npz: los arreglos tal cual y el resto de
+los valores como JSON, sin pickle. El directorio se limita del mismo modo
+por fecha de último uso.
+
+La variable de entorno MOTOR_DIRECTORIO_CACHE activa la caché en disco de
+las simulaciones (cache_simulacion).
+"""
+import hashlib
+import json
+import os
+from collections import OrderedDict
+
+import numpy as np
+
+# Entradas que se mantienen en memoria
+CAPACIDAD_CACHE = 32
+# Entradas que se mantienen en disco
+CAPACIDAD_DISCO = 256
+# Decimales con que se cuantizan los parámetros de la clave
+DECIMALES = 6
+# Directorio de la caché persistente de las simulaciones
+VARIABLE_DIRECTORIO = "MOTOR_DIRECTORIO_CACHE"
+
+_CAMPO_JSON = "__json__"
+
+
+def clave_parametros(modelo, parametros, decimales=DECIMALES):
+    """Clave hashable: (modelo, (nombre, valor redondeado), ...) en orden alfabético."""
+    return (modelo,) + tuple((nombre, round(float(valor), decimales))
+                             for nombre, valor in sorted(parametros.items()))
+
+
+def _nombre_archivo(clave):
+    return hashlib.sha1(repr(clave).encode("utf-8")).hexdigest() + ".npz"
+
+
+class CacheLRU:
+    """
+    capacidad:        entradas en memoria
+    directorio:       carpeta de la caché persistente (None: solo memoria)
+    capacidad_disco:  entradas máximas en el directorio
+    """
+
+    def __init__(self, capacidad=CAPACIDAD_CACHE, directorio=None, capacidad_disco=CAPACIDAD_DISCO):
+        self.capacidad = capacidad
+        self.directorio = directorio
+        self.capacidad_disco = capacidad_disco
+        self._entradas = OrderedDict()
+        self.aciertos = 0
+        self.fallos = 0
+
+    def __len__(self):
+        return len(self._entradas)
+
+    def __contains__(self, clave):
+        return clave in self._entradas or (
+            self.directorio is not None
+            and os.path.exists(os.path.join(self.directorio, _nombre_archivo(clave))))
+
+    def obtener(self, clave):
+        """Devuelve la entrada (y la marca como la más reciente) o None."""
+        if clave in self._entradas:
+            self._entradas.move_to_end(clave)
+            self.aciertos += 1
+            return self._entradas[clave]
+
+        valor = self._leer_disco(clave)
+        if valor is None:
+            self.fallos += 1
+            return None
+        self.aciertos += 1
+        self._guardar_memoria(clave, valor)
+        return valor
+
+    def guardar(self, clave, valor):
+        """Guarda un diccionario {nombre: arreglo o valor de JSON}."""
+        self._guardar_memoria(clave, valor)
+        if self.directorio is not None:
+            self._escribir_disco(clave, valor)
+
+    def vaciar(self):
+        """Descarta las entradas en memoria (el disco se conserva)."""
+        self._entradas.clear()
+
+    def _guardar_memoria(self, clave, valor):
+        self._entradas[clave] = valor
+        self._entradas.move_to_end(clave)
+        while len(self._entradas) > self.capacidad:
+            self._entradas.popitem(last=False)
+
+    # -------------------------------------------------
+    # PERSISTENCIA
+    # -------------------------------------------------
+
+    def _leer_disco(self, clave):
+        if self.directorio is None:
+            return None
+        archivo = os.path.join(self.directorio, _nombre_archivo(clave))
+        try:
+            with np.load(archivo, allow_pickle=False) as datos:
+                valor = json.loads(str(datos[_CAMPO_JSON]))
+                valor.update({nombre: datos[nombre] for nombre in datos.files
+                              if nombre != _CAMPO_JSON})
+        except (OSError, ValueError, KeyError):
+            return None
+        # Registrar el uso para el descarte por antigüedad
+        os.utime(archivo)
+        return valor
+
+    def _escribir_disco(self, clave, valor):
+        os.makedirs(self.directorio, exist_ok=True)
+        arreglos = {nombre: v for nombre, v in valor.items() if isinstance(v, np.ndarray)}
+        resto = {nombre: v for nombre, v in valor.items() if nombre not in arreglos}
+        archivo = os.path.join(self.directorio, _nombre_archivo(clave))
+        temporal = archivo + ".tmp.npz"
+        np.savez(temporal, **{_CAMPO_JSON: np.array(json.dumps(resto, ensure_ascii=False))},
+                 **arreglos)
+        os.replace(temporal, archivo)
+        self._limitar_disco()
+
+    def _limitar_disco(self):
+        archivos = [os.path.join(self.directorio, nombre) for nombre in os.listdir(self.directorio)
+                    if nombre.endswith(".npz") and not nombre.endswith(".tmp.npz")]
+        if len(archivos) <= self.capacidad_disco:
+            return
+        archivos.sort(key=os.path.getmtime)
+        for archivo in archivos[:len(archivos) - self.capacidad_disco]:
+            os.remove(archivo)
+
+
+def cache_simulacion(nombre, capacidad=CAPACIDAD_CACHE):
+    """
+    Caché de una simulación: en memoria, y también en disco (en la
+    subcarpeta `nombre`) si MOTOR_DIRECTORIO_CACHE está definida.
+    """
+    directorio = os.environ.get(VARIABLE_DIRECTORIO)
+    if directorio:
+        directorio = os.path.join(directorio, nombre)
+    return CacheLRU(capacidad, directorio or None)
@@ -0,0 +1,349 @@
+"""
+Cadena de N masas acopladas por N + 1 resortes y amortiguadores.
+
+El resorte i (y el amortiguador i) une la masa i - 1 con la masa i; el
+resorte 0 sujeta la primera masa a la pared izquierda y el resorte N la
+última a la derecha (k[N] = b[N] = 0 deja libre ese extremo). Con x los
+desplazamientos respecto al equilibrio:
+
+    M·x'' + B·x' + K·x = A·cos(ω·t)
+
+M = diag(m) y K, B son tridiagonales simétricas construidas con k y b:
+diagonal k[i] + k[i+1] y fuera de ella -k[i+1]. Nunca se forman como
+matrices: cada operador es el par (diagonal, fuera) y aplicarlo cuesta
+O(N). A tiene una amplitud por masa (cero en las que no se fuerzan).
+
+Estado: [x₀ … x_{N-1}, v₀ … v_{N-1}], forma (lote, 2N), así que los pasos
+tienen la firma de motor.lote y sirven a lote.simular_lote y a
+buffer.ProductorPasoFijo; m, b, k y A son arreglos por elemento.
+
+Integradores:
+    verlet    Verlet de velocidades; estable si dt < 2/ω_max (ver
+              dt_estable). El segundo medio impulso es implícito en el
+              amortiguamiento: resuelve (M + dt/2·B)·v₁ = r, tridiagonal,
+              así que sigue siendo de segundo orden con b > 0.
+    trapecio  Newmark de aceleración media (regla del trapecio), implícito,
+              de segundo orden e incondicionalmente estable. Cada paso
+              resuelve (M + dt/2·B + dt²/4·K)·a = r, tridiagonal simétrica
+              y definida positiva, factorizada una sola vez por dt (LDLᵀ de
+              LAPACK si SciPy está instalado, el mismo algoritmo en NumPy
+              si no).
+
+Desde la carpeta Simulaciones, sin ventanas:
+    python -m motor.cadena --masas 10000 --t-final 20
+"""
+import argparse
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+try:
+    from scipy.linalg import lapack
+except ImportError:  # Sin SciPy se usa la factorización en NumPy
+    lapack = None
+
+# Fracción del límite de estabilidad 2/ω_max que usa dt_estable
+FRACCION_ESTABLE = 0.9
+# Cuántas veces menor que el de la simulación es el dt con que main mide
+# el orden de convergencia (lejos del límite de estabilidad)
+REFINAMIENTO_ORDEN = 10
+# Factorizaciones del paso implícito que se conservan
+CAPACIDAD_FACTORIZACIONES = 8
+
+
+def coeficientes_cadena(n_masas, m, k, b, A=0.0):
+    """
+    Arreglos por elemento a partir de escalares o arreglos: m y A de forma
+    (n_masas,), k y b de forma (n_masas + 1,).
+    """
+    N = n_masas
+    return dict(m=np.broadcast_to(np.asarray(m, dtype=float), (N,)).copy(),
+                k=np.broadcast_to(np.asarray(k, dtype=float), (N + 1,)).copy(),
+                b=np.broadcast_to(np.asarray(b, dtype=float), (N + 1,)).copy(),
+                A=np.broadcast_to(np.asarray(A, dtype=float), (N,)).copy())
+
+
+def forzamiento(n_masas, masas, A):
+    """Amplitudes por masa: A en los índices `masas` y cero en el resto."""
+    amplitudes = np.zeros(n_masas)
+    amplitudes[masas] = A
+    return amplitudes
+
+
+# -------------------------------------------------
+# OPERADORES TRIDIAGONALES
+# -------------------------------------------------
+
+def operador(coef):
+    """(diagonal, fuera) de la matriz tridiagonal de los N + 1 coeficientes."""
+    return coef[:-1] + coef[1:], -coef[1:-1]
+
+
+def aplicar(diagonal, fuera, x):
+    """Producto de la tridiagonal simétrica (diagonal, fuera) por x (..., N)."""
+    y = diagonal * x
+    y[..., :-1] += fuera * x[..., 1:]
+    y[..., 1:] += fuera * x[..., :-1]
+    return y
+
+
+class FactorizacionTridiagonal:
+    """
+    Factorización LDLᵀ de una tridiagonal simétrica definida positiva
+    (diagonal (N,), fuera (N-1,)). resolver() reutiliza la factorización.
+    """
+
+    def __init__(self, diagonal, fuera):
+        diagonal = np.asarray(diagonal, dtype=float)
+        fuera = np.asarray(fuera, dtype=float)
+        # dpttrf no acepta una sola masa (fuera vacío)
+        self.usa_lapack = lapack is not None and len(diagonal) > 1
+        if self.usa_lapack:
+            self.d, self.e, info = lapack.dpttrf(diagonal, fuera)
+            if info != 0:
+                raise ValueError("La matriz del paso implícito no es definida positiva")
+            return
+        d = diagonal.copy()
+        l = np.zeros_like(fuera)
+        for i in range(1, len(d)):
+            l[i - 1] = fuera[i - 1] / d[i - 1]
+            d[i] -= l[i - 1] * fuera[i - 1]
+        if np.any(d <= 0):
+            raise ValueError("La matriz del paso implícito no es definida positiva")
+        self.d, self.e = d, l
+
+    def resolver(self, rhs):
+        """Resuelve para cada fila de rhs (lote, N)."""
+        if self.usa_lapack:
+            x, info = lapack.dpttrs(self.d, self.e, np.ascontiguousarray(rhs.T))
+            return x.T
+        # Sustitución hacia adelante (L), diagonal (D) y hacia atrás (Lᵀ)
+        y = np.array(rhs, dtype=float).T
+        for i in range(1, len(self.d)):
+            y[i] -= self.e[i - 1] * y[i - 1]
+        y /= self.d[:, None]
+        for i in range(len(self.d) - 2, -1, -1):
+            y[i] -= self.e[i] * y[i + 1]
+        return y.T
+
+
+_factorizaciones = OrderedDict()
+
+
+def _factorizacion(m, k, b, dt, peso_K):
+    """Factorización memorizada de M + dt/2·B + peso_K·dt²·K."""
+    clave = (float(dt), float(peso_K)) + tuple(np.asarray(v, dtype=float).tobytes()
+                                               for v in (m, k, b))
+    if clave in _factorizaciones:
+        _factorizaciones.move_to_end(clave)
+        return _factorizaciones[clave]
+    diagonal_K, fuera_K = operador(k)
+    diagonal_B, fuera_B = operador(b)
+    factorizacion = FactorizacionTridiagonal(m + dt/2 * diagonal_B + peso_K * dt**2 * diagonal_K,
+                                             dt/2 * fuera_B + peso_K * dt**2 * fuera_K)
+    _factorizaciones[clave] = factorizacion
+    if len(_factorizaciones) > CAPACIDAD_FACTORIZACIONES:
+        _factorizaciones.popitem(last=False)
+    return factorizacion
+
+
+def factorizacion_implicita(m, k, b, dt):
+    """
+    Factorización de M + dt/2·B + dt²/4·K, memorizada por (m, k, b, dt):
+    en una ejecución se calcula una sola vez.
+    """
+    return _factorizacion(m, k, b, dt, 0.25)
+
+
+def factorizacion_amortiguada(m, b, dt):
+    """Factorización de M + dt/2·B (segundo medio impulso de Verlet), memorizada."""
+    return _factorizacion(m, np.zeros(len(m) + 1), b, dt, 0.0)
+
+
+# -------------------------------------------------
+# DINÁMICA
+# -------------------------------------------------
+
+def _dividir(estado):
+    n = estado.shape[-1] // 2
+    return estado[..., :n], estado[..., n:]
+
+
+def aceleracion(t, x, v, m, b, k, A, w):
+    """M⁻¹·(A·cos(ω·t) - B·v - K·x)"""
+    return (A * np.cos(w * t) - aplicar(*operador(b), v) - aplicar(*operador(k), x)) / m
+
+
+def derivadas(t, estado, m, b, k, A, w):
+    """Devuelve [x', v'] de toda la cadena (para los integradores adaptativos)."""
+    x, v = _dividir(estado)
+    return np.concatenate([v, aceleracion(t, x, v, m, b, k, A, w)], axis=-1)
+
+
+def paso_verlet(t, estado, dt, m, b, k, A, w):
+    """
+    Verlet de velocidades; O(N) por paso. Como en masa_resorte.paso_verlet,
+    el segundo medio impulso es implícito en la velocidad nueva:
+
+        (M + dt/2·B)·v₁ = M·v_medio + dt/2·(F(t+dt) - K·x₁)
+
+    con la factorización memorizada, lo que lo mantiene simétrico y de
+    segundo orden también con b > 0.
+    """
+    x, v = _dividir(estado)
+    v_medio = v + 0.5 * dt * aceleracion(t, x, v, m, b, k, A, w)
+    x = x + v_medio * dt
+    rhs = m * v_medio + 0.5 * dt * (A * np.cos(w * (t + dt)) - aplicar(*operador(k), x))
+    v = factorizacion_amortiguada(m, b, dt).resolver(np.atleast_2d(rhs)).reshape(rhs.shape)
+    return np.concatenate([x, v], axis=-1)
+
+
+def paso_trapecio(t, estado, dt, m, b, k, A, w):
+    """
+    Newmark de aceleración media: la aceleración nueva resuelve
+
+        (M + dt/2·B + dt²/4·K)·a₁ = F(t+dt) - B·(v + dt/2·a₀) - K·(x + dt·v + dt²/4·a₀)
+
+    con la factorización memorizada; sin amortiguamiento ni fuerza
+    conserva la energía para cualquier dt.
+    """
+    x, v = _dividir(estado)
+    a0 = aceleracion(t, x, v, m, b, k, A, w)
+    x_predicho = x + dt * v + dt**2/4 * a0
+    v_predicho = v + dt/2 * a0
+    rhs = A * np.cos(w * (t + dt)) - aplicar(*operador(b), v_predicho) - aplicar(*operador(k), x_predicho)
+    a1 = factorizacion_implicita(m, k, b, dt).resolver(np.atleast_2d(rhs)).reshape(rhs.shape)
+    return np.concatenate([x_predicho + dt**2/4 * a1, v_predicho + dt/2 * a1], axis=-1)
+
+
+# Integradores disponibles: nombre -> función de paso (misma firma)
+INTEGRADORES = {
+    "verlet": paso_verlet,
+    "trapecio": paso_trapecio,
+}
+
+
+def energia(estado, m, k):
+    """Energía cinética, potencial y total de cada configuración del lote."""
+    x, v = _dividir(np.asarray(estado, dtype=float))
+    E_cinetica = 0.5 * np.sum(m * v**2, axis=-1)
+    # Estiramiento de cada resorte, con las paredes en x = 0
+    ceros = np.zeros(x.shape[:-1] + (1,))
+    estiramiento = np.diff(np.concatenate([ceros, x, ceros], axis=-1), axis=-1)
+    E_potencial = 0.5 * np.sum(k * estiramiento**2, axis=-1)
+    return E_cinetica, E_potencial, E_cinetica + E_potencial
+
+
+def omega_maxima(m, k):
+    """
+    Cota de la mayor frecuencia propia por discos de Gershgorin de M⁻¹·K:
+    ω_max² ≤ max 2·(k[i] + k[i+1]) / m[i].
+    """
+    return float(np.sqrt(np.max(2 * (k[:-1] + k[1:]) / m)))
+
+
+def dt_estable(m, k, fraccion=FRACCION_ESTABLE):
+    """Paso de Verlet: `fraccion` del límite de estabilidad 2/ω_max."""
+    return fraccion * 2 / omega_maxima(m, k)
+
+
+def frecuencias_uniformes(n_masas, m, k):
+    """Frecuencias propias exactas de la cadena uniforme con las dos paredes."""
+    j = np.arange(1, n_masas + 1)
+    return 2 * np.sqrt(k / m) * np.sin(j * np.pi / (2 * (n_masas + 1)))
+
+
+def simular_cadena(estado0, dt, t_final, integrador="trapecio", guardar_cada=None, **parametros):
+    """
+    Integra una cadena sin guardar cada paso: guarda el estado cada
+    `guardar_cada` pasos (por defecto solo el inicial y el final).
+
+    Devuelve {t (M,), estados (M, 2N)}.
+    """
+    paso = INTEGRADORES[integrador]
+    estado = np.array(estado0, dtype=float).reshape(1, -1)
+    n_pasos = int(round(t_final / dt))
+    tiempos, estados = [0.0], [estado[0].copy()]
+    for n in range(1, n_pasos + 1):
+        estado = paso((n - 1) * dt, estado, dt, **parametros)
+        if (guardar_cada and n % guardar_cada == 0) or n == n_pasos:
+            tiempos.append(n * dt)
+            estados.append(estado[0].copy())
+    return {"t": np.array(tiempos), "estados": np.array(estados)}
+
+
+def orden_convergencia(integrador, estado0, dt, t_final, **parametros):
+    """
+    Orden observado de un integrador: con e(h) = |x_h - x_{h/2}|, el error
+    del estado final, log₂(e(dt) / e(dt/2)) tiende al orden del método.
+    dt se ajusta para que t_final sea un número entero de pasos.
+    """
+    dt = t_final / np.ceil(t_final / dt)
+    finales = [simular_cadena(estado0, dt / 2**j, t_final, integrador, **parametros)["estados"][-1]
+               for j in range(3)]
+    e_grueso = np.max(np.abs(finales[0] - finales[1]))
+    e_fino = np.max(np.abs(finales[1] - finales[2]))
+    return float(np.log2(e_grueso / e_fino))
+
+
+# -------------------------------------------------
+# FUNCIONES DE ANÁLISIS
+# -------------------------------------------------
+
+def analizar_cadena(m, b, k, A, w):
+    """Texto con el tamaño de la cadena, sus frecuencias y las masas forzadas."""
+    n_masas = len(m)
+    texto = (f"Cadena de {n_masas} masas y {n_masas + 1} resortes "
+             f"(masa total {np.sum(m):.3g} kg)\n"
+             f"ω_max ≤ {omega_maxima(m, k):.4f} rad/s (Gershgorin), "
+             f"Verlet estable con dt < {2 / omega_maxima(m, k):.4f} s\n")
+    if np.ptp(m) == 0 and np.ptp(k) == 0:
+        omegas = frecuencias_uniformes(n_masas, m[0], k[0])
+        texto += f"Modos propios: ω₁ = {omegas[0]:.5f} rad/s … ω_N = {omegas[-1]:.5f} rad/s\n"
+    forzadas = np.flatnonzero(A)
+    if len(forzadas):
+        lista = ", ".join(str(i) for i in forzadas[:5]) + (" …" if len(forzadas) > 5 else "")
+        texto += f"Fuerza A·cos({w:.2f}·t) sobre la(s) masa(s) {lista}\n"
+    return texto
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cadena de masas y resortes sin ventanas")
+    parser.add_argument("--masas", type=int, default=10_000)
+    parser.add_argument("--m", type=float, default=1.0, help="masa de cada elemento (kg)")
+    parser.add_argument("--k", type=float, default=4.0, help="constante de cada resorte (N/m)")
+    parser.add_argument("--b", type=float, default=0.0, help="amortiguamiento de cada elemento")
+    parser.add_argument("--A", type=float, default=1.0, help="amplitud de la fuerza")
+    parser.add_argument("--w", type=float, default=1.5, help="frecuencia de la fuerza (rad/s)")
+    parser.add_argument("--forzada", type=int, default=0, help="índice de la masa forzada")
+    parser.add_argument("--t-final", type=float, default=20.0)
+    parser.add_argument("--dt", type=float, default=None, help="por defecto, el de dt_estable")
+    parser.add_argument("--integrador", choices=list(INTEGRADORES), default="trapecio")
+    parser.add_argument("--orden", action="store_true",
+                        help="mide el orden de convergencia de cada integrador con dt, dt/2 y dt/4")
+    args = parser.parse_args(argv)
+
+    p = coeficientes_cadena(args.masas, args.m, args.k, args.b,
+                            forzamiento(args.masas, args.forzada, args.A))
+    dt = args.dt or dt_estable(p["m"], p["k"])
+    estado0 = np.zeros(2 * args.masas)
+
+    inicio = time.perf_counter()
+    r = simular_cadena(estado0, dt, args.t_final, args.integrador, w=args.w, **p)
+    duracion = time.perf_counter() - inicio
+    n_pasos = int(round(args.t_final / dt))
+
+    print(analizar_cadena(p["m"], p["b"], p["k"], p["A"], args.w), end="")
+    print(f"{args.integrador}: {n_pasos} pasos de {dt:.4g} s en {duracion:.2f} s "
+          f"({n_pasos * args.masas / duracion:.3g} masas·paso/s)")
+    print(f"Energía final: {float(energia(r['estados'][-1:], p['m'], p['k'])[2][0]):.6g} J")
+    if args.orden:
+        for nombre in INTEGRADORES:
+            orden = orden_convergencia(nombre, estado0, dt / REFINAMIENTO_ORDEN, args.t_final,
+                                       w=args.w, **p)
+            print(f"Orden observado de {nombre}: {orden:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+"""
+Núcleos escalares de una sola trayectoria, compilados con Numba si está.
+
+Con N = 1 el paso vectorizado de cada modelo gasta casi todo su tiempo en
+llamar ufuncs de NumPy sobre arreglos de un elemento. Aquí cada modelo tiene
+su bucle de Euler escrito con escalares y math.*, que Numba compila con
+njit la primera vez que se usa. Sin Numba (o con MOTOR_SIN_NUMBA=1) se
+ejecuta el mismo código en Python puro, que ya evita ese costo.
+
+Los bucles reproducen exactamente paso_euler de cada modelo (mismo orden de
+operaciones y t = n·dt) y se detienen con el mismo criterio que
+tanque_vacio() y tanque_lleno_o_vacio().
+
+Ejemplo:
+    from motor import compilado
+    r = compilado.trayectoria("masa_resorte", [1.0, 0.0], dt=0.001, t_final=100,
+                              m=1.0, b=0.3, k=4.0, A=1.0, w=1.5)
+    r["t"], r["estados"]
+"""
+import math
+import os
+
+import numpy as np
+
+from .mezcla import ALTURA_TANQUE
+from .torricelli import H_MINIMA
+
+# Variable de entorno que fuerza la versión en Python puro
+VARIABLE_SIN_NUMBA = "MOTOR_SIN_NUMBA"
+
+_numba = None
+_numba_buscado = False
+
+
+def _cargar_numba():
+    """Importa numba la primera vez que se necesita (o None si no se usa)."""
+    global _numba, _numba_buscado
+    if not _numba_buscado:
+        _numba_buscado = True
+        if not os.environ.get(VARIABLE_SIN_NUMBA):
+            try:
+                import numba
+                _numba = numba
+            except ImportError:
+                _numba = None
+    return _numba
+
+
+def numba_disponible():
+    """True si los núcleos se compilan con Numba."""
+    return _cargar_numba() is not None
+
+
+class _Nucleo:
+    """
+    Función que se compila con njit en su primera llamada.
+
+    El atributo python conserva la versión sin compilar, que da los mismos
+    resultados y sirve de respaldo.
+    """
+
+    def __init__(self, funcion):
+        self.python = funcion
+        self.__name__ = funcion.__name__
+        self.__doc__ = funcion.__doc__
+        self._funcion = None
+
+    def __call__(self, *argumentos):
+        if self._funcion is None:
+            numba = _cargar_numba()
+            self._funcion = numba.njit(cache=True)(self.python) if numba else self.python
+        return self._funcion(*argumentos)
+
+
+def compilar(funcion):
+    """Decorador: compila con Numba de forma diferida, o usa Python puro."""
+    return _Nucleo(funcion)
+
+
+# -------------------------------------------------
+# BUCLES DE CADA MODELO
+# -------------------------------------------------
+# Cada núcleo da hasta n_pasos pasos desde el paso n0 (t = n0·dt), escribe
+# los estados en salida y devuelve (pasos dados, si se detuvo).
+
+@compilar
+def _masa_resorte(x, v, n0, dt, n_pasos, m, b, k, A, w, salida):
+    for i in range(n_pasos):
+        t = (n0 + i) * dt
+        a = (A * math.cos(w * t) - b*v - k*x) / m
+        v = v + a * dt
+        x = x + v * dt
+        salida[i, 0] = x
+        salida[i, 1] = v
+    return n_pasos, False
+
+
+@compilar
+def _rlc(Q, I, n0, dt, n_pasos, R, L, C, V0, omega, salida):
+    for i in range(n_pasos):
+        t = (n0 + i) * dt
+        dI_dt = (V0 * math.cos(omega * t) - R*I - Q/C) / L
+        I = I + dI_dt * dt
+        Q = Q + I * dt
+        salida[i, 0] = Q
+        salida[i, 1] = I
+    return n_pasos, False
+
+
+@compilar
+def _torricelli(h, n0, dt, n_pasos, Cd, A_orificio, A_tanque, g, h_minima, salida):
+    for i in range(n_pasos):
+        if h > 0:
+            h = h - (Cd * A_orificio / A_tanque) * math.sqrt(2 * g * h) * dt
+        h = max(h, 0.0)
+        salida[i, 0] = h
+        if h <= h_minima:
+            return i + 1, True
+    return n_pasos, False
+
+
+@compilar
+def _mezcla(C, H, n0, dt, n_pasos, Qin, Qout, Cin, A, altura_tanque, salida):
+    dHdt = (Qin - Qout) / A
+    for i in range(n_pasos):
+        V = A * H
+        dCdt = Qin*(Cin - C) / V if V > 0 else 0.0
+        C = C + dCdt * dt
+        H = H + dHdt * dt
+        salida[i, 0] = C
+        salida[i, 1] = H
+        if H <= 0 or H >= altura_tanque:
+            return i + 1, True
+    return n_pasos, False
+
+
+# -------------------------------------------------
+# INTERFAZ
+# -------------------------------------------------
+
+def _escalar(valor):
+    """Parámetro escalar o de forma (1,) como float de Python."""
+    return float(np.asarray(valor).reshape(-1)[0])
+
+
+def _componentes(estado):
+    return [float(c) for c in np.asarray(estado, dtype=float).reshape(-1)]
+
+
+def avanzar_masa_resorte(n0, estado, dt, n_pasos, m, b, k, A, w):
+    """n_pasos de paso_euler desde el paso n0. Devuelve (estados, terminado)."""
+    salida = np.empty((n_pasos, 2))
+    x, v = _componentes(estado)
+    hechos, terminado = _masa_resorte(x, v, n0, dt, n_pasos, _escalar(m), _escalar(b),
+                                      _escalar(k), _escalar(A), _escalar(w), salida)
+    return salida[:hechos], terminado
+
+
+def avanzar_rlc(n0, estado, dt, n_pasos, R, L, C, V0, omega):
+    """n_pasos de paso_euler desde el paso n0. Devuelve (estados, terminado)."""
+    salida = np.empty((n_pasos, 2))
+    Q, I = _componentes(estado)
+    hechos, terminado = _rlc(Q, I, n0, dt, n_pasos, _escalar(R), _escalar(L), _escalar(C),
+                             _escalar(V0), _escalar(omega), salida)
+    return salida[:hechos], terminado
+
+
+def avanzar_torricelli(n0, estado, dt, n_pasos, Cd, A_orificio, A_tanque, g, h_minima=H_MINIMA):
+    """n_pasos de paso_euler, parando al vaciarse. Devuelve (estados, terminado)."""
+    salida = np.empty((n_pasos, 1))
+    h, = _componentes(estado)
+    hechos, terminado = _torricelli(h, n0, dt, n_pasos, _escalar(Cd), _escalar(A_orificio),
+                                    _escalar(A_tanque), _escalar(g), h_minima, salida)
+    return salida[:hechos], terminado
+
+
+def avanzar_mezcla(n0, estado, dt, n_pasos, Qin, Qout, Cin, A, altura_tanque=ALTURA_TANQUE):
+    """n_pasos de paso_euler, parando al llenarse o vaciarse. Devuelve (estados, terminado)."""
+    salida = np.empty((n_pasos, 2))
+    C, H = _componentes(estado)
+    hechos, terminado = _mezcla(C, H, n0, dt, n_pasos, _escalar(Qin), _escalar(Qout),
+                                _escalar(Cin), _escalar(A), altura_tanque, salida)
+    return salida[:hechos], terminado
+
+
+AVANZAR = {
+    "masa_resorte": avanzar_masa_resorte,
+    "rlc": avanzar_rlc,
+    "torricelli": avanzar_torricelli,
+    "mezcla": avanzar_mezcla,
+}
+
+
+def trayectoria(modelo, estado0, dt, t_final, **parametros):
+    """
+    Integra una sola configuración con el núcleo del modelo.
+
+    Devuelve un diccionario como motor.lote.simular_lote con N = 1:
+        t       tiempos, forma (M,)
+        estados estados, forma (M, dim_estado)
+        t_fin   instante en que se detuvo (t_final si no se detuvo)
+    """
+    try:
+        avanzar = AVANZAR[modelo]
+    except KeyError:
+        raise ValueError(f"Modelo desconocido: {modelo!r}") from None
+    estado0 = np.asarray(estado0, dtype=float).reshape(-1)
+    n_pasos = int(round(t_final / dt))
+    estados, terminado = avanzar(0, estado0, dt, n_pasos, **parametros)
+    hechos = len(estados)
+    return {
+        "t": np.arange(hechos + 1) * dt,
+        "estados": np.concatenate([estado0[None, :], estados]),
+        "t_fin": hechos * dt if terminado else float(t_final),
+    }
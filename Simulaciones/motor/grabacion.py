@@ -0,0 +1,241 @@
+"""
+Grabación de trayectorias en archivos mapeados en memoria y reproducción.
+
+Formato del archivo (.tray):
+
+    8 bytes   MAGIA
+    8 bytes   número de filas escritas (uint64, little-endian)
+    4 bytes   largo de la cabecera JSON (uint32, little-endian)
+    ...       cabecera JSON: modelo, columnas y parámetros, rellena con
+              espacios hasta que los datos queden alineados a 64 bytes
+    ...       filas float64 [t, estado...] en orden C
+
+Una Grabacion escribe las filas directamente en el mapa de memoria; cuando
+se llena, duplica el archivo y lo vuelve a mapear. El número de filas se
+actualiza en cada sincronización, así que una grabación interrumpida sigue
+pudiendo leerse hasta la última fila sincronizada.
+
+Ejemplo:
+    with Grabacion("masa.tray", "masa_resorte", ["t", "x", "v"], dict(m=1.0, k=4.0)) as g:
+        g.agregar(t, [x, v])
+    tray = abrir("masa.tray")
+    tray["x"], tray.parametros, tray.estado_en(3.5)
+"""
+import json
+import struct
+
+import numpy as np
+
+from .buffer import FPS
+
+MAGIA = b"EDOTRAY\x01"
+_CABECERA_FIJA = struct.Struct("<8sQI")
+_ALINEACION = 64
+# Filas reservadas al crear el archivo (se duplica al llenarse)
+CAPACIDAD_INICIAL = 4096
+
+
+def _a_json(valor):
+    """Convierte escalares y arreglos de NumPy en tipos de JSON."""
+    if hasattr(valor, "tolist"):
+        return valor.tolist()
+    raise TypeError(f"No se puede guardar {type(valor).__name__} en la cabecera")
+
+
+def _desplazamiento(largo_json):
+    return -(-(_CABECERA_FIJA.size + largo_json) // _ALINEACION) * _ALINEACION
+
+
+class Grabacion:
+    """
+    Escritor de una trayectoria.
+
+    archivo:    ruta del archivo (se sobrescribe)
+    modelo:     nombre del modelo ("masa_resorte", "rlc", ...)
+    columnas:   nombres de las columnas; la primera es el tiempo
+    parametros: diccionario con los parámetros de la simulación
+    """
+
+    def __init__(self, archivo, modelo, columnas, parametros=None, capacidad=CAPACIDAD_INICIAL):
+        self.archivo = archivo
+        self.columnas = list(columnas)
+        self.n_filas = 0
+        cabecera = json.dumps({"modelo": modelo, "columnas": self.columnas,
+                               "parametros": parametros or {}},
+                              default=_a_json, ensure_ascii=False).encode("utf-8")
+        self.desplazamiento = _desplazamiento(len(cabecera))
+        cabecera = cabecera.ljust(self.desplazamiento - _CABECERA_FIJA.size, b" ")
+
+        with open(archivo, "wb") as f:
+            f.write(_CABECERA_FIJA.pack(MAGIA, 0, len(cabecera)))
+            f.write(cabecera)
+        self._mapear(capacidad)
+
+    def __len__(self):
+        return self.n_filas
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *error):
+        self.cerrar()
+
+    def _mapear(self, capacidad):
+        tamano = self.desplazamiento + capacidad * len(self.columnas) * 8
+        with open(self.archivo, "r+b") as f:
+            f.truncate(tamano)
+        self.capacidad = capacidad
+        self.datos = np.memmap(self.archivo, dtype="<f8", mode="r+", offset=self.desplazamiento,
+                               shape=(capacidad, len(self.columnas)))
+
+    def _reservar(self, filas):
+        if self.n_filas + filas <= self.capacidad:
+            return
+        capacidad = self.capacidad
+        while capacidad < self.n_filas + filas:
+            capacidad *= 2
+        self.sincronizar()
+        del self.datos
+        self._mapear(capacidad)
+
+    def agregar(self, t, estado):
+        """Escribe una fila [t, estado...]."""
+        self._reservar(1)
+        fila = self.datos[self.n_filas]
+        fila[0] = t
+        fila[1:] = estado
+        self.n_filas += 1
+
+    def agregar_bloque(self, t, estados):
+        """Escribe varias filas: t de forma (M,) y estados de forma (M, dim)."""
+        t = np.asarray(t, dtype=float)
+        self._reservar(len(t))
+        bloque = self.datos[self.n_filas:self.n_filas + len(t)]
+        bloque[:, 0] = t
+        bloque[:, 1:] = np.asarray(estados, dtype=float).reshape(len(t), -1)
+        self.n_filas += len(t)
+
+    def sincronizar(self):
+        """Vuelca los datos al disco y actualiza el número de filas."""
+        self.datos.flush()
+        with open(self.archivo, "r+b") as f:
+            f.seek(len(MAGIA))
+            f.write(struct.pack("<Q", self.n_filas))
+
+    def cerrar(self):
+        """Sincroniza y recorta el archivo a las filas escritas."""
+        if self.datos is None:
+            return
+        self.sincronizar()
+        self.datos = None
+        with open(self.archivo, "r+b") as f:
+            f.truncate(self.desplazamiento + self.n_filas * len(self.columnas) * 8)
+
+
+class Trayectoria:
+    """
+    Trayectoria grabada: filas [t, estado...] con nombres de columna.
+
+    datos:      arreglo (n_filas, n_columnas); la columna 0 es el tiempo.
+                abrir() lo entrega como mapa de memoria de solo lectura.
+    modelo, columnas, parametros: los de la cabecera
+    """
+
+    def __init__(self, datos, columnas, modelo=None, parametros=None, archivo=None):
+        self.datos = datos
+        self.columnas = list(columnas)
+        self.modelo = modelo
+        self.parametros = parametros or {}
+        self.archivo = archivo
+
+    def __len__(self):
+        return len(self.datos)
+
+    def __getitem__(self, columna):
+        return self.datos[:, self.columnas.index(columna)]
+
+    @property
+    def t(self):
+        return self.datos[:, 0]
+
+    @property
+    def estados(self):
+        return self.datos[:, 1:]
+
+    def indice_en(self, t):
+        """Índice de la última fila con tiempo <= t."""
+        return max(int(np.searchsorted(self.t, t, side="right")) - 1, 0)
+
+    def estado_en(self, t):
+        """Estado interpolado linealmente en el instante t."""
+        i = self.indice_en(t)
+        if i + 1 >= len(self) or t <= self.t[i]:
+            return np.array(self.estados[i])
+        t0, t1 = self.t[i], self.t[i + 1]
+        fraccion = (t - t0) / (t1 - t0)
+        return self.estados[i] + fraccion * (self.estados[i + 1] - self.estados[i])
+
+
+def guardar(archivo, trayectoria):
+    """Escribe una trayectoria completa en un archivo nuevo."""
+    with Grabacion(archivo, trayectoria.modelo, trayectoria.columnas, trayectoria.parametros,
+                   capacidad=max(len(trayectoria), 1)) as grabacion:
+        grabacion.agregar_bloque(trayectoria.t, trayectoria.estados)
+
+
+def abrir(archivo):
+    """Abre una trayectoria grabada como mapa de memoria de solo lectura."""
+    with open(archivo, "rb") as f:
+        magia, n_filas, largo = _CABECERA_FIJA.unpack(f.read(_CABECERA_FIJA.size))
+        if magia != MAGIA:
+            raise ValueError(f"{archivo} no es una trayectoria grabada")
+        cabecera = json.loads(f.read(largo).decode("utf-8"))
+
+    forma = (n_filas, len(cabecera["columnas"]))
+    if n_filas == 0:
+        datos = np.empty(forma)
+    else:
+        datos = np.memmap(archivo, dtype="<f8", mode="r", offset=_desplazamiento(largo), shape=forma)
+    return Trayectoria(datos, cabecera["columnas"], cabecera["modelo"], cabecera["parametros"],
+                       archivo)
+
+
+class Reproductor:
+    """
+    Recorre una trayectoria grabada al ritmo de la pantalla, sin integrar.
+
+    velocidad: segundos simulados por segundo real
+    saltar(t) mueve la posición (por ejemplo desde un slider). El primer
+    fotograma y el siguiente a cada salto llevan salto = True, para que la
+    escena rehaga sus curvas hasta ese instante.
+    """
+
+    def __init__(self, trayectoria, velocidad=1.0, fps=FPS):
+        self.trayectoria = trayectoria
+        self.velocidad = velocidad
+        self.fps = fps
+        self.t_vista = float(trayectoria.t[0]) if len(trayectoria) else 0.0
+        self._salto = False
+
+    @property
+    def t_final(self):
+        return float(self.trayectoria.t[-1])
+
+    def saltar(self, t):
+        self.t_vista = min(max(float(t), float(self.trayectoria.t[0])), self.t_final)
+        self._salto = True
+
+    def fotogramas(self, rate):
+        """Generador de (t, estado, salto), uno por fotograma, hasta el final."""
+        if len(self.trayectoria) == 0:
+            return
+        primero = True
+        while True:
+            rate(self.fps)
+            salto, self._salto = self._salto, False
+            yield self.t_vista, self.trayectoria.estado_en(self.t_vista), salto or primero
+            primero = False
+            if self.t_vista >= self.t_final and not self._salto:
+                return
+            if not self._salto:
+                self.t_vista = min(self.t_vista + self.velocidad / self.fps, self.t_final)
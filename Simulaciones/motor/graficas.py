@@ -0,0 +1,111 @@
+"""
+Envío de gráficas por lotes y con número de puntos acotado.
+
+Cada gcurve.plot(t, valor) es un mensaje distinto al navegador. Una
+CurvaBufferizada acumula las muestras y las envía en bloque cada `lote`
+puntos; cuando la serie supera el presupuesto de puntos la reduce con
+Largest-Triangle-Three-Buckets (LTTB), que conserva picos y forma, y
+reemplaza los datos de la curva en un solo envío.
+
+No importa VPython: la curva se recibe ya creada.
+"""
+import numpy as np
+
+# Puntos máximos por curva
+PRESUPUESTO_PUNTOS = 1000
+# Muestras acumuladas antes de cada envío
+TAMANO_LOTE = 30
+
+
+def lttb(x, y, n_puntos):
+    """
+    Reduce la serie (x, y) a n_puntos con Largest-Triangle-Three-Buckets.
+
+    Conserva el primer y el último punto; de cada cubeta intermedia elige el
+    punto que forma el triángulo de mayor área con el punto elegido en la
+    cubeta anterior y el promedio de la siguiente.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if n_puntos >= n or n_puntos < 3:
+        return x.copy(), y.copy()
+
+    # Límites de las n_puntos - 2 cubetas interiores
+    bordes = np.linspace(1, n - 1, n_puntos - 1).astype(int)
+    elegidos = np.empty(n_puntos, dtype=int)
+    elegidos[0] = 0
+    elegidos[-1] = n - 1
+
+    a = 0
+    for i in range(n_puntos - 2):
+        inicio, fin = bordes[i], bordes[i + 1]
+        # Promedio de la cubeta siguiente (o el último punto)
+        if i + 2 < len(bordes):
+            sig_inicio, sig_fin = bordes[i + 1], bordes[i + 2]
+            x_medio = x[sig_inicio:sig_fin].mean()
+            y_medio = y[sig_inicio:sig_fin].mean()
+        else:
+            x_medio, y_medio = x[-1], y[-1]
+
+        areas = np.abs((x[a] - x_medio) * (y[inicio:fin] - y[a])
+                       - (x[a] - x[inicio:fin]) * (y_medio - y[a]))
+        a = inicio + int(np.argmax(areas))
+        elegidos[i + 1] = a
+
+    return x[elegidos], y[elegidos]
+
+
+class CurvaBufferizada:
+    """
+    Envoltorio de una gcurve que envía los puntos por lotes.
+
+    curva:       gcurve de VPython ya creada
+    presupuesto: puntos máximos que se mantienen en la curva
+    lote:        muestras acumuladas antes de cada envío
+    """
+
+    def __init__(self, curva, presupuesto=PRESUPUESTO_PUNTOS, lote=TAMANO_LOTE):
+        self.curva = curva
+        self.presupuesto = presupuesto
+        self.lote = lote
+        self.x = np.empty(0)
+        self.y = np.empty(0)
+        self._pendientes = []
+
+    def __len__(self):
+        return len(self.x) + len(self._pendientes)
+
+    def agregar(self, x, y):
+        """Acumula una muestra; envía cuando se completa el lote."""
+        self._pendientes.append((float(x), float(y)))
+        if len(self._pendientes) >= self.lote:
+            self.enviar()
+
+    def agregar_serie(self, x, y):
+        """Agrega una serie completa y la envía de inmediato."""
+        self._pendientes.extend(zip(np.asarray(x, dtype=float), np.asarray(y, dtype=float)))
+        self.enviar()
+
+    def reiniciar(self, x=(), y=()):
+        """Descarta la serie y deja en la curva solo (x, y), reducida con LTTB."""
+        self._pendientes = []
+        n_puntos = len(x) if len(x) <= self.presupuesto else max(self.presupuesto // 2, 3)
+        self.x, self.y = lttb(x, y, n_puntos)
+        self.curva.data = np.column_stack([self.x, self.y]).tolist()
+
+    def enviar(self):
+        """Envía las muestras pendientes en un solo mensaje."""
+        if not self._pendientes:
+            return
+        nuevos = np.array(self._pendientes)
+        self._pendientes = []
+        self.x = np.concatenate([self.x, nuevos[:, 0]])
+        self.y = np.concatenate([self.y, nuevos[:, 1]])
+
+        if len(self.x) > self.presupuesto:
+            # Se reduce a la mitad del presupuesto para no reducir en cada lote
+            self.x, self.y = lttb(self.x, self.y, max(self.presupuesto // 2, 3))
+            self.curva.data = np.column_stack([self.x, self.y]).tolist()
+        else:
+            self.curva.plot(nuevos.tolist())
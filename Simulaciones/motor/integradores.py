@@ -0,0 +1,210 @@
+"""
+Integradores de paso variable.
+
+dormand_prince: método de Runge-Kutta embebido 5(4) con control de error,
+salida densa (interpolación de Hermite) y eventos terminales.
+"""
+import numpy as np
+
+# Tabla de Butcher de Dormand-Prince 5(4)
+_C = np.array([0, 1/5, 3/10, 4/5, 8/9, 1, 1])
+_A = [
+    [],
+    [1/5],
+    [3/40, 9/40],
+    [44/45, -56/15, 32/9],
+    [19372/6561, -25360/2187, 64448/6561, -212/729],
+    [9017/3168, -355/33, 46732/5247, 49/176, -5103/18656],
+    [35/384, 0, 500/1113, 125/192, -2187/6784, 11/84],
+]
+# Pesos de orden 5 (coinciden con la última fila de _A: propiedad FSAL)
+_B = np.array([35/384, 0, 500/1113, 125/192, -2187/6784, 11/84, 0])
+# Diferencia entre los pesos de orden 5 y los de orden 4
+_E = np.array([71/57600, 0, -71/16695, 71/1920, -17253/339200, 22/525, -1/40])
+
+# Factores de seguridad del control de paso
+_SEGURIDAD = 0.9
+_FACTOR_MIN = 0.2
+_FACTOR_MAX = 10.0
+
+# Iteraciones máximas al localizar la raíz de un evento
+_MAX_ITERACIONES_EVENTO = 100
+
+
+class SolucionEDO:
+    """
+    Resultado de una integración de paso variable.
+
+    t:              instantes aceptados, forma (M,)
+    y:              estados en esos instantes, forma (M, dim)
+    t_evento:       instante del evento terminal (None si no ocurrió)
+    y_evento:       estado en el evento
+    n_pasos:        pasos aceptados
+    n_rechazados:   pasos rechazados por el control de error
+    n_evaluaciones: evaluaciones de la función derivada
+
+    Llamar a la solución con un arreglo de tiempos interpola el estado con
+    polinomios de Hermite cúbicos entre pasos aceptados.
+    """
+
+    def __init__(self, t, y, dy, t_evento, y_evento, n_pasos, n_rechazados, n_evaluaciones):
+        self.t = t
+        self.y = y
+        self.dy = dy
+        self.t_evento = t_evento
+        self.y_evento = y_evento
+        self.n_pasos = n_pasos
+        self.n_rechazados = n_rechazados
+        self.n_evaluaciones = n_evaluaciones
+
+    def __call__(self, t):
+        t = np.asarray(t, dtype=float)
+        tt = np.clip(t, self.t[0], self.t[-1])
+        i = np.clip(np.searchsorted(self.t, tt, side="right") - 1, 0, len(self.t) - 2)
+        h = self.t[i + 1] - self.t[i]
+        s = ((tt - self.t[i]) / h)[..., None]
+        h = h[..., None]
+        y0, y1 = self.y[i], self.y[i + 1]
+        f0, f1 = self.dy[i], self.dy[i + 1]
+        return _hermite(s, h, y0, y1, f0, f1)
+
+
+def _hermite(s, h, y0, y1, f0, f1):
+    """Interpolación de Hermite cúbica en s ∈ [0, 1] dentro de un paso h."""
+    h00 = 2*s**3 - 3*s**2 + 1
+    h10 = s**3 - 2*s**2 + s
+    h01 = -2*s**3 + 3*s**2
+    h11 = s**3 - s**2
+    return h00*y0 + h10*h*f0 + h01*y1 + h11*h*f1
+
+
+def _raiz_evento(evento, t0, h, y0, y1, f0, f1, tol):
+    """Localiza la raíz de un evento dentro del paso [t0, t0+h] (método de Illinois)."""
+    a, b = 0.0, 1.0
+    ga = evento(t0, y0)
+    gb = evento(t0 + h, y1)
+    lado = 0
+    for _ in range(_MAX_ITERACIONES_EVENTO):
+        if (b - a) * h <= tol:
+            break
+        s = b - gb * (b - a) / (gb - ga)
+        if not a < s < b:
+            s = 0.5 * (a + b)
+        gs = evento(t0 + s*h, _hermite(s, h, y0, y1, f0, f1))
+        if gs == 0:
+            a = b = s
+            break
+        if np.sign(gs) == np.sign(gb):
+            b, gb = s, gs
+            if lado == 1:
+                ga *= 0.5
+            lado = 1
+        else:
+            a, ga = s, gs
+            if lado == -1:
+                gb *= 0.5
+            lado = -1
+    s = b
+    return t0 + s*h, _hermite(s, h, y0, y1, f0, f1)
+
+
+def _cruza(evento, g_anterior, g_nuevo):
+    """Indica si un evento cambió de signo en la dirección pedida."""
+    direccion = getattr(evento, "direccion", 0)
+    if g_anterior == 0 or np.sign(g_anterior) == np.sign(g_nuevo):
+        return g_nuevo == 0 and g_anterior != 0
+    if direccion > 0:
+        return g_nuevo > g_anterior
+    if direccion < 0:
+        return g_nuevo < g_anterior
+    return True
+
+
+def dormand_prince(f, t0, y0, t_final, rtol=1e-6, atol=1e-9, h0=None,
+                   eventos=(), max_pasos=100000):
+    """
+    Integra y' = f(t, y) con Dormand-Prince 5(4) y control de error.
+
+    f:        función f(t, y) -> arreglo con la forma de y
+    y0:       estado inicial (escalar o vector)
+    rtol/atol: tolerancias relativa y absoluta por componente
+    h0:       paso inicial (si es None se estima automáticamente)
+    eventos:  funciones g(t, y); la integración se detiene en la primera raíz
+              de cualquiera de ellas. Un atributo opcional `direccion`
+              (+1 / -1) restringe el sentido del cruce.
+
+    Devuelve una SolucionEDO.
+    """
+    t = float(t0)
+    y = np.atleast_1d(np.asarray(y0, dtype=float)).copy()
+    k0 = np.asarray(f(t, y), dtype=float)
+    n_evaluaciones = 1
+
+    if h0 is None:
+        escala = atol + rtol * np.abs(y)
+        d0 = np.sqrt(np.mean((y / escala)**2))
+        d1 = np.sqrt(np.mean((k0 / escala)**2))
+        h = 0.01 * d0 / d1 if d0 > 1e-5 and d1 > 1e-5 else 1e-6
+        h = min(h, abs(t_final - t))
+    else:
+        h = float(h0)
+
+    tiempos = [t]
+    estados = [y.copy()]
+    derivadas = [k0.copy()]
+    g_eventos = [evento(t, y) for evento in eventos]
+    t_evento = None
+    y_evento = None
+    n_pasos = 0
+    n_rechazados = 0
+
+    while t < t_final and n_pasos < max_pasos:
+        h = min(h, t_final - t)
+        k = [k0]
+        for i in range(1, 7):
+            yi = y + h * sum(a * kj for a, kj in zip(_A[i], k) if a != 0)
+            k.append(np.asarray(f(t + _C[i]*h, yi), dtype=float))
+        n_evaluaciones += 6
+        y_nuevo = y + h * sum(b * kj for b, kj in zip(_B, k) if b != 0)
+        error = h * sum(e * kj for e, kj in zip(_E, k) if e != 0)
+
+        escala = atol + rtol * np.maximum(np.abs(y), np.abs(y_nuevo))
+        norma = np.sqrt(np.mean((error / escala)**2))
+
+        if norma > 1:
+            h *= max(_FACTOR_MIN, _SEGURIDAD * norma**(-1/5))
+            n_rechazados += 1
+            continue
+
+        k_nuevo = k[6]
+        t_nuevo = t + h
+
+        # Eventos terminales
+        for j, evento in enumerate(eventos):
+            g_nuevo = evento(t_nuevo, y_nuevo)
+            if _cruza(evento, g_eventos[j], g_nuevo):
+                te, ye = _raiz_evento(evento, t, h, y, y_nuevo, k0, k_nuevo,
+                                      tol=1e-12 * max(1.0, abs(t_nuevo)))
+                if t_evento is None or te < t_evento:
+                    t_evento, y_evento = te, ye
+            g_eventos[j] = g_nuevo
+
+        n_pasos += 1
+        if t_evento is not None:
+            k_evento = np.asarray(f(t_evento, y_evento), dtype=float)
+            n_evaluaciones += 1
+            tiempos.append(t_evento)
+            estados.append(y_evento.copy())
+            derivadas.append(k_evento)
+            break
+
+        t, y, k0 = t_nuevo, y_nuevo, k_nuevo
+        tiempos.append(t)
+        estados.append(y.copy())
+        derivadas.append(k0.copy())
+
+        factor = _FACTOR_MAX if norma == 0 else _SEGURIDAD * norma**(-1/5)
+        h *= min(_FACTOR_MAX, max(_FACTOR_MIN, factor))
+
+    return SolucionEDO(np.array(tiempos), np.array(estados), np.array(derivadas),
+                       t_evento, y_evento, n_pasos, n_rechazados, n_evaluaciones)
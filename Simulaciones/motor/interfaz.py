@@ -0,0 +1,93 @@
+"""
+Carga diferida de VPython.
+
+Ningún módulo del motor importa VPython, y las simulaciones solo lo cargan
+al crear su interfaz: importar un script o un modelo no abre ventanas ni
+arranca el servidor web, así que los trabajos por lotes pueden reutilizar
+los modelos y las funciones de análisis.
+
+PoolObjetos guarda los objetos ya creados (recibe la función que los crea,
+así que tampoco importa VPython) para reutilizarlos en la ejecución siguiente.
+GestorEscena reúne los objetos y pools de un modelo: cada uno se crea una
+sola vez por sesión y las ejecuciones siguientes solo lo reconfiguran, así
+que la escena del navegador no crece con el número de ejecuciones.
+"""
+import importlib
+
+
+def cargar_vpython():
+    """Importa vpython (solo la primera vez) y devuelve el módulo."""
+    try:
+        return importlib.import_module("vpython")
+    except ImportError as error:
+        raise ImportError("Las simulaciones necesitan VPython: pip install vpython") from error
+
+
+class PoolObjetos:
+    """
+    Objetos de VPython que se reutilizan entre ejecuciones.
+
+    crear: función sin argumentos que crea un objeto nuevo
+    tomar(n) devuelve n objetos visibles; solo crea los que faltan y oculta
+    los sobrantes, así que repetir una simulación no acumula objetos ocultos.
+    """
+
+    def __init__(self, crear):
+        self.crear = crear
+        self.objetos = []
+
+    def tomar(self, n):
+        while len(self.objetos) < n:
+            self.objetos.append(self.crear())
+        for i, objeto in enumerate(self.objetos):
+            objeto.visible = i < n
+        return self.objetos[:n]
+
+    def ocultar(self):
+        self.tomar(0)
+
+
+class GestorEscena:
+    """
+    Geometría de un modelo, creada una sola vez y reutilizada entre ejecuciones.
+
+    objeto(nombre, crear, **atributos) llama a crear(**atributos) la primera
+    vez (crear es vp.cylinder, vp.label...); las siguientes devuelve el mismo
+    objeto con los atributos nuevos, visible y con la estela borrada.
+    pool(nombre, crear) da un PoolObjetos para los conjuntos de tamaño variable.
+    ocultar() oculta todo lo que gestiona sin destruir nada.
+    """
+
+    def __init__(self):
+        self.objetos = {}
+        self.pools = {}
+
+    def objeto(self, nombre, crear, **atributos):
+        objeto = self.objetos.get(nombre)
+        if objeto is None:
+            objeto = self.objetos[nombre] = crear(**atributos)
+            return objeto
+        # Sin estela mientras se reubica, para no dibujar el salto
+        estela = atributos.pop("make_trail", getattr(objeto, "make_trail", False))
+        if estela:
+            objeto.make_trail = False
+        for atributo, valor in atributos.items():
+            setattr(objeto, atributo, valor)
+        if estela:
+            objeto.clear_trail()
+            objeto.make_trail = True
+        objeto.visible = True
+        return objeto
+
+    def pool(self, nombre, crear):
+        if nombre not in self.pools:
+            self.pools[nombre] = PoolObjetos(crear)
+        return self.pools[nombre]
+
+    def ocultar(self):
+        for objeto in self.objetos.values():
+            objeto.visible = False
+            if getattr(objeto, "make_trail", False):
+                objeto.clear_trail()
+        for pool in self.pools.values():
+            pool.ocultar()
@@ -0,0 +1,486 @@
+"""
+Ecuación lineal de segundo orden con forzamiento sinusoidal.
+
+    a·y'' + b·y' + c·y = F·cos(ω·t)
+
+Es la forma común del circuito RLC (a = L, b = R, c = 1/C, F = V₀) y del
+sistema masa-resorte (a = m, b = b, c = k, F = A).
+
+Además de la solución cerrada incluye la respuesta en frecuencia y un
+propagador exacto de paso fijo (exponencial de matriz).
+"""
+from collections import OrderedDict
+from math import factorial
+
+import numpy as np
+
+# Tolerancia relativa para considerar nulo el discriminante (raíz doble)
+TOLERANCIA_CRITICO = 1e-10
+# Tolerancia relativa para considerar nula la impedancia (resonancia)
+TOLERANCIA_RESONANCIA = 1e-12
+# Grado de la aproximación de Padé de expm y norma máxima tras el escalado
+GRADO_PADE = 6
+NORMA_PADE = 0.5
+# Propagadores que se conservan (uno por combinación de parámetros y dt)
+CAPACIDAD_PROPAGADORES = 16
+# Error relativo admitido al elegir integrador y muestras por la escala de
+# tiempo más rápida (1/|λ|máx) al muestrear la solución
+TOLERANCIA_INTEGRADOR = 1e-3
+MUESTRAS_POR_ESCALA = 4
+# Pasos de un integrador explícito admitidos por fotograma (dt_maximo); si
+# necesita más se usa el propagador exacto
+PASOS_MAXIMOS_POR_FOTOGRAMA = 200
+
+
+def clasificar(a, b, c):
+    """
+    Clasifica la ecuación característica a·r² + b·r + c = 0.
+
+    Devuelve (tipo, r1, r2) con tipo "sobreamortiguado", "critico" o
+    "subamortiguado". En el caso subamortiguado r1 y r2 son complejos
+    conjugados; en el crítico r1 = r2.
+    """
+    discriminante = b**2 - 4*a*c
+    if abs(discriminante) <= TOLERANCIA_CRITICO * max(b**2, abs(4*a*c)):
+        r = -b / (2*a)
+        return "critico", r, r
+    if discriminante > 0:
+        raiz = np.sqrt(discriminante)
+        return "sobreamortiguado", (-b + raiz) / (2*a), (-b - raiz) / (2*a)
+    raiz = np.sqrt(-discriminante)
+    return "subamortiguado", complex(-b / (2*a), raiz / (2*a)), complex(-b / (2*a), -raiz / (2*a))
+
+
+def respuesta_particular(t, a, b, c, F, omega):
+    """
+    Solución particular de estado estacionario y su derivada.
+
+    Fuera de resonancia: y_p = Re[F/Z · e^(iωt)] con Z = (c - a·ω²) + i·b·ω.
+    En resonancia (b = 0, c = a·ω²): y_p = F/(2aω) · t·sin(ωt).
+    """
+    t = np.asarray(t, dtype=float)
+    Z = complex(c - a*omega**2, b*omega)
+    if abs(Z) > TOLERANCIA_RESONANCIA * (abs(c) + abs(a)*omega**2 + abs(b)*omega):
+        fasor = (F / Z) * np.exp(1j * omega * t)
+        return fasor.real, (1j * omega * fasor).real
+    if omega == 0:
+        # a·y'' = F con c = 0: crecimiento cuadrático
+        return F * t**2 / (2*a), F * t / a
+    amplitud = F / (2*a*omega)
+    y = amplitud * t * np.sin(omega*t)
+    dy = amplitud * (np.sin(omega*t) + omega * t * np.cos(omega*t))
+    return y, dy
+
+
+def solucion(t, a, b, c, y0, v0, F=0.0, omega=0.0, t0=0.0):
+    """
+    Evalúa la solución completa y(t), y'(t) sobre un arreglo de tiempos.
+
+    y0, v0 son las condiciones iniciales en t = t0. La solución es la
+    homogénea (según el tipo de raíces) más la particular de F·cos(ω·t),
+    evaluadas en una sola operación vectorizada.
+    """
+    t = np.asarray(t, dtype=float)
+    tau = t - t0
+
+    yp, dyp = respuesta_particular(t, a, b, c, F, omega)
+    yp0, dyp0 = respuesta_particular(t0, a, b, c, F, omega)
+    # Condiciones iniciales de la parte homogénea
+    yh0 = y0 - yp0
+    vh0 = v0 - dyp0
+
+    tipo, r1, r2 = clasificar(a, b, c)
+    if tipo == "sobreamortiguado":
+        c1 = (vh0 - r2*yh0) / (r1 - r2)
+        c2 = yh0 - c1
+        e1 = np.exp(r1*tau)
+        e2 = np.exp(r2*tau)
+        yh = c1*e1 + c2*e2
+        dyh = c1*r1*e1 + c2*r2*e2
+    elif tipo == "critico":
+        r = r1
+        c1 = yh0
+        c2 = vh0 - r*yh0
+        e = np.exp(r*tau)
+        yh = (c1 + c2*tau) * e
+        dyh = (c2 + r*(c1 + c2*tau)) * e
+    else:
+        alpha, beta = r1.real, r1.imag
+        c1 = yh0
+        c2 = (vh0 - alpha*yh0) / beta
+        e = np.exp(alpha*tau)
+        cos = np.cos(beta*tau)
+        sin = np.sin(beta*tau)
+        yh = e * (c1*cos + c2*sin)
+        dyh = e * ((alpha*c1 + beta*c2)*cos + (alpha*c2 - beta*c1)*sin)
+
+    return yh + yp, dyh + dyp
+
+
+# -------------------------------------------------
+# RESPUESTA EN FRECUENCIA
+# -------------------------------------------------
+
+def frecuencia_natural(a, c):
+    """ω₀ = √(c/a)"""
+    return np.sqrt(c / a)
+
+
+def factor_amortiguamiento(a, b, c):
+    """ζ = b / (2·√(a·c))"""
+    return b / (2 * np.sqrt(a * c))
+
+
+def respuesta_frecuencia(omega, a, b, c, F=1.0):
+    """
+    Amplitud y fase del estado estacionario sobre un arreglo de frecuencias.
+
+    Con y_p = Re[F/Z · e^(iωt)] y Z(ω) = (c - a·ω²) + i·b·ω:
+        amplitud = |F| / |Z(ω)|,   fase = -arg Z(ω)  (de 0 a -π)
+    Es una sola evaluación vectorizada de la función de transferencia; los
+    parámetros también aceptan arreglos compatibles por broadcasting. Sin
+    amortiguamiento la amplitud en ω₀ es infinita.
+    """
+    omega = np.asarray(omega, dtype=float)
+    Z = (c - a * omega**2) + 1j * (b * omega)
+    with np.errstate(divide="ignore"):
+        amplitud = np.abs(F) / np.abs(Z)
+    return amplitud, 0.0 - np.angle(Z)
+
+
+def resonancia(a, b, c, F=1.0):
+    """
+    Pico de resonancia, ancho de banda y factor de calidad de y_p.
+
+    Devuelve un diccionario con:
+        omega0          frecuencia natural √(c/a)
+        zeta            factor de amortiguamiento b/(2√(ac))
+        omega_pico      ω de amplitud máxima, ω₀·√(1 - 2ζ²) (0 si ζ ≥ 1/√2)
+        amplitud_pico   amplitud en omega_pico
+        omega_inferior, omega_superior
+                        extremos de la banda de media potencia, donde la
+                        amplitud es al menos amplitud_pico/√2 (el inferior
+                        es 0 si la banda llega a ω = 0)
+        ancho_banda     omega_superior - omega_inferior
+        Q               factor de calidad 1/(2ζ)
+
+    Los extremos salen de |Z(ω)|² = 2·|Z(ω_pico)|², una cuadrática en ω².
+    """
+    omega0 = float(frecuencia_natural(a, c))
+    zeta = float(factor_amortiguamiento(a, b, c))
+    omega_pico = omega0 * np.sqrt(1 - 2*zeta**2) if zeta < 1 / np.sqrt(2) else 0.0
+    amplitud_pico = float(respuesta_frecuencia(omega_pico, a, b, c, F)[0]) if b > 0 else float("inf")
+
+    # a²·u² + (b² - 2ac)·u + c² - 2·|Z_pico|² = 0 con u = ω²
+    Z2_pico = (c - a * omega_pico**2)**2 + (b * omega_pico)**2
+    lineal_u = b**2 - 2*a*c
+    raiz = np.sqrt(max(lineal_u**2 - 4 * a**2 * (c**2 - 2*Z2_pico), 0.0))
+    omega_superior = float(np.sqrt(max((-lineal_u + raiz) / (2 * a**2), 0.0)))
+    omega_inferior = float(np.sqrt(max((-lineal_u - raiz) / (2 * a**2), 0.0)))
+
+    return {
+        "omega0": omega0,
+        "zeta": zeta,
+        "omega_pico": float(omega_pico),
+        "amplitud_pico": amplitud_pico,
+        "omega_inferior": omega_inferior,
+        "omega_superior": omega_superior,
+        "ancho_banda": omega_superior - omega_inferior,
+        "Q": 1 / (2 * zeta) if zeta > 0 else float("inf"),
+    }
+
+
+# -------------------------------------------------
+# PROPAGADOR EXACTO
+# -------------------------------------------------
+
+_COEFICIENTES_PADE = [factorial(2*GRADO_PADE - j) * factorial(GRADO_PADE)
+                      / (factorial(2*GRADO_PADE) * factorial(j) * factorial(GRADO_PADE - j))
+                      for j in range(GRADO_PADE + 1)]
+
+
+def expm(M):
+    """
+    Exponencial de matriz por Padé con escalado y elevación al cuadrado
+    (Golub y Van Loan, algoritmo 11.3.1).
+
+    M tiene forma (n, n) o (..., n, n); en un lote todas las matrices se
+    escalan con la mayor norma.
+    """
+    M = np.asarray(M, dtype=float)
+    norma = np.abs(M).sum(axis=-2).max() if M.size else 0.0
+    s = max(0, int(np.ceil(np.log2(norma / NORMA_PADE)))) if norma > 0 else 0
+    X = M / 2**s
+
+    identidad = np.broadcast_to(np.eye(M.shape[-1]), M.shape)
+    numerador = identidad.copy()
+    denominador = identidad.copy()
+    potencia = identidad
+    for j, coeficiente in enumerate(_COEFICIENTES_PADE[1:], start=1):
+        potencia = potencia @ X
+        numerador = numerador + coeficiente * potencia
+        denominador = denominador + (-1)**j * coeficiente * potencia
+
+    E = np.linalg.solve(denominador, numerador)
+    for _ in range(s):
+        E = E @ E
+    return E
+
+
+def generador(a, b, c, F, omega):
+    """
+    Matriz del sistema aumentado z = [y, y', cos(ω·t), sin(ω·t)]:
+
+        z' = [[0,     1,    0,  0],
+              [-c/a, -b/a,  F/a, 0],
+              [0,     0,    0, -ω],
+              [0,     0,    ω,  0]] · z
+
+    Las dos últimas filas generan el forzamiento, así que exp(M·dt) incluye
+    la respuesta a la entrada. Con parámetros (N,) devuelve (N, 4, 4).
+    """
+    a, b, c, F, omega = np.broadcast_arrays(*(np.asarray(v, dtype=float)
+                                              for v in (a, b, c, F, omega)))
+    M = np.zeros(a.shape + (4, 4))
+    M[..., 0, 1] = 1.0
+    M[..., 1, 0] = -c / a
+    M[..., 1, 1] = -b / a
+    M[..., 1, 2] = F / a
+    M[..., 2, 3] = -omega
+    M[..., 3, 2] = omega
+    return M
+
+
+class Propagador:
+    """
+    Paso exacto de tamaño dt para a·y'' + b·y' + c·y = F·cos(ω·t).
+
+    Φ = exp(M·dt) se calcula una sola vez; cada paso es
+
+        [y, y'](t + dt) = Φ_estado · [y, y'](t) + Φ_entrada · [cos ωt, sin ωt]
+
+    sin error de discretización para cualquier dt, y estable aunque las
+    raíces características sean muy grandes (sistemas rígidos). Los
+    parámetros son escalares o arreglos (N,) para un lote.
+    """
+
+    def __init__(self, a, b, c, F, omega, dt):
+        self.dt = dt
+        self.omega = np.asarray(omega, dtype=float)
+        Phi = expm(generador(a, b, c, F, omega) * np.asarray(dt, dtype=float)[..., None, None])
+        self.matriz_estado = Phi[..., :2, :2]
+        self.matriz_entrada = Phi[..., :2, 2:]
+
+    def avanzar(self, t, estado):
+        """Estado (N, 2) en t -> estado en t + dt."""
+        entrada = np.stack(np.broadcast_arrays(np.cos(self.omega * t), np.sin(self.omega * t)),
+                           axis=-1)
+        return ((self.matriz_estado @ estado[..., None])[..., 0]
+                + (self.matriz_entrada @ entrada[..., None])[..., 0])
+
+
+_propagadores = OrderedDict()
+
+
+def propagador(a, b, c, F, omega, dt):
+    """Propagador de esos parámetros y ese dt, reutilizado entre llamadas."""
+    valores = [np.asarray(v, dtype=float) for v in (a, b, c, F, omega, dt)]
+    clave = tuple((v.shape, v.tobytes()) for v in valores)
+    if clave in _propagadores:
+        _propagadores.move_to_end(clave)
+        return _propagadores[clave]
+
+    nuevo = _propagadores[clave] = Propagador(*valores)
+    while len(_propagadores) > CAPACIDAD_PROPAGADORES:
+        _propagadores.popitem(last=False)
+    return nuevo
+
+
+# -------------------------------------------------
+# SELECCIÓN DEL INTEGRADOR
+# -------------------------------------------------
+
+# Integradores explícitos candidatos: (orden, costo de un paso relativo al de
+# Euler, medido con un paso de motor.masa_resorte en NumPy). El propagador
+# exacto cuesta COSTO_EXACTO por paso y da un solo paso por fotograma.
+EXPLICITOS = {
+    "euler": (1, 1.0),
+    "verlet": (2, 1.5),
+    "yoshida4": (4, 4.5),
+    "rk4": (4, 4.0),
+}
+COSTO_EXACTO = 2.0
+NOMBRES_INTEGRADORES = {
+    "euler": "Euler semi-implícito",
+    "verlet": "Verlet de velocidades",
+    "yoshida4": "Yoshida de 4º orden",
+    "rk4": "Runge-Kutta 4",
+    "exacto": "Propagador exacto",
+}
+
+# Pesos de la composición de Yoshida: w₁, w₀, w₁ con 2·w₁ + w₀ = 1
+_RAIZ_CUBICA_2 = 2 ** (1 / 3)
+PESOS_YOSHIDA = (1 / (2 - _RAIZ_CUBICA_2), -_RAIZ_CUBICA_2 / (2 - _RAIZ_CUBICA_2),
+                 1 / (2 - _RAIZ_CUBICA_2))
+# Malla de |λ|máx·dt donde se busca el primer paso inestable, y tolerancia
+# sobre el radio espectral (los simplécticos sin amortiguamiento dan 1)
+MALLA_ESTABILIDAD = np.geomspace(1e-4, 8.0, 400)
+TOLERANCIA_ESTABILIDAD = 1e-9
+
+
+def _impulso(h, alfa, beta):
+    """v += h·(-α·x - β·v) con la velocidad vieja."""
+    uno, cero = np.ones_like(h), np.zeros_like(h)
+    return np.stack([np.stack([uno, cero], -1), np.stack([-h * alfa, 1 - h * beta], -1)], -2)
+
+
+def _deriva(h):
+    """x += h·v"""
+    uno, cero = np.ones_like(h), np.zeros_like(h)
+    return np.stack([np.stack([uno, h], -1), np.stack([cero, uno], -1)], -2)
+
+
+def _verlet(h, alfa, beta):
+    """Medio impulso, deriva y medio impulso implícito en el amortiguamiento."""
+    uno, cero = np.ones_like(h), np.zeros_like(h)
+    escala = 1 / (1 + h / 2 * beta)
+    impulso_final = np.stack([np.stack([uno, cero], -1),
+                              np.stack([-h / 2 * alfa * escala, escala], -1)], -2)
+    return impulso_final @ _deriva(h) @ _impulso(h / 2, alfa, beta)
+
+
+def matriz_amplificacion(integrador, a, b, c, dt):
+    """
+    Matriz G con [y, y']ₙ₊₁ = G·[y, y']ₙ de la parte homogénea para un paso
+    de cada integrador explícito, con las mismas etapas que los pasos de
+    motor.masa_resorte. dt y los coeficientes pueden ser arreglos
+    compatibles por broadcasting; G tiene su forma más (2, 2).
+    """
+    h, alfa, beta = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (dt, c / a, b / a)))
+    if integrador == "euler":
+        return _deriva(h) @ _impulso(h, alfa, beta)
+    if integrador == "verlet":
+        return _verlet(h, alfa, beta)
+    if integrador == "yoshida4":
+        G = np.broadcast_to(np.eye(2), h.shape + (2, 2))
+        for peso in PESOS_YOSHIDA:
+            G = _verlet(peso * h, alfa, beta) @ G
+        return G
+    if integrador == "rk4":
+        hJ = h[..., None, None] * np.stack([np.stack([np.zeros_like(h), np.ones_like(h)], -1),
+                                            np.stack([-alfa, -beta], -1)], -2)
+        G = termino = np.broadcast_to(np.eye(2), h.shape + (2, 2))
+        for j in range(1, 5):
+            termino = termino @ hJ / j
+            G = G + termino
+        return G
+    raise ValueError(f"Integrador sin matriz de amplificación: {integrador!r}")
+
+
+def dt_estable(integrador, a, b, c):
+    """
+    Mayor dt con radio espectral de la matriz de amplificación ≤ 1 para
+    todos los pasos menores. No es 2/|λ|máx salvo con raíces reales: con
+    raíces complejas depende de la región de estabilidad de cada método
+    (para Euler explícito sería 2·Re(-λ)/|λ|²). Infinito si c = b = 0.
+    """
+    rapido = max(abs(r) for r in clasificar(a, b, c)[1:])
+    if rapido == 0:
+        return np.inf
+
+    def inestable(dt):
+        radio = np.max(np.abs(np.linalg.eigvals(matriz_amplificacion(integrador, a, b, c, dt))), axis=-1)
+        return radio > 1 + TOLERANCIA_ESTABILIDAD
+
+    malla = MALLA_ESTABILIDAD / rapido
+    fuera = np.flatnonzero(inestable(malla))
+    if len(fuera) == 0:
+        return np.inf
+    if fuera[0] == 0:
+        return 0.0
+    # Bisección entre el último paso estable y el primero inestable
+    bajo, alto = malla[fuera[0] - 1], malla[fuera[0]]
+    for _ in range(40):
+        medio = 0.5 * (bajo + alto)
+        bajo, alto = (bajo, medio) if inestable(np.array(medio)) else (medio, alto)
+    return float(bajo)
+
+
+def elegir_integrador(a, b, c, omega, t_final, dt_maximo, tolerancia=TOLERANCIA_INTEGRADOR,
+                      pasos_maximos=PASOS_MAXIMOS_POR_FOTOGRAMA, candidatos=tuple(EXPLICITOS)):
+    """
+    Integrador y dt a partir de las raíces de a·r² + b·r + c = 0.
+
+    Cada explícito candidato de orden p es estable con dt < dt_estable (de
+    su matriz de amplificación) y su error global relativo hasta t_final se
+    estima como (ρ·dt)^p · ρ·t_final / (p+1)!, con ρ la escala más rápida
+    entre |λ|máx y la frecuencia del forzamiento, de donde sale dt_preciso.
+    Su dt es dt_maximo (un fotograma) dividido en el menor número entero de
+    pasos n que queda por debajo de ambos, y su costo por fotograma es n
+    por el costo de un paso. Se elige el más barato con n ≤ pasos_maximos;
+    el propagador exacto (un paso de dt_maximo, sin límite de estabilidad
+    ni error de discretización) se queda si no es más caro.
+
+    candidatos: explícitos que admite el modelo (rlc solo tiene Euler)
+
+    Devuelve un diccionario con integrador, dt, pasos_por_fotograma,
+    costo_por_fotograma, tipo, raices, rapidez, rigidez (|λ|máx/|λ|mín),
+    limites ({nombre: (dt_estable, dt_preciso)}) y dt_muestreo, el paso con
+    que muestrear la solución cerrada para no perder la dinámica más rápida
+    (como mucho dt_maximo).
+    """
+    tipo, r1, r2 = clasificar(a, b, c)
+    lento, rapido = sorted((abs(r1), abs(r2)))
+    rapidez = max(rapido, abs(omega))
+
+    limites = {}
+    elegido, dt, pasos, costo = "exacto", dt_maximo, 1, COSTO_EXACTO
+    for nombre in candidatos:
+        orden, costo_paso = EXPLICITOS[nombre]
+        dt_limite_estable = dt_estable(nombre, a, b, c)
+        dt_preciso = (tolerancia * factorial(orden + 1) / (rapidez * t_final))**(1 / orden) / rapidez \
+            if rapidez > 0 else np.inf
+        limites[nombre] = (float(dt_limite_estable), float(dt_preciso))
+        # Menor número de pasos por fotograma con dt por debajo de los dos límites
+        dt_limite = min(dt_limite_estable, dt_preciso)
+        if dt_limite <= 0:
+            continue
+        n = 1 if dt_limite >= dt_maximo else int(np.floor(dt_maximo / dt_limite)) + 1
+        if n <= pasos_maximos and n * costo_paso < costo:
+            elegido, dt, pasos, costo = nombre, dt_maximo / n, n, n * costo_paso
+
+    return {
+        "integrador": elegido,
+        "dt": dt,
+        "pasos_por_fotograma": pasos,
+        "costo_por_fotograma": costo,
+        "tipo": tipo,
+        "raices": (r1, r2),
+        "rapidez": float(rapidez),
+        "rigidez": float(rapido / lento) if lento > 0 else float("inf"),
+        "limites": limites,
+        "dt_muestreo": min(dt_maximo, 1 / (MUESTRAS_POR_ESCALA * rapidez)) if rapidez > 0 else dt_maximo,
+    }
+
+
+def texto_seleccion(seleccion, encabezado=None):
+    """
+    Resumen de elegir_integrador para el texto del análisis.
+
+    encabezado: primera línea en lugar de la del integrador elegido (por
+    ejemplo, si se muestrea la solución cerrada)
+    """
+    r1, r2 = seleccion["raices"]
+    rapido = max(abs(r1), abs(r2))
+    if encabezado is None:
+        encabezado = (f"Integrador elegido: {NOMBRES_INTEGRADORES[seleccion['integrador']]}, "
+                      f"dt = {seleccion['dt']:.4g} s ({seleccion['pasos_por_fotograma']} "
+                      f"por fotograma, costo {seleccion['costo_por_fotograma']:g} frente a "
+                      f"{COSTO_EXACTO:g} del exacto)")
+    texto = f"\n🔹 {encabezado}\n"
+    texto += f"   |λ|máx = {rapido:.4g} s⁻¹, |λ|máx·dt = {rapido * seleccion['dt']:.3g}"
+    texto += f", rigidez |λ|máx/|λ|mín = {seleccion['rigidez']:.3g}\n"
+    for nombre, (dt_estable, dt_preciso) in seleccion["limites"].items():
+        texto += (f"   {NOMBRES_INTEGRADORES[nombre]}: estable con dt < {dt_estable:.3g} s, "
+                  f"error ≤ {TOLERANCIA_INTEGRADOR:g} con dt < {dt_preciso:.3g} s\n")
+    return texto
@@ -0,0 +1,89 @@
+"""
+Integración por lotes: N configuraciones de parámetros avanzan juntas.
+
+Cada modelo expone una función de paso con la firma
+
+    paso(t, estado, dt, **parametros) -> nuevo_estado
+
+donde `estado` tiene forma (N, dim_estado) y cada parámetro es un escalar o
+un arreglo de forma (N,). Así un solo paso de Python avanza las N
+configuraciones a la vez.
+"""
+import numpy as np
+
+
+def parametros_lote(**parametros):
+    """
+    Convierte escalares y arreglos en arreglos de forma (N,) compatibles.
+
+    Ejemplo: parametros_lote(m=1.0, k=np.linspace(1, 10, 100))
+    devuelve m y k como arreglos de 100 elementos.
+    """
+    arreglos = {nombre: np.asarray(valor, dtype=float) for nombre, valor in parametros.items()}
+    forma = np.broadcast_shapes(*(a.shape for a in arreglos.values())) if arreglos else ()
+    if len(forma) > 1:
+        raise ValueError(f"Los parámetros deben ser escalares o vectores, forma obtenida: {forma}")
+    N = forma[0] if forma else 1
+    return {nombre: np.broadcast_to(a, (N,)).copy() for nombre, a in arreglos.items()}
+
+
+def estado_lote(*componentes, N=None):
+    """
+    Construye el estado inicial (N, dim_estado) a partir de sus componentes.
+
+    Ejemplo: estado_lote(x0, v0) con x0 y v0 escalares o arreglos (N,).
+    """
+    columnas = [np.asarray(c, dtype=float) for c in componentes]
+    if N is None:
+        N = max((c.size for c in columnas), default=1)
+    return np.stack([np.broadcast_to(c, (N,)) for c in columnas], axis=1).astype(float)
+
+
+def simular_lote(paso, estado0, parametros, dt, t_final, guardar_cada=1, detener=None):
+    """
+    Integra N configuraciones con pasos fijos de tamaño dt hasta t_final.
+
+    paso:         función de paso del modelo (ver docstring del módulo)
+    estado0:      arreglo (N, dim_estado)
+    parametros:   diccionario de parámetros (ver parametros_lote)
+    guardar_cada: guarda el estado cada tantos pasos
+    detener:      función opcional detener(estado, **parametros) -> máscara (N,)
+                  que indica qué configuraciones han terminado. Las que terminan
+                  quedan congeladas y su instante de parada se guarda en t_fin.
+
+    Devuelve un diccionario con:
+        t       tiempos guardados, forma (M,)
+        estados estados guardados, forma (M, N, dim_estado)
+        t_fin   instante en que terminó cada configuración (t_final si no paró)
+    """
+    estado = np.array(estado0, dtype=float)
+    N = estado.shape[0]
+    n_pasos = int(round(t_final / dt))
+
+    activos = np.ones(N, dtype=bool)
+    t_fin = np.full(N, float(t_final))
+
+    tiempos = [0.0]
+    estados = [estado.copy()]
+
+    t = 0.0
+    for n in range(1, n_pasos + 1):
+        nuevo = paso(t, estado, dt, **parametros)
+        estado = np.where(activos[:, None], nuevo, estado)
+        t = n * dt
+
+        if detener is not None:
+            terminados = activos & detener(estado, **parametros)
+            if terminados.any():
+                t_fin[terminados] = t
+                activos &= ~terminados
+                if not activos.any():
+                    tiempos.append(t)
+                    estados.append(estado.copy())
+                    break
+
+        if n % guardar_cada == 0:
+            tiempos.append(t)
+            estados.append(estado.copy())
+
+    return {"t": np.array(tiempos), "estados": np.array(estados), "t_fin": t_fin}
@@ -0,0 +1,316 @@
+"""
+Modelo masa-resorte-amortiguador forzado.
+
+Ecuación: m·x'' + b·x' + k·x = A·cos(ω·t)
+Estado:   columnas [x, v] de forma (N, 2)
+"""
+import numpy as np
+
+from . import lineal, lote
+from .lineal import PESOS_YOSHIDA
+
+DIM_ESTADO = 2
+
+
+def fuerza_externa(t, A, w):
+    """F(t) = A·cos(ω·t)"""
+    return A * np.cos(w * t)
+
+
+def derivadas(t, estado, m, b, k, A, w):
+    """Devuelve [x', v'] = [v, (F(t) - b·v - k·x)/m] para todo el lote."""
+    x = estado[:, 0]
+    v = estado[:, 1]
+    a = (fuerza_externa(t, A, w) - b*v - k*x) / m
+    return np.stack([v, a], axis=1)
+
+
+def paso_euler(t, estado, dt, m, b, k, A, w):
+    """
+    Paso de Euler semi-implícito (el de la simulación original):
+    primero se actualiza la velocidad y con ella la posición.
+    """
+    x = estado[:, 0]
+    v = estado[:, 1]
+    a = (fuerza_externa(t, A, w) - b*v - k*x) / m
+    v = v + a * dt
+    x = x + v * dt
+    return np.stack([x, v], axis=1)
+
+
+def paso_verlet(t, estado, dt, m, b, k, A, w):
+    """
+    Verlet de velocidades (segundo orden, simétrico).
+
+    Medio impulso con la aceleración en t, deriva de la posición y medio
+    impulso en t + dt. Como el amortiguamiento es lineal en v, el segundo
+    medio impulso se resuelve de forma implícita en la velocidad nueva, lo
+    que mantiene el método simétrico y de segundo orden también con b > 0.
+    """
+    x = estado[:, 0]
+    v = estado[:, 1]
+    v_medio = v + 0.5 * dt * (fuerza_externa(t, A, w) - b*v - k*x) / m
+    x = x + v_medio * dt
+    v = (v_medio + 0.5 * dt * (fuerza_externa(t + dt, A, w) - k*x) / m) / (1 + 0.5 * dt * b / m)
+    return np.stack([x, v], axis=1)
+
+
+def paso_yoshida4(t, estado, dt, m, b, k, A, w):
+    """
+    Método simpléctico de cuarto orden de Yoshida: tres pasos de Verlet
+    de tamaños w₁·dt, w₀·dt y w₁·dt (w₀ < 0, el paso del medio retrocede).
+    """
+    for peso in PESOS_YOSHIDA:
+        estado = paso_verlet(t, estado, peso * dt, m, b, k, A, w)
+        t = t + peso * dt
+    return estado
+
+
+def paso_rk4(t, estado, dt, m, b, k, A, w):
+    """Runge-Kutta clásico de cuarto orden (no simpléctico)."""
+    k1 = derivadas(t, estado, m, b, k, A, w)
+    k2 = derivadas(t + dt/2, estado + dt/2 * k1, m, b, k, A, w)
+    k3 = derivadas(t + dt/2, estado + dt/2 * k2, m, b, k, A, w)
+    k4 = derivadas(t + dt, estado + dt * k3, m, b, k, A, w)
+    return estado + dt/6 * (k1 + 2*k2 + 2*k3 + k4)
+
+
+def paso_exacto(t, estado, dt, m, b, k, A, w):
+    """
+    Propagador exacto: exp(M·dt) del sistema lineal, calculado una vez por
+    combinación de parámetros y dt (ver lineal.Propagador). Sin error de
+    discretización para cualquier dt.
+    """
+    return lineal.propagador(m, b, k, A, w, dt).avanzar(t, estado)
+
+
+# Integradores disponibles: nombre -> función de paso (misma firma)
+INTEGRADORES = {
+    "euler": paso_euler,
+    "verlet": paso_verlet,
+    "yoshida4": paso_yoshida4,
+    "rk4": paso_rk4,
+    "exacto": paso_exacto,
+}
+
+
+def energia(estado, m, k):
+    """Energía cinética, potencial y total de cada configuración."""
+    x = estado[..., 0]
+    v = estado[..., 1]
+    E_cinetica = 0.5 * m * v**2
+    E_potencial = 0.5 * k * x**2
+    return E_cinetica, E_potencial, E_cinetica + E_potencial
+
+
+def solucion_analitica(t, m, b, k, x0, v0, A, w, t0=0.0):
+    """
+    x(t) y v(t) exactos sobre un arreglo de tiempos.
+
+    Parte homogénea según las raíces de m·r² + b·r + k = 0 más la solución
+    particular de A·cos(ω·t). x0 y v0 son las condiciones en t = t0.
+    """
+    return lineal.solucion(t, m, b, k, x0, v0, A, w, t0)
+
+
+def elegir_integrador(m, b, k, w, t_final, dt_maximo, **opciones):
+    """Integrador y dt según las raíces de m·r² + b·r + k = 0 (ver lineal.elegir_integrador)."""
+    return lineal.elegir_integrador(m, b, k, w, t_final, dt_maximo, **opciones)
+
+
+def respuesta_frecuencia(omega, m, b, k, A=1.0):
+    """Amplitud y fase de x_p frente a un arreglo de frecuencias ω."""
+    return lineal.respuesta_frecuencia(omega, m, b, k, A)
+
+
+def resonancia(m, b, k, A=1.0):
+    """Pico, ancho de banda y factor Q de x_p (ver lineal.resonancia)."""
+    return lineal.resonancia(m, b, k, A)
+
+
+# -------------------------------------------------
+# BALANCE DE ENERGÍA
+# -------------------------------------------------
+# Con E = ½·m·v² + ½·k·x², la ecuación da dE/dt = F(t)·v - b·v²: la energía
+# solo cambia por el trabajo de la fuerza externa y del amortiguamiento. La
+# deriva de un integrador es lo que su energía se aparta de ese balance.
+
+def potencia(t, estado, m, b, k, A, w):
+    """Potencia neta P = F(t)·v - b·v² y su derivada temporal dP/dt."""
+    x = estado[..., 0]
+    v = estado[..., 1]
+    F = fuerza_externa(t, A, w)
+    a = (F - b*v - k*x) / m
+    dF = -A * w * np.sin(w * t)
+    return F*v - b*v**2, dF*v + (F - 2*b*v)*a
+
+
+def _trabajo_tramo(h, P0, dP0, P1, dP1):
+    """∫P dt en un tramo de largo h: trapecio con corrección de Euler-Maclaurin (orden 4)."""
+    return h/2 * (P0 + P1) - h**2/12 * (dP1 - dP0)
+
+
+def deriva_energia(t, estados, m, b, k, A, w):
+    """
+    Deriva relativa de la energía en cada instante guardado:
+
+        (E(t) - E(0) - W(t)) / max|E| hasta t
+
+    con W(t) el trabajo neto ∫(F·v - b·v²) dt evaluado sobre la propia
+    trayectoria. estados tiene forma (M, 2) o (M, N, 2) y t forma (M,).
+    Para la solución exacta vale 0 (salvo el error de la cuadratura, de
+    cuarto orden en el intervalo entre muestras).
+    """
+    estados = np.asarray(estados, dtype=float)
+    t = np.asarray(t, dtype=float).reshape((-1,) + (1,) * (estados.ndim - 2))
+    _, _, E = energia(estados, m, k)
+    P, dP = potencia(t, estados, m, b, k, A, w)
+    tramos = _trabajo_tramo(np.diff(t, axis=0), P[:-1], dP[:-1], P[1:], dP[1:])
+    W = np.concatenate([np.zeros_like(P[:1]), np.cumsum(tramos, axis=0)])
+    escala = np.maximum(np.maximum.accumulate(np.abs(E), axis=0), np.finfo(float).tiny)
+    return (E - E[0] - W) / escala
+
+
+class BalanceEnergia:
+    """
+    La misma deriva que deriva_energia, acumulada muestra a muestra durante
+    una ejecución. reiniciar() toma un origen nuevo (por ejemplo al cambiar
+    los parámetros en vivo) y conserva deriva_maxima.
+    """
+
+    def __init__(self, t, estado, m, b, k, A, w):
+        self.deriva_maxima = 0.0
+        self.reiniciar(t, estado, m=m, b=b, k=k, A=A, w=w)
+
+    def reiniciar(self, t, estado, **parametros):
+        self.parametros = parametros
+        self.t = float(t)
+        estado = np.asarray(estado, dtype=float)
+        self.P, self.dP = potencia(self.t, estado, **parametros)
+        self.E0 = float(energia(estado, parametros["m"], parametros["k"])[2])
+        self.escala = abs(self.E0)
+        self.trabajo = 0.0
+        self.deriva = 0.0
+
+    def agregar(self, t, estado):
+        """Suma el tramo hasta (t, estado) y actualiza la deriva."""
+        estado = np.asarray(estado, dtype=float)
+        P, dP = potencia(t, estado, **self.parametros)
+        self.trabajo += float(_trabajo_tramo(t - self.t, self.P, self.dP, P, dP))
+        self.t, self.P, self.dP = float(t), P, dP
+
+        E = float(energia(estado, self.parametros["m"], self.parametros["k"])[2])
+        self.escala = max(self.escala, abs(E))
+        self.deriva = (E - self.E0 - self.trabajo) / max(self.escala, np.finfo(float).tiny)
+        self.deriva_maxima = max(self.deriva_maxima, abs(self.deriva))
+
+
+def dt_maximo(integrador, presupuesto, t_final, x0, v0, m, b, k, A, w,
+              dt_inicial=0.1, dt_minimo=1e-5, iteraciones=8):
+    """
+    Mayor dt (hasta dt_inicial) cuya deriva máxima de energía hasta t_final
+    no supera `presupuesto`.
+
+    integrador: nombre en INTEGRADORES o función de paso
+    Divide dt a la mitad hasta cumplir y luego afina con bisección
+    geométrica entre el último dt que falla y el primero que cumple.
+    Devuelve (dt, deriva_maxima con ese dt).
+    """
+    paso = INTEGRADORES[integrador] if isinstance(integrador, str) else integrador
+    parametros = dict(m=m, b=b, k=k, A=A, w=w)
+    estado0 = np.array([[x0, v0]], dtype=float)
+
+    def deriva(dt):
+        r = lote.simular_lote(paso, estado0, parametros, dt, t_final)
+        return float(np.max(np.abs(deriva_energia(r["t"], r["estados"][:, 0], **parametros))))
+
+    dt_bueno = dt_inicial
+    deriva_buena = deriva(dt_bueno)
+    dt_malo = None
+    while deriva_buena > presupuesto:
+        if dt_bueno / 2 < dt_minimo:
+            raise ValueError(f"Ningún dt >= {dt_minimo} cumple una deriva de {presupuesto}")
+        dt_malo = dt_bueno
+        dt_bueno /= 2
+        deriva_buena = deriva(dt_bueno)
+
+    if dt_malo is not None:
+        for _ in range(iteraciones):
+            dt_medio = np.sqrt(dt_bueno * dt_malo)
+            deriva_media = deriva(dt_medio)
+            if deriva_media <= presupuesto:
+                dt_bueno, deriva_buena = dt_medio, deriva_media
+            else:
+                dt_malo = dt_medio
+    return float(dt_bueno), deriva_buena
+
+
+# -------------------------------------------------
+# FUNCIONES DE ANÁLISIS
+# -------------------------------------------------
+
+def analizar_ecuacion(m, b, k, A, w):
+    """
+    Analiza la ecuación diferencial y determina el tipo de solución
+    Ecuación homogénea: m·x'' + b·x' + k·x = 0
+    Ecuación característica: m·r² + b·r + k = 0
+    """
+    # Ecuación con parámetros
+    if A == 0:
+        ec_texto = f"({m:.2f})·x'' + ({b:.2f})·x' + ({k:.2f})·x = 0\n"
+    else:
+        ec_texto = f"({m:.2f})·x'' + ({b:.2f})·x' + ({k:.2f})·x = ({A:.2f})·cos(({w:.2f})·t)\n"
+    
+    # Ecuación característica: m·r² + b·r + k = 0
+    # r = (-b ± sqrt(b² - 4mk)) / (2m)
+    discriminante = b**2 - 4*m*k
+    
+    analisis = "\n--- Análisis de la Ecuación Característica ---\n"
+    analisis += f"Ecuación característica: ({m:.2f})·r² + ({b:.2f})·r + ({k:.2f}) = 0\n"
+    analisis += f"Discriminante Δ = b² - 4mk = {discriminante:.4f}\n\n"
+    
+    if discriminante > 0:
+        # Dos raíces reales distintas
+        r1 = (-b + np.sqrt(discriminante)) / (2*m)
+        r2 = (-b - np.sqrt(discriminante)) / (2*m)
+        analisis += "🔹 Caso: Sobreamortiguado (dos raíces reales distintas)\n"
+        analisis += f"   r₁ = {r1:.4f}\n"
+        analisis += f"   r₂ = {r2:.4f}\n"
+        analisis += f"   Solución homogénea: x_h(t) = C₁·e^({r1:.4f}·t) + C₂·e^({r2:.4f}·t)\n"
+    elif discriminante == 0:
+        # Raíz real doble
+        r = -b / (2*m)
+        analisis += "🔹 Caso: Críticamente amortiguado (raíz real doble)\n"
+        analisis += f"   r = {r:.4f}\n"
+        analisis += f"   Solución homogénea: x_h(t) = (C₁ + C₂·t)·e^({r:.4f}·t)\n"
+    else:
+        # Raíces complejas conjugadas
+        parte_real = -b / (2*m)
+        parte_imag = np.sqrt(-discriminante) / (2*m)
+        analisis += "🔹 Caso: Subamortiguado (raíces complejas conjugadas)\n"
+        analisis += f"   r = {parte_real:.4f} ± {parte_imag:.4f}i\n"
+        analisis += f"   Solución homogénea: x_h(t) = e^({parte_real:.4f}·t)·[C₁·cos({parte_imag:.4f}·t) + C₂·sin({parte_imag:.4f}·t)]\n"
+        
+        # Frecuencia natural y factor de amortiguamiento
+        w_n = lineal.frecuencia_natural(m, k)
+        zeta = lineal.factor_amortiguamiento(m, b, k)
+        analisis += f"\n   Frecuencia natural: ω_n = {w_n:.4f} rad/s\n"
+        analisis += f"   Factor de amortiguamiento: ζ = {zeta:.4f}\n"
+    
+    if A > 0:
+        analisis += f"\n🔹 Solución particular (forzamiento): x_p(t) depende de cos({w:.2f}·t)\n"
+        analisis += "   Solución completa: x(t) = x_h(t) + x_p(t)\n"
+
+    # Respuesta en frecuencia, relativa al desplazamiento estático A/k
+    res = resonancia(m, b, k)
+    analisis += "\n🔹 Respuesta en frecuencia (x_p relativa a A/k):\n"
+    if res["omega_pico"] > 0:
+        analisis += f"   Pico de resonancia: ω_r = {res['omega_pico']:.4f} rad/s, amplificación {res['amplitud_pico']*k:.3f}\n"
+    else:
+        analisis += "   Sin pico de resonancia (ζ ≥ 1/√2): la amplitud decrece con ω\n"
+    analisis += f"   Ancho de banda: Δω = {res['ancho_banda']:.4f} rad/s, factor de calidad Q = {res['Q']:.3f}\n"
+    if A > 0:
+        amplitud, fase = respuesta_frecuencia(w, m, b, k)
+        analisis += f"   Con ω = {w:.2f}: amplificación {amplitud*k:.3f}, fase {np.degrees(fase):.1f}°\n"
+    
+    return ec_texto, analisis
@@ -0,0 +1,193 @@
+"""
+Tanque de mezcla con entrada y salida de solución.
+
+Sistema acoplado (balance de soluto d(V·C)/dt = Qin·Cin - Qout·C con
+dV/dt = Qin - Qout, ya que el líquido sale con la concentración del tanque):
+    dC/dt = Qin·(Cin - C) / V(t),   V(t) = A·H(t)
+    dH/dt = (Qin - Qout) / A
+Estado: columnas [C, H] de forma (N, 2)
+"""
+import numpy as np
+
+DIM_ESTADO = 2
+
+# Altura del tanque (m)
+ALTURA_TANQUE = 4.0
+
+
+def derivadas(t, estado, Qin, Qout, Cin, A):
+    """Devuelve [C', H'] para todo el lote."""
+    C = estado[:, 0]
+    H = estado[:, 1]
+    V = A * H
+    dCdt = np.where(V > 0, Qin*(Cin - C) / np.where(V > 0, V, 1.0), 0.0)
+    dHdt = np.broadcast_to((Qin - Qout) / A, H.shape)
+    return np.stack([dCdt, dHdt], axis=1)
+
+
+def paso_euler(t, estado, dt, Qin, Qout, Cin, A):
+    """Paso de Euler explícito sobre concentración y nivel."""
+    return estado + derivadas(t, estado, Qin, Qout, Cin, A) * dt
+
+
+def tanque_lleno_o_vacio(estado, altura_tanque=ALTURA_TANQUE, **parametros):
+    """Máscara de configuraciones cuyo tanque se vació o se llenó."""
+    H = estado[:, 1]
+    return (H <= 0) | (H >= altura_tanque)
+
+
+# -------------------------------------------------
+# SOLUCIÓN ANALÍTICA
+# -------------------------------------------------
+
+# Diferencia de caudales por debajo de la cual el volumen se considera constante
+TOLERANCIA_CAUDAL = 1e-6
+
+
+def instante_final(Qin, Qout, h0, A, altura_tanque=ALTURA_TANQUE):
+    """
+    Tiempo en que el tanque se llena (Qin > Qout) o se vacía (Qin < Qout).
+    Con volumen constante devuelve infinito. Acepta arreglos.
+    """
+    q = np.asarray(Qin - Qout, dtype=float)
+    constante = np.abs(q) < TOLERANCIA_CAUDAL
+    q_seguro = np.where(constante, 1.0, q)
+    llenado = (altura_tanque - h0) * A / q_seguro
+    vaciado = h0 * A / -q_seguro
+    resultado = np.where(constante, np.inf, np.where(q > 0, llenado, vaciado))
+    return resultado if resultado.ndim else float(resultado)
+
+
+def solucion_analitica(t, Qin, Qout, Cin, h0, A, C0=0.0, altura_tanque=ALTURA_TANQUE):
+    """
+    C(t) y H(t) exactos del sistema del tanque de mezcla.
+
+    Con V(t) = V₀ + q·t, q = Qin - Qout, la EDO lineal
+        dC/dt + (Qin/V)·C = Qin·Cin/V
+    tiene factor integrante (V/V₀)^(Qin/q), de donde
+        C(t) = Cin + (C₀ - Cin)·(V₀/V(t))^(Qin/q)
+    que cubre llenado (q > 0) y vaciado (q < 0) y tiende a Cin. Con volumen
+    constante se reduce a C(t) = Cin + (C₀ - Cin)·e^(-Qin·t/V₀); sin
+    entrada (Qin = 0) la concentración no cambia.
+
+    Pasado el instante de llenado o vaciado los valores quedan congelados.
+    Todos los argumentos aceptan arreglos compatibles por broadcasting.
+    """
+    t = np.asarray(t, dtype=float)
+    q = np.asarray(Qin - Qout, dtype=float)
+    Qin = np.asarray(Qin, dtype=float)
+    V0 = A * h0
+
+    constante = np.abs(q) < TOLERANCIA_CAUDAL
+    q_seguro = np.where(constante, 1.0, q)
+
+    t_limite = instante_final(Qin, Qout, h0, A, altura_tanque)
+    t_efectivo = np.minimum(t, t_limite)
+    V = np.where(constante, V0, np.maximum(V0 + q_seguro * t_efectivo, 0))
+    # Desde el instante final, exactamente vacío o lleno (V0 + q·t deja ~1e-16·V0)
+    V = np.where(t >= t_limite, np.where(q > 0, altura_tanque * A, 0.0), V)
+    H = V / A
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_V = np.log(V / V0)
+        # Exponente de (V₀/V)^(Qin/q), o -Qin·t/V₀ con volumen constante;
+        # sin entrada es 0 también cuando el tanque se vacía (log_V = -inf)
+        exponente = np.where(constante, -Qin * t_efectivo / V0, -(Qin / q_seguro) * log_V)
+        exponente = np.where(Qin > 0, exponente, 0.0)
+    C = Cin + (C0 - Cin) * np.exp(exponente)
+    return (C if C.ndim else float(C)), (H if np.ndim(H) else float(H))
+
+
+def valores_finales(Qin, Qout, Cin, h0, A, C0=0.0, altura_tanque=ALTURA_TANQUE):
+    """
+    Tiempo de llenado/vaciado y concentración y nivel en ese instante, sin
+    integrar. Con volumen constante el tiempo es infinito y C es Cin.
+    """
+    t_fin = instante_final(Qin, Qout, h0, A, altura_tanque)
+    C_fin, H_fin = solucion_analitica(t_fin, Qin, Qout, Cin, h0, A, C0, altura_tanque)
+    return t_fin, C_fin, H_fin
+
+
+def error_numerico(t, C_numerica, H_numerica, Qin, Qout, Cin, h0, A, C0=0.0,
+                   altura_tanque=ALTURA_TANQUE):
+    """
+    Error absoluto máximo de una solución numérica (C, H) frente a la
+    analítica en los mismos instantes. Devuelve (error_C, error_H).
+    """
+    C, H = solucion_analitica(t, Qin, Qout, Cin, h0, A, C0, altura_tanque)
+    return np.max(np.abs(np.asarray(C_numerica) - C)), np.max(np.abs(np.asarray(H_numerica) - H))
+
+
+# -------------------------------------------------
+# ANÁLISIS DE LAS ECUACIONES
+# -------------------------------------------------
+
+def analizar_ecuaciones(Qin, Qout, Cin, h0, A, C0=0.0):
+    """
+    Analiza el sistema de ecuaciones diferenciales del tanque de mezcla
+    desde el estado (C0, h0); t se mide desde ese estado.
+    
+    Sistema:
+    1) dH/dt = (Qin - Qout) / A
+    2) dC/dt = Qin·(Cin - C) / (A·H)
+    
+    Soluciones analíticas:
+    """
+    
+    texto = "\n--- Análisis del Sistema ---\n\n"
+    
+    # Ecuación de altura (independiente, lineal)
+    texto += "🔹 Ecuación de Altura (EDO lineal de primer orden):\n"
+    texto += f"   dH/dt = ({Qin:.3f} - {Qout:.3f}) / {A:.4f}\n"
+    
+    delta_Q = Qin - Qout
+    
+    if abs(delta_Q) < 1e-6:
+        texto += f"   dH/dt = 0 (nivel constante)\n"
+        texto += f"   Solución: H(t) = {h0:.2f} m (constante)\n\n"
+        H_final = h0
+        comportamiento_H = "constante"
+    else:
+        k_H = delta_Q / A
+        texto += f"   dH/dt = {k_H:.6f} m/s\n"
+        texto += f"   Solución: H(t) = {h0:.2f} + {k_H:.6f}·t\n"
+        
+        if delta_Q > 0:
+            texto += f"   ⬆️ El tanque se LLENA (Qin > Qout)\n\n"
+            comportamiento_H = "llenado"
+            H_final = None  # dependerá de cuándo se llene
+        else:
+            t_vaciado = -h0 / k_H
+            texto += f"   ⬇️ El tanque se VACÍA (Qin < Qout)\n"
+            texto += f"   Tiempo de vaciado: {t_vaciado:.2f} s\n\n"
+            comportamiento_H = "vaciado"
+            H_final = 0
+    
+    # Ecuación de concentración (depende de H(t))
+    texto += "🔹 Ecuación de Concentración (EDO no lineal):\n"
+    texto += f"   dC/dt = {Qin:.3f}·({Cin:.2f} - C) / (A·H(t))\n"
+    
+    if Qin <= 0:
+        # Sin entrada no llega soluto nuevo: la salida no cambia la concentración
+        texto += f"   Sin entrada (Qin = 0) la concentración no cambia: C(t) = {C0:.2f} g/L\n\n"
+    elif abs(delta_Q) < 1e-6:
+        # Caso especial: volumen constante
+        texto += f"   Con H(t) constante, V = {A*h0:.4f} m³:\n"
+        tau = (A * h0) / Qin
+        texto += f"   dC/dt = ({Qin*Cin:.4f} - {Qin:.3f}·C) / {A*h0:.4f}\n"
+        texto += f"   Solución (exponencial):\n"
+        texto += f"   C(t) = {Cin:.2f} + ({C0 - Cin:.2f})·e^(-t/{tau:.2f})\n"
+        texto += f"   Concentración de equilibrio: C_eq = Cin = {Cin:.2f} g/L\n"
+        texto += f"   Constante de tiempo: τ = {tau:.2f} s\n\n"
+    else:
+        # Volumen variable: V(t) = V₀ + (Qin - Qout)·t, la EDO sigue siendo lineal
+        exponente = Qin / delta_Q
+        t_fin, C_fin, _ = valores_finales(Qin, Qout, Cin, h0, A, C0)
+        texto += f"   Con V(t) = {A*h0:.4f} + ({delta_Q:.3f})·t, factor integrante (V/V₀)^(Qin/(Qin-Qout)):\n"
+        texto += f"   C(t) = {Cin:.2f} + ({C0 - Cin:.2f})·({A*h0:.4f}/V(t))^({exponente:.4f})\n"
+        if Qin > Qout:
+            texto += f"   Al llenarse (t = {t_fin:.2f} s): C = {C_fin:.2f} g/L\n\n"
+        else:
+            texto += f"   Al vaciarse (t = {t_fin:.2f} s): C = {C_fin:.2f} g/L\n\n"
+    
+    return texto, comportamiento_H, delta_Q / A if abs(delta_Q) > 1e-6 else 0
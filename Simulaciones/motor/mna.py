@@ -0,0 +1,323 @@
+"""
+Redes R/L/C con fuentes descritas por una netlist, por análisis nodal
+modificado (MNA).
+
+Incógnitas: la tensión de cada nodo (el "0" es tierra), la corriente de
+cada bobina y la de cada fuente de tensión. Cada elemento suma su estampa a
+dos matrices dispersas y el circuito queda
+
+    C·x' + G·x = b(t)
+
+R y las fuentes van en G, los condensadores y las bobinas en C. C es
+singular (las tensiones fijadas por fuentes y resistencias son
+algebraicas), así que el sistema se integra con TR-BDF2: un tramo de regla
+del trapecio hasta t + γ·dt y uno de BDF2 hasta t + dt, con γ = 2 − √2.
+Con ese γ los dos tramos usan la misma matriz (2 + √2)/dt·C + G, que se
+factoriza una sola vez por dt: splu de scipy.sparse si SciPy está
+instalado; si no, la inversa densa (adecuada para unos cientos de
+incógnitas). El método es de segundo orden, L-estable, y el tramo BDF2
+deja las ecuaciones algebraicas satisfechas al final de cada paso aunque el
+estado inicial no lo esté.
+
+Netlist: una línea por elemento, "nombre nodo+ nodo- valor [ω]"; la
+primera letra del nombre da el tipo (R, L, C, V o I). Las fuentes valen
+valor·cos(ω·t) (ω = 0 o ausente: continua); la corriente de una fuente I
+va de nodo+ a nodo- por dentro de la fuente. Se admiten los sufijos de
+SPICE (m = 10⁻³, u = 10⁻⁶, k = 10³, meg = 10⁶...). "#" y "*" comentan.
+
+Ejemplo:
+    circuito = CircuitoMNA.desde_netlist(serie_rlc(R=1.0, L=1.0, C=0.25, V0=5.0, omega=2.0))
+    r = circuito.simular(circuito.estado(), dt=0.01, t_final=20)
+    circuito.carga(r["estados"], "C1"), circuito.corriente(r["estados"], "L1")
+"""
+import re
+from collections import namedtuple
+
+import numpy as np
+
+try:
+    from scipy import sparse
+    from scipy.sparse.linalg import splu
+except ImportError:  # Sin SciPy: matrices densas
+    sparse = None
+
+# Constante de TR-BDF2 con la que los dos tramos comparten matriz
+GAMMA = 2 - np.sqrt(2)
+# Nombre del nodo de referencia
+TIERRA = "0"
+# Factorizaciones (una por dt) que conserva cada circuito
+CAPACIDAD_FACTORIZACIONES = 4
+
+SUFIJOS = {"f": 1e-15, "p": 1e-12, "n": 1e-9, "u": 1e-6, "µ": 1e-6, "m": 1e-3,
+           "k": 1e3, "meg": 1e6, "g": 1e9}
+
+Elemento = namedtuple("Elemento", "nombre tipo nodo_pos nodo_neg valor omega")
+
+
+def valor_netlist(texto):
+    """Número con sufijo opcional de SPICE: "10m" -> 0.01, "2.2k" -> 2200."""
+    coincidencia = re.fullmatch(r"([-+]?[\d.]+(?:e[-+]?\d+)?)(meg|[fpnuµmkg])?[a-zα-ω]*",
+                                texto.strip().lower())
+    if coincidencia is None:
+        raise ValueError(f"Valor no válido en la netlist: {texto!r}")
+    numero, sufijo = coincidencia.groups()
+    return float(numero) * SUFIJOS.get(sufijo, 1.0)
+
+
+def leer_netlist(texto):
+    """Lista de Elemento a partir del texto de una netlist."""
+    elementos = []
+    for n_linea, linea in enumerate(texto.splitlines(), 1):
+        linea = re.split(r"[#*]", linea, maxsplit=1)[0].strip()
+        if not linea:
+            continue
+        campos = linea.split()
+        tipo = campos[0][0].upper()
+        if tipo not in "RLCVI" or len(campos) not in (4, 5) or (len(campos) == 5 and tipo in "RLC"):
+            raise ValueError(f"Línea {n_linea} de la netlist no válida: {linea!r}")
+        valor = valor_netlist(campos[3])
+        if tipo in "RLC" and valor <= 0:
+            raise ValueError(f"Línea {n_linea}: {campos[0]} debe ser positivo")
+        omega = valor_netlist(campos[4]) if len(campos) == 5 else 0.0
+        elementos.append(Elemento(campos[0], tipo, campos[1], campos[2], valor, omega))
+    nombres = [e.nombre for e in elementos]
+    if len(set(nombres)) != len(nombres):
+        raise ValueError("La netlist tiene nombres de elemento repetidos")
+    return elementos
+
+
+# -------------------------------------------------
+# CIRCUITOS DE EJEMPLO
+# -------------------------------------------------
+
+def serie_rlc(R, L, C, V0, omega):
+    """El circuito de CircuitosRLC: fuente, R, L y C en un solo lazo."""
+    return (f"V1 1 0 {V0!r} {omega!r}\n"
+            f"R1 1 2 {R!r}\n"
+            f"L1 2 3 {L!r}\n"
+            f"C1 3 0 {C!r}\n")
+
+
+def escalera_lc(n_secciones, R, L, C, V0, omega):
+    """
+    Filtro pasa-bajos en escalera: fuente con resistencia interna R, n
+    secciones de L en serie y C a tierra, y carga R en el último nodo.
+    """
+    lineas = [f"V1 entrada 0 {V0!r} {omega!r}", f"Rs entrada n0 {R!r}"]
+    for i in range(n_secciones):
+        lineas.append(f"L{i + 1} n{i} n{i + 1} {L!r}")
+        lineas.append(f"C{i + 1} n{i + 1} 0 {C!r}")
+    lineas.append(f"Rc n{n_secciones} 0 {R!r}")
+    return "\n".join(lineas) + "\n"
+
+
+# -------------------------------------------------
+# MODELO
+# -------------------------------------------------
+
+class _Factorizacion:
+    """Resuelve (a·C + G)·x = rhs para un lote (filas de rhs)."""
+
+    def __init__(self, matriz):
+        if sparse is not None:
+            self._lu = splu(matriz.tocsc())
+            self._inversa = None
+        else:
+            self._inversa = np.linalg.inv(matriz)
+
+    def resolver(self, rhs):
+        if self._inversa is not None:
+            return rhs @ self._inversa.T
+        return self._lu.solve(np.ascontiguousarray(rhs.T)).T
+
+
+class CircuitoMNA:
+    """
+    Circuito lineal C·x' + G·x = b(t) armado a partir de una lista de Elemento.
+
+    nodos:       nombre -> índice de su tensión en el estado (sin tierra)
+    corrientes:  nombre de bobina o fuente de tensión -> índice de su corriente
+    paso(t, estado, dt) tiene la firma de motor.lote (sin parámetros extra),
+    con estado de forma (lote, dim).
+    """
+
+    def __init__(self, elementos):
+        self.elementos = list(elementos)
+        nodos = {}
+        for e in self.elementos:
+            for nodo in (e.nodo_pos, e.nodo_neg):
+                if nodo != TIERRA and nodo not in nodos:
+                    nodos[nodo] = len(nodos)
+        self.nodos = nodos
+        self.corrientes = {}
+        for e in self.elementos:
+            if e.tipo in "LV":
+                self.corrientes[e.nombre] = len(nodos) + len(self.corrientes)
+        self.dim = len(nodos) + len(self.corrientes)
+        if self.dim == 0:
+            raise ValueError("El circuito no tiene nodos")
+
+        G, C = ([], [], []), ([], [], [])
+        fuentes = ([], [], [])   # fila, amplitud (con signo), ω
+        def sumar(matriz, i, j, valor):
+            if i is not None and j is not None:
+                matriz[0].append(i)
+                matriz[1].append(j)
+                matriz[2].append(valor)
+
+        for e in self.elementos:
+            a, b = self.indice(e.nodo_pos), self.indice(e.nodo_neg)
+            if e.tipo in "RC":
+                matriz, valor = (G, 1 / e.valor) if e.tipo == "R" else (C, e.valor)
+                for i, j, signo in ((a, a, 1), (b, b, 1), (a, b, -1), (b, a, -1)):
+                    sumar(matriz, i, j, signo * valor)
+            elif e.tipo in "LV":
+                k = self.corrientes[e.nombre]
+                # La corriente sale de nodo+ hacia nodo- por el elemento
+                for nodo, signo in ((a, 1), (b, -1)):
+                    sumar(G, nodo, k, signo)
+                    sumar(G, k, nodo, signo)
+                if e.tipo == "L":
+                    # v+ - v- = L·di/dt
+                    sumar(C, k, k, -e.valor)
+                else:
+                    fuentes[0].append(k)
+                    fuentes[1].append(e.valor)
+                    fuentes[2].append(e.omega)
+            else:
+                for nodo, signo in ((a, -1), (b, 1)):
+                    if nodo is not None:
+                        fuentes[0].append(nodo)
+                        fuentes[1].append(signo * e.valor)
+                        fuentes[2].append(e.omega)
+
+        self.G = self._matriz(G)
+        self.C = self._matriz(C)
+        self.filas_fuente = np.array(fuentes[0], dtype=np.int64)
+        self.amplitudes = np.array(fuentes[1], dtype=float)
+        self.omegas = np.array(fuentes[2], dtype=float)
+        self._factorizaciones = {}
+
+    @classmethod
+    def desde_netlist(cls, texto):
+        return cls(leer_netlist(texto))
+
+    def _matriz(self, tripletes):
+        filas, columnas, valores = (np.asarray(v) for v in tripletes)
+        if sparse is not None:
+            return sparse.csr_matrix((valores.astype(float), (filas.astype(np.int64),
+                                                              columnas.astype(np.int64))),
+                                     shape=(self.dim, self.dim))
+        matriz = np.zeros((self.dim, self.dim))
+        if len(valores):
+            np.add.at(matriz, (filas.astype(np.int64), columnas.astype(np.int64)), valores)
+        return matriz
+
+    def indice(self, nodo):
+        """Índice de la tensión de un nodo (None para tierra)."""
+        return None if nodo == TIERRA else self.nodos[nodo]
+
+    def b(self, t):
+        """Vector de fuentes en el instante t."""
+        return np.bincount(self.filas_fuente, self.amplitudes * np.cos(self.omegas * t),
+                           minlength=self.dim)
+
+    def factorizacion(self, dt):
+        """Factorización de (2 + √2)/dt·C + G, calculada una vez por dt."""
+        clave = float(dt)
+        if clave not in self._factorizaciones:
+            if len(self._factorizaciones) >= CAPACIDAD_FACTORIZACIONES:
+                self._factorizaciones.pop(next(iter(self._factorizaciones)))
+            self._factorizaciones[clave] = _Factorizacion((2 + np.sqrt(2)) / dt * self.C + self.G)
+        return self._factorizaciones[clave]
+
+    def _producto(self, matriz, estado):
+        return (matriz @ estado.T).T
+
+    def paso(self, t, estado, dt):
+        """Un paso TR-BDF2 de tamaño dt para todas las filas de estado."""
+        estado = np.atleast_2d(estado)
+        factorizacion = self.factorizacion(dt)
+        a = (2 + np.sqrt(2)) / dt
+        C_x = self._producto(self.C, estado)
+        # Tramo del trapecio hasta t + γ·dt
+        rhs = a * C_x - self._producto(self.G, estado) + self.b(t) + self.b(t + GAMMA * dt)
+        x_gamma = factorizacion.resolver(rhs)
+        # Tramo BDF2 hasta t + dt con los puntos t, t + γ·dt y t + dt
+        a1 = 1 / (GAMMA * (2 - GAMMA))
+        a0 = (1 - GAMMA)**2 / (GAMMA * (2 - GAMMA))
+        rhs = a * (a1 * self._producto(self.C, x_gamma) - a0 * C_x) + self.b(t + dt)
+        return factorizacion.resolver(rhs)
+
+    def simular(self, estado0, dt, t_final, guardar_cada=1):
+        """
+        Integra desde estado0 hasta t_final con pasos dt.
+
+        Devuelve {t (M,), estados (M, dim)}.
+        """
+        estado = np.array(estado0, dtype=float).reshape(1, -1)
+        n_pasos = int(round(t_final / dt))
+        tiempos, estados = [0.0], [estado[0].copy()]
+        for n in range(1, n_pasos + 1):
+            estado = self.paso((n - 1) * dt, estado, dt)
+            if n % guardar_cada == 0 or n == n_pasos:
+                tiempos.append(n * dt)
+                estados.append(estado[0].copy())
+        return {"t": np.array(tiempos), "estados": np.array(estados)}
+
+    # -------------------------------------------------
+    # ESTADO Y MAGNITUDES
+    # -------------------------------------------------
+
+    def estado(self, tensiones=None, corrientes=None):
+        """
+        Estado inicial: tensiones de nodo {nodo: V} y corrientes de bobina
+        {nombre: A}; lo que no se indica empieza en cero.
+        """
+        x = np.zeros(self.dim)
+        for nodo, valor in (tensiones or {}).items():
+            x[self.nodos[nodo]] = valor
+        for nombre, valor in (corrientes or {}).items():
+            x[self.corrientes[nombre]] = valor
+        return x
+
+    def elemento(self, nombre):
+        for e in self.elementos:
+            if e.nombre == nombre:
+                return e
+        raise KeyError(f"No hay ningún elemento {nombre!r}")
+
+    def tension(self, estados, nodo):
+        """Tensión de un nodo en cada estado (último eje)."""
+        i = self.indice(nodo)
+        estados = np.asarray(estados)
+        return np.zeros(estados.shape[:-1]) if i is None else estados[..., i]
+
+    def caida(self, estados, nombre):
+        """Tensión entre los bornes de un elemento (nodo+ menos nodo-)."""
+        e = self.elemento(nombre)
+        return self.tension(estados, e.nodo_pos) - self.tension(estados, e.nodo_neg)
+
+    def corriente(self, estados, nombre):
+        """Corriente de nodo+ a nodo- por un elemento R, L, C o V."""
+        e = self.elemento(nombre)
+        estados = np.asarray(estados)
+        if e.tipo in "LV":
+            return estados[..., self.corrientes[nombre]]
+        if e.tipo == "R":
+            return self.caida(estados, nombre) / e.valor
+        raise ValueError(f"La corriente de {nombre} ({e.tipo}) no forma parte del estado")
+
+    def carga(self, estados, nombre):
+        """Carga de un condensador: C·(v+ - v-)."""
+        return self.elemento(nombre).valor * self.caida(estados, nombre)
+
+    def resumen(self):
+        """Texto con el tamaño del sistema y el método de resolución."""
+        cuenta = {t: sum(e.tipo == t for e in self.elementos) for t in "RLCVI"}
+        elementos = ", ".join(f"{n} {t}" for t, n in cuenta.items() if n)
+        no_nulos = self.G.nnz + self.C.nnz if sparse is not None else int(
+            np.count_nonzero(self.G) + np.count_nonzero(self.C))
+        return (f"Circuito MNA: {len(self.nodos)} nodos, {elementos}\n"
+                f"{self.dim} incógnitas, {no_nulos} coeficientes no nulos en G y C "
+                f"({'splu disperso' if sparse is not None else 'inversa densa'}), TR-BDF2\n")
@@ -0,0 +1,310 @@
+"""
+Propagación de incertidumbre por Monte Carlo del tiempo de vaciado.
+
+Los parámetros del tanque (h₀, radio R del tanque, radio r del orificio y
+Cd) se sortean de distribuciones elegidas por el usuario. Las muestras se
+generan y evalúan por bloques de TAMANO_BLOQUE, sin bucles de Python por
+muestra, y cada bloque se vuelca en un HistogramaLog: ni las muestras ni
+los tiempos de vaciado se guardan, así que la memoria no depende del
+número de muestras.
+
+Ejemplo:
+    from motor.montecarlo import incertidumbre_vaciado, normal, uniforme
+    r = incertidumbre_vaciado(1_000_000, h0=2.0, R=0.5,
+                              r=normal(0.05, 0.002), Cd=uniforme(0.58, 0.64))
+    r["percentiles"][95], r["histograma"]
+
+Uso (desde la carpeta Simulaciones):
+    python -m motor.montecarlo --muestras 1000000 --sigma-Cd 0.03 --sigma-r 0.02
+"""
+import argparse
+
+import numpy as np
+
+from . import torricelli
+
+# Gravedad (la de VaciadoDeTanques)
+G = 9.8
+# Muestras generadas y evaluadas a la vez
+TAMANO_BLOQUE = 100_000
+# Cubetas del histograma (par: al ampliar el rango se funden de dos en dos)
+N_CUBETAS = 2048
+# Percentiles devueltos por defecto
+PERCENTILES = (2.5, 5, 25, 50, 75, 95, 97.5)
+# Pasos de Euler por muestra del método numérico (sobre el tiempo teórico)
+PASOS_NUMERICOS = 1000
+
+
+# -------------------------------------------------
+# DISTRIBUCIONES
+# -------------------------------------------------
+# Cada distribución es una función muestrear(rng, n) -> arreglo (n,).
+# Un número en lugar de una distribución es un valor fijo.
+
+def uniforme(minimo, maximo):
+    """Uniforme en [minimo, maximo)."""
+    return lambda rng, n: rng.uniform(minimo, maximo, n)
+
+
+def normal(media, desviacion, minimo=0.0):
+    """Normal truncada por debajo de `minimo` (se vuelven a sortear los valores menores)."""
+    def muestrear(rng, n):
+        valores = rng.normal(media, desviacion, n)
+        fuera = valores <= minimo
+        while fuera.any():
+            valores[fuera] = rng.normal(media, desviacion, int(fuera.sum()))
+            fuera = valores <= minimo
+        return valores
+    return muestrear
+
+
+def lognormal(mediana, sigma):
+    """Lognormal con esa mediana y desviación sigma del logaritmo."""
+    return lambda rng, n: mediana * np.exp(rng.normal(0.0, sigma, n))
+
+
+def triangular(minimo, moda, maximo):
+    """Triangular entre minimo y maximo con máximo de densidad en moda."""
+    return lambda rng, n: rng.triangular(minimo, moda, maximo, n)
+
+
+def _sortear(distribucion, rng, n):
+    if callable(distribucion):
+        return np.asarray(distribucion(rng, n), dtype=float)
+    return np.full(n, float(distribucion))
+
+
+# -------------------------------------------------
+# HISTOGRAMA EN FLUJO
+# -------------------------------------------------
+
+class HistogramaLog:
+    """
+    Histograma de valores positivos con cubetas iguales en escala
+    logarítmica y rango que se amplía solo.
+
+    El rango inicial sale del primer bloque. Si llega un valor fuera de él,
+    las cubetas se funden de dos en dos (el ancho se duplica) y el rango se
+    extiende hacia ese lado, sin perder ningún conteo. Los percentiles se
+    interpolan dentro de la cubeta, con un error relativo del orden del
+    ancho de cubeta. Los valores <= 0 y los infinitos (tanques que no se
+    vacían) se cuentan aparte, en los extremos.
+    """
+
+    def __init__(self, n_cubetas=N_CUBETAS):
+        if n_cubetas % 2:
+            raise ValueError("n_cubetas debe ser par")
+        self.conteos = np.zeros(n_cubetas, dtype=np.int64)
+        self.log_minimo = None
+        self.ancho = None
+        self.n_no_positivos = 0
+        self.n_infinitos = 0
+        # Media y varianza de los valores finitos (fórmula de Chan por bloques)
+        self.n_finitos = 0
+        self.media = 0.0
+        self._m2 = 0.0
+        self.minimo = np.inf
+        self.maximo = -np.inf
+
+    @property
+    def n(self):
+        return self.n_finitos + self.n_no_positivos + self.n_infinitos
+
+    @property
+    def log_maximo(self):
+        return self.log_minimo + len(self.conteos) * self.ancho
+
+    @property
+    def desviacion(self):
+        return np.sqrt(self._m2 / (self.n_finitos - 1)) if self.n_finitos > 1 else 0.0
+
+    def _fundir(self, hacia_arriba):
+        mitad = self.conteos.reshape(-1, 2).sum(axis=1)
+        vacias = np.zeros_like(mitad)
+        if hacia_arriba:
+            self.conteos = np.concatenate([mitad, vacias])
+        else:
+            self.log_minimo -= len(self.conteos) * self.ancho
+            self.conteos = np.concatenate([vacias, mitad])
+        self.ancho *= 2
+
+    def agregar(self, valores):
+        """Agrega un bloque de valores."""
+        valores = np.asarray(valores, dtype=float).ravel()
+        self.n_infinitos += int(np.count_nonzero(np.isinf(valores) & (valores > 0)))
+        self.n_no_positivos += int(np.count_nonzero(valores <= 0))
+        valores = valores[np.isfinite(valores) & (valores > 0)]
+        if valores.size == 0:
+            return
+        self._acumular_momentos(valores)
+
+        logs = np.log(valores)
+        menor, mayor = logs.min(), logs.max()
+        if self.log_minimo is None:
+            # Rango inicial: el del primer bloque, con un margen
+            margen = max(mayor - menor, 1e-6) * 0.05
+            self.log_minimo = menor - margen
+            self.ancho = (mayor - menor + 2 * margen) / len(self.conteos)
+        while menor < self.log_minimo:
+            self._fundir(hacia_arriba=False)
+        while mayor >= self.log_maximo:
+            self._fundir(hacia_arriba=True)
+
+        indices = ((logs - self.log_minimo) / self.ancho).astype(np.int64)
+        self.conteos += np.bincount(np.minimum(indices, len(self.conteos) - 1),
+                                    minlength=len(self.conteos))
+
+    def _acumular_momentos(self, valores):
+        n_b = valores.size
+        media_b = valores.mean()
+        m2_b = float(((valores - media_b)**2).sum())
+        n = self.n_finitos + n_b
+        delta = media_b - self.media
+        self.media += delta * n_b / n
+        self._m2 += m2_b + delta**2 * self.n_finitos * n_b / n
+        self.n_finitos = n
+        self.minimo = min(self.minimo, float(valores.min()))
+        self.maximo = max(self.maximo, float(valores.max()))
+
+    def percentiles(self, q):
+        """Percentiles q (0-100) de todos los valores agregados."""
+        q = np.atleast_1d(np.asarray(q, dtype=float))
+        objetivo = q / 100 * self.n
+        resultado = np.empty(q.shape)
+        acumulado = self.n_no_positivos + np.cumsum(self.conteos)
+        for i, o in enumerate(objetivo):
+            if self.n == 0:
+                resultado[i] = np.nan
+            elif o <= self.n_no_positivos and self.n_no_positivos > 0:
+                resultado[i] = 0.0
+            elif o > self.n - self.n_infinitos:
+                resultado[i] = np.inf
+            else:
+                j = min(int(np.searchsorted(acumulado, o)), len(self.conteos) - 1)
+                antes = acumulado[j] - self.conteos[j]
+                fraccion = (o - antes) / self.conteos[j] if self.conteos[j] else 0.0
+                log_valor = self.log_minimo + (j + fraccion) * self.ancho
+                resultado[i] = np.clip(np.exp(log_valor), self.minimo, self.maximo)
+        return resultado
+
+    def histograma(self):
+        """(bordes, conteos) de las cubetas no vacías entre la primera y la última."""
+        ocupadas = np.flatnonzero(self.conteos)
+        if ocupadas.size == 0:
+            return np.empty(0), np.empty(0, dtype=np.int64)
+        primera, ultima = ocupadas[0], ocupadas[-1] + 1
+        bordes = np.exp(self.log_minimo + np.arange(primera, ultima + 1) * self.ancho)
+        return bordes, self.conteos[primera:ultima].copy()
+
+
+# -------------------------------------------------
+# TIEMPO DE VACIADO
+# -------------------------------------------------
+
+def tiempo_vaciado(h0, R, r, Cd, g=G, metodo="analitico", pasos=PASOS_NUMERICOS,
+                   h_minima=torricelli.H_MINIMA):
+    """
+    Tiempo de vaciado de un bloque de tanques (arreglos compatibles).
+
+    metodo: "analitico" usa t_final = 2√h₀/k (la de analizar_ecuacion),
+            con k = Cd·(r/R)²·√(2g);
+            "numerico" integra el bloque con torricelli.paso_euler, con
+            `pasos` pasos por muestra sobre su tiempo teórico, hasta que
+            h <= h_minima, como la simulación interactiva.
+    Los tanques que no se vacían (k = 0) dan infinito.
+    """
+    h0, R, r, Cd = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (h0, R, r, Cd)))
+    A_tanque = np.pi * R**2
+    A_orificio = np.pi * r**2
+    k = Cd * (A_orificio / A_tanque) * np.sqrt(2 * g)
+    with np.errstate(divide="ignore"):
+        t_teorico = np.where(k > 0, 2 * np.sqrt(np.maximum(h0, 0)) / k, np.inf)
+
+    if metodo == "analitico":
+        return t_teorico
+    if metodo != "numerico":
+        raise ValueError(f"Método desconocido: {metodo!r} (use 'analitico' o 'numerico')")
+
+    # Paso propio de cada muestra; se da hasta el doble de pasos por si el
+    # esquema tarda más que la solución exacta
+    finito = np.isfinite(t_teorico) & (h0 > h_minima)
+    dt = np.where(finito, t_teorico / pasos, 0.0)
+    estado = np.where(finito, h0, 0.0)[:, None]
+    t_fin = np.where(finito, np.inf, np.where(h0 <= h_minima, 0.0, np.inf))
+    activos = finito.copy()
+    for n in range(1, 2 * pasos + 1):
+        if not activos.any():
+            break
+        estado = torricelli.paso_euler(None, estado, dt, Cd, A_orificio, A_tanque, g)
+        vacios = activos & (estado[:, 0] <= h_minima)
+        t_fin[vacios] = n * dt[vacios]
+        activos &= ~vacios
+    return t_fin
+
+
+def incertidumbre_vaciado(n_muestras, h0, R, r, Cd, g=G, percentiles=PERCENTILES,
+                          metodo="analitico", semilla=None, tamano_bloque=TAMANO_BLOQUE,
+                          n_cubetas=N_CUBETAS):
+    """
+    Percentiles e histograma del tiempo de vaciado con parámetros inciertos.
+
+    h0, R, r, Cd: distribuciones (uniforme, normal, lognormal, triangular o
+                  cualquier muestrear(rng, n)) o valores fijos
+    metodo:       "analitico" o "numerico" (ver tiempo_vaciado)
+
+    Devuelve un diccionario con n, percentiles ({q: t}), media, desviacion,
+    minimo, maximo, no_vaciados (muestras con k = 0), histograma
+    ((bordes, conteos), cubetas logarítmicas) y el HistogramaLog, que admite
+    más bloques con agregar().
+    """
+    rng = np.random.default_rng(semilla)
+    histograma = HistogramaLog(n_cubetas)
+    for inicio in range(0, n_muestras, tamano_bloque):
+        n = min(tamano_bloque, n_muestras - inicio)
+        muestras = [_sortear(d, rng, n) for d in (h0, R, r, Cd)]
+        histograma.agregar(tiempo_vaciado(*muestras, g=g, metodo=metodo))
+
+    valores = histograma.percentiles(percentiles)
+    return {
+        "n": histograma.n,
+        "percentiles": dict(zip(percentiles, valores.tolist())),
+        "media": histograma.media,
+        "desviacion": histograma.desviacion,
+        "minimo": histograma.minimo,
+        "maximo": histograma.maximo,
+        "no_vaciados": histograma.n_infinitos,
+        "histograma": histograma.histograma(),
+        "acumulador": histograma,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Incertidumbre del tiempo de vaciado (Monte Carlo)")
+    parser.add_argument("--muestras", type=int, default=1_000_000)
+    parser.add_argument("--h0", type=float, default=2.0, help="altura inicial (m)")
+    parser.add_argument("--R", type=float, default=0.5, help="radio del tanque (m)")
+    parser.add_argument("--r", type=float, default=0.05, help="radio del orificio (m)")
+    parser.add_argument("--Cd", type=float, default=0.6, help="coeficiente de descarga")
+    for nombre in ("h0", "R", "r", "Cd"):
+        parser.add_argument(f"--sigma-{nombre}", type=float, default=0.0,
+                            help=f"desviación relativa de {nombre} (normal truncada en 0)")
+    parser.add_argument("--metodo", choices=("analitico", "numerico"), default="analitico")
+    parser.add_argument("--semilla", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    distribuciones = {}
+    for nombre in ("h0", "R", "r", "Cd"):
+        valor = getattr(args, nombre)
+        sigma = getattr(args, f"sigma_{nombre}")
+        distribuciones[nombre] = normal(valor, sigma * valor) if sigma > 0 else valor
+
+    resultado = incertidumbre_vaciado(args.muestras, metodo=args.metodo, semilla=args.semilla,
+                                      **distribuciones)
+    print(f"Muestras: {resultado['n']}  (no se vacían: {resultado['no_vaciados']})")
+    print(f"Media: {resultado['media']:.2f} s  Desviación: {resultado['desviacion']:.2f} s")
+    for q, t in resultado["percentiles"].items():
+        print(f"  P{q:g}: {t:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""
+Red de tanques de mezcla unidos por tuberías.
+
+Cada tanque i (área A_i) recibe un caudal de alimentación Q_entrada_i con
+concentración C_entrada_i, puede descargar Q_salida_i fuera de la red y se
+une a otros por tuberías (origen, destino, Q) de caudal constante. Con
+V_i = A_i·H_i y el balance de volumen y de soluto de cada tanque:
+
+    dV_i/dt = Q_entrada_i + Σ_{j→i} Q_ji - Σ_{i→j} Q_ij - Q_salida_i = q_i
+    V_i·dC_i/dt = Q_entrada_i·(C_entrada_i - C_i) + Σ_{j→i} Q_ji·(C_j - C_i)
+
+Las sumas sobre tuberías son np.bincount por destino u origen, como en
+motor.red_tanques, así que el lado derecho cuesta O(tanques + tuberías).
+
+Si todos los q_i son nulos los volúmenes son constantes y C' = M·C + f es
+lineal con coeficientes constantes: resolver() usa entonces la exponencial
+de la matriz aumentada [[M, f], [0, 0]] (lineal.expm), una sola vez para
+el intervalo entre muestras, sin error de discretización y con el mismo
+costo para cualquier horizonte. Si no, integra C y V juntos con
+Dormand-Prince 5(4) hasta el primer tanque vacío o lleno.
+
+El balance es de masa de soluto, d(V_i·C_i)/dt = entradas - salidas, el
+mismo que usa motor.mezcla: con volumen variable la dilución por el cambio
+de volumen ya está incluida, y un solo tanque (Q_entrada, Q_salida)
+reproduce mezcla.solucion_analitica también cuando Q_entrada ≠ Q_salida.
+
+Ejemplo:
+    red = tanques_en_serie(200, A=7.07, Q_entrada=0.025, C_entrada=8.0, h0=0.5)
+    r = red.resolver(C0=0.0, t_final=1e6)
+    r["metodo"], r["C"][-1, -1]
+"""
+import numpy as np
+
+from .integradores import dormand_prince
+from .lineal import expm
+from .mezcla import ALTURA_TANQUE, TOLERANCIA_CAUDAL, instante_final
+
+# Muestras por defecto de la solución
+PUNTOS_SOLUCION = 500
+
+
+class RedMezcla:
+    """
+    Red de N tanques de mezcla.
+
+    A:                 área de cada tanque (m²), escalar o (N,)
+    h0:                altura inicial de cada tanque (m), positiva
+    origen, destino, Q: tuberías y sus caudales (m³/s)
+    Q_entrada, C_entrada: alimentación de cada tanque (m³/s, g/L)
+    Q_salida:          descarga de cada tanque fuera de la red (m³/s)
+    """
+
+    def __init__(self, A, h0, origen=(), destino=(), Q=(), Q_entrada=0.0, C_entrada=0.0,
+                 Q_salida=0.0, altura_tanque=ALTURA_TANQUE, n_tanques=None):
+        valores = (A, h0, Q_entrada, C_entrada, Q_salida)
+        forma = np.broadcast_shapes(*(np.shape(v) for v in valores))
+        if n_tanques is None:
+            if not forma:
+                raise ValueError("Con todos los parámetros escalares hay que indicar n_tanques")
+            n_tanques = forma[0]
+        self.n_tanques = n_tanques
+        N = (n_tanques,)
+        self.A, self.h0, self.Q_entrada, self.C_entrada, self.Q_salida = (
+            np.broadcast_to(np.asarray(v, dtype=float), N).copy() for v in valores)
+        if np.any(self.h0 <= 0):
+            raise ValueError("Todos los tanques deben empezar con líquido (h0 > 0)")
+        self.altura_tanque = altura_tanque
+
+        self.origen = np.asarray(origen, dtype=np.int64)
+        self.destino = np.asarray(destino, dtype=np.int64)
+        self.Q = np.broadcast_to(np.asarray(Q, dtype=float), self.origen.shape).copy()
+        if self.origen.shape != self.destino.shape:
+            raise ValueError("origen y destino deben tener la misma longitud")
+        if len(self.origen) and (min(self.origen.min(), self.destino.min()) < 0
+                                 or max(self.origen.max(), self.destino.max()) >= n_tanques):
+            raise ValueError(f"Las tuberías deben unir tanques entre 0 y {n_tanques - 1}")
+
+        # Caudales totales que entran y salen de cada tanque
+        self.entra = self.Q_entrada + np.bincount(self.destino, self.Q, minlength=n_tanques)
+        self.sale = self.Q_salida + np.bincount(self.origen, self.Q, minlength=n_tanques)
+        self.q = self.entra - self.sale
+        self.volumen_constante = bool(np.all(np.abs(self.q) < TOLERANCIA_CAUDAL))
+
+    def instante_final(self):
+        """Primer instante en que algún tanque se vacía o se llena (inf si nunca)."""
+        return float(np.min(instante_final(self.entra, self.sale, self.h0, self.A,
+                                           self.altura_tanque)))
+
+    def volumenes(self, t):
+        """V_i(t) = A_i·h0_i + q_i·t, forma (len(t), N)."""
+        t = np.asarray(t, dtype=float)[..., None]
+        return self.A * self.h0 + self.q * t
+
+    def derivadas(self, t, y):
+        """[C', V'] con y = [C, V]."""
+        C, V = y[:self.n_tanques], y[self.n_tanques:]
+        aporte = np.bincount(self.destino, self.Q * (C[self.origen] - C[self.destino]),
+                             minlength=self.n_tanques)
+        dCdt = (self.Q_entrada * (self.C_entrada - C) + aporte) / V
+        return np.concatenate([dCdt, self.q])
+
+    def generador(self):
+        """
+        Matriz aumentada (N+1, N+1) de z = [C, 1] con volúmenes constantes:
+        z' = [[M, f], [0, 0]]·z.
+        """
+        N = self.n_tanques
+        V = self.A * self.h0
+        G = np.zeros((N + 1, N + 1))
+        np.add.at(G, (self.destino, self.origen), self.Q / V[self.destino])
+        G[np.arange(N), np.arange(N)] -= self.entra / V
+        G[:N, N] = self.Q_entrada * self.C_entrada / V
+        return G
+
+    def estacionario(self):
+        """Concentraciones de equilibrio con volúmenes constantes: M·C = -f."""
+        G = self.generador()
+        return np.linalg.solve(G[:-1, :-1], -G[:-1, -1])
+
+    def resolver(self, C0, t_final, puntos=PUNTOS_SOLUCION, rtol=1e-8, atol=1e-10):
+        """
+        Concentraciones y alturas en `puntos` instantes equiespaciados desde
+        0 hasta t_final, o hasta que algún tanque se vacía o se llena.
+
+        Devuelve {t (M,), C (M, N), H (M, N), t_fin, metodo ("exacto" o
+        "rk45"), n_pasos (pasos de RK45, 0 con la exponencial)}.
+        """
+        N = self.n_tanques
+        C0 = np.broadcast_to(np.asarray(C0, dtype=float), (N,)).copy()
+        t_fin = min(float(t_final), self.instante_final())
+        t = np.linspace(0.0, t_fin, puntos)
+
+        if self.volumen_constante:
+            # Un propagador exacto para el intervalo entre muestras
+            propagador = expm(self.generador() * (t[1] - t[0])) if puntos > 1 else np.eye(N + 1)
+            C = np.empty((puntos, N))
+            z = np.append(C0, 1.0)
+            for i in range(puntos):
+                C[i] = z[:N]
+                z = propagador @ z
+            metodo, n_pasos = "exacto", 0
+        else:
+            y0 = np.concatenate([C0, self.A * self.h0])
+            escala = max(float(np.abs(C0).max(initial=0.0)), float(self.C_entrada.max(initial=0.0)), 1.0)
+            solucion = dormand_prince(self.derivadas, 0.0, y0, t_fin, rtol=rtol, atol=atol * escala,
+                                      max_pasos=1_000_000)
+            C = solucion(t)[:, :N]
+            metodo, n_pasos = "rk45", solucion.n_pasos
+
+        H = self.volumenes(t) / self.A
+        return {"t": t, "C": C, "H": H, "t_fin": t_fin, "metodo": metodo, "n_pasos": n_pasos}
+
+
+# -------------------------------------------------
+# REDES DE EJEMPLO
+# -------------------------------------------------
+
+def tanques_en_serie(n_tanques, A, Q_entrada, C_entrada, h0, Q_salida=None, recirculacion=0.0,
+                     **opciones):
+    """
+    Cascada de tanques: la alimentación entra al primero, cada tanque pasa
+    Q_entrada + recirculacion al siguiente, el último devuelve
+    `recirculacion` al primero y descarga Q_salida (Q_entrada por defecto,
+    con lo que todos los volúmenes son constantes).
+    """
+    if Q_salida is None:
+        Q_salida = Q_entrada
+    i = np.arange(n_tanques - 1)
+    origen, destino = list(i), list(i + 1)
+    Q = [Q_entrada + recirculacion] * (n_tanques - 1)
+    if recirculacion > 0 and n_tanques > 1:
+        origen.append(n_tanques - 1)
+        destino.append(0)
+        Q.append(recirculacion)
+    return RedMezcla(A, h0, origen, destino, Q,
+                     Q_entrada=np.eye(1, n_tanques, 0)[0] * Q_entrada, C_entrada=C_entrada,
+                     Q_salida=np.eye(1, n_tanques, n_tanques - 1)[0] * Q_salida, **opciones)
@@ -0,0 +1,171 @@
+"""
+Redes de tanques de Torricelli en cascada.
+
+Cada tanque i (radio R_i, orificio r_i, coeficiente Cd_i) se vacía con
+caudal q_i = Cd_i·π·r_i²·√(2g·h_i), que se reparte entre los tanques de
+abajo según las aristas (origen, destino, fraccion); lo que no se reparte
+sale de la red. Con un caudal externo opcional Q_externo_i:
+
+    π·R_i²·dh_i/dt = Q_externo_i - q_i + Σ_{aristas j→i} fraccion·q_j
+
+La suma sobre las aristas es un np.bincount por destino, así que evaluar el
+lado derecho cuesta O(tanques + aristas) sin construir ninguna matriz, y el
+sistema completo se integra como un solo vector con Dormand-Prince 5(4).
+
+Por debajo de H_MINIMA (el tanque ya se considera vacío) √h se sustituye
+por su secante h/√H_MINIMA: el caudal sigue siendo continuo pero su
+derivada queda acotada, y el integrador no tiene que reducir el paso cada
+vez que se vacía uno de miles de tanques. La integración se detiene cuando
+todos bajan de H_MINIMA y el resto del vaciado se completa con la
+solución cerrada de Torricelli, así que t_evento es el instante h = 0
+como en torricelli.vaciar.
+
+Ejemplo:
+    red = arbol_binario(4095, R=0.5, r=0.04, Cd=0.6)
+    sol = red.resolver(h0=2.0, t_final=2000)
+    sol(np.linspace(0, 2000, 100))[:, :10]       # alturas de los 10 primeros
+"""
+import numpy as np
+
+from .integradores import dormand_prince
+from .torricelli import H_MINIMA
+
+# Gravedad (la de VaciadoDeTanques)
+G = 9.8
+
+
+class RedTanques:
+    """
+    Red de N tanques.
+
+    R, r, Cd:  arreglos (N,) o escalares (el mismo valor para todos)
+    origen, destino, fraccion: aristas; fraccion es la parte del caudal de
+               origen que recibe destino (1 por defecto). Las fracciones
+               que salen de un tanque suman como mucho 1.
+    Q_externo: caudal que entra a cada tanque desde fuera de la red (m³/s)
+    n_tanques: necesario solo si R, r y Cd son todos escalares
+    """
+
+    def __init__(self, R, r, Cd, origen=(), destino=(), fraccion=None, Q_externo=0.0,
+                 g=G, n_tanques=None):
+        forma = np.broadcast_shapes(*(np.shape(v) for v in (R, r, Cd, Q_externo)))
+        if n_tanques is None:
+            if not forma:
+                raise ValueError("Con R, r y Cd escalares hay que indicar n_tanques")
+            n_tanques = forma[0]
+        self.n_tanques = n_tanques
+        N = (n_tanques,)
+        self.R = np.broadcast_to(np.asarray(R, dtype=float), N).copy()
+        self.r = np.broadcast_to(np.asarray(r, dtype=float), N).copy()
+        self.Cd = np.broadcast_to(np.asarray(Cd, dtype=float), N).copy()
+        self.Q_externo = np.broadcast_to(np.asarray(Q_externo, dtype=float), N).copy()
+        self.g = g
+
+        self.origen = np.asarray(origen, dtype=np.int64)
+        self.destino = np.asarray(destino, dtype=np.int64)
+        if self.origen.shape != self.destino.shape:
+            raise ValueError("origen y destino deben tener la misma longitud")
+        self.fraccion = (np.ones(len(self.origen)) if fraccion is None
+                         else np.broadcast_to(np.asarray(fraccion, dtype=float),
+                                              self.origen.shape).copy())
+        if len(self.origen) and (min(self.origen.min(), self.destino.min()) < 0
+                                 or max(self.origen.max(), self.destino.max()) >= n_tanques):
+            raise ValueError(f"Las aristas deben unir tanques entre 0 y {n_tanques - 1}")
+        repartido = np.bincount(self.origen, self.fraccion, minlength=n_tanques)
+        if np.any(repartido > 1 + 1e-12):
+            raise ValueError("Las fracciones que salen de un tanque suman más de 1")
+
+        self.A_tanque = np.pi * self.R**2
+        # q = coef·√h
+        self.coef = self.Cd * np.pi * self.r**2 * np.sqrt(2 * g)
+
+    def caudales(self, h):
+        """Caudal de salida de cada tanque (m³/s) con las alturas h."""
+        h = np.maximum(h, 0)
+        raiz = np.where(h > H_MINIMA, np.sqrt(h), h / np.sqrt(H_MINIMA))
+        return self.coef * raiz
+
+    def derivadas(self, t, h):
+        """dh/dt de todos los tanques."""
+        q = self.caudales(h)
+        entrada = np.bincount(self.destino, self.fraccion * q[self.origen], minlength=self.n_tanques)
+        return (self.Q_externo + entrada - q) / self.A_tanque
+
+    def profundidad(self):
+        """
+        Tanques en el camino más largo de la red (n_tanques en una cadena,
+        niveles en un árbol). Con ciclos devuelve n_tanques.
+        """
+        nivel = np.ones(self.n_tanques, dtype=np.int64)
+        for _ in range(self.n_tanques):
+            nuevo = nivel.copy()
+            np.maximum.at(nuevo, self.destino, nivel[self.origen] + 1)
+            if np.array_equal(nuevo, nivel):
+                break
+            nivel = nuevo
+        return int(min(nivel.max(), self.n_tanques))
+
+    def volumen(self, h):
+        """Volumen de agua en cada tanque (último eje de h)."""
+        return self.A_tanque * np.maximum(h, 0)
+
+    def resolver(self, h0, t_final, rtol=1e-6, atol=1e-9, max_pasos=100000):
+        """
+        Integra la red con Dormand-Prince 5(4) desde las alturas h0 (escalar o
+        (N,)) hasta t_final, o hasta que todos los tanques estén vacíos.
+        atol es relativo a la mayor altura inicial.
+
+        Cuando la mayor altura baja de H_MINIMA, cada tanque tarda 2√h_i/k_i
+        más en vaciarse (k_i = coef_i/A_i, h(t) = (√h - k·t/2)²); lo que
+        entra desde arriba ya es despreciable. t_evento es ese instante
+        de vaciado, el mayor de todos, y la solución termina con la red
+        vacía en él. Con un solo tanque es exactamente 2√h₀/k.
+
+        Devuelve una SolucionEDO; sol(t) interpola las N alturas.
+        """
+        h0 = np.broadcast_to(np.asarray(h0, dtype=float), (self.n_tanques,)).copy()
+
+        def todos_vacios(t, h):
+            return float(h.max()) - H_MINIMA
+        todos_vacios.direccion = -1
+
+        eventos = [] if np.any(self.Q_externo > 0) else [todos_vacios]
+        solucion = dormand_prince(self.derivadas, 0.0, h0, t_final, rtol=rtol,
+                                  atol=atol * max(float(h0.max()), H_MINIMA),
+                                  eventos=eventos, max_pasos=max_pasos)
+        if solucion.t_evento is not None:
+            cola = float(np.max(2 * np.sqrt(np.maximum(solucion.y_evento, 0))
+                                / (self.coef / self.A_tanque)))
+            solucion.t_evento += cola
+            ceros = np.zeros((1, self.n_tanques))
+            solucion.t = np.append(solucion.t, solucion.t_evento)
+            solucion.y = np.concatenate([solucion.y, ceros])
+            solucion.dy = np.concatenate([solucion.dy, ceros])
+            solucion.y_evento = ceros[0]
+        return solucion
+
+
+# -------------------------------------------------
+# TOPOLOGÍAS
+# -------------------------------------------------
+
+def cadena(n_tanques, R, r, Cd, **opciones):
+    """Cada tanque i vierte todo en el i + 1; el último sale de la red."""
+    i = np.arange(n_tanques - 1)
+    return RedTanques(R, r, Cd, origen=i, destino=i + 1, n_tanques=n_tanques, **opciones)
+
+
+def arbol_binario(n_tanques, R, r, Cd, **opciones):
+    """
+    Árbol en orden de anchura: el tanque i reparte su caudal a partes
+    iguales entre 2i + 1 y 2i + 2; las hojas (y la mitad que falte si un
+    tanque tiene un solo hijo) salen de la red.
+    """
+    hijos = np.arange(1, n_tanques)
+    return RedTanques(R, r, Cd, origen=(hijos - 1) // 2, destino=hijos, fraccion=0.5,
+                      n_tanques=n_tanques, **opciones)
+
+
+def niveles_arbol(n_tanques):
+    """Nivel (0 = raíz) de cada tanque de arbol_binario."""
+    return np.floor(np.log2(np.arange(n_tanques) + 1)).astype(int)
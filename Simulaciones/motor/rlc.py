@@ -0,0 +1,173 @@
+"""
+Modelo del circuito RLC serie con fuente sinusoidal.
+
+Ecuación: L·Q'' + R·Q' + Q/C = V₀·cos(ω·t)
+Estado:   columnas [Q, I] de forma (N, 2), con I = Q'
+"""
+import numpy as np
+
+from . import lineal
+
+DIM_ESTADO = 2
+
+
+def voltaje(t, V0, omega):
+    """V(t) = V₀·cos(ω·t)"""
+    return V0 * np.cos(omega * t)
+
+
+def derivadas(t, estado, R, L, C, V0, omega):
+    """Devuelve [Q', I'] = [I, (V(t) - R·I - Q/C)/L] para todo el lote."""
+    Q = estado[:, 0]
+    I = estado[:, 1]
+    dI_dt = (voltaje(t, V0, omega) - R*I - Q/C) / L
+    return np.stack([I, dI_dt], axis=1)
+
+
+def paso_euler(t, estado, dt, R, L, C, V0, omega):
+    """
+    Paso de Euler semi-implícito (el de la simulación original):
+    primero se actualiza la corriente y con ella la carga.
+    """
+    Q = estado[:, 0]
+    I = estado[:, 1]
+    dI_dt = (voltaje(t, V0, omega) - R*I - Q/C) / L
+    I = I + dI_dt * dt
+    Q = Q + I * dt
+    return np.stack([Q, I], axis=1)
+
+
+def paso_exacto(t, estado, dt, R, L, C, V0, omega):
+    """
+    Propagador exacto: exp(M·dt) del circuito, calculado una vez por
+    combinación de parámetros y dt (ver lineal.Propagador). No diverge
+    aunque L y C pequeñas hagan el sistema rígido.
+    """
+    return lineal.propagador(L, R, 1/C, V0, omega, dt).avanzar(t, estado)
+
+
+def elegir_integrador(R, L, C, omega, t_final, dt_maximo, **opciones):
+    """
+    Integrador y dt según las raíces de L·r² + R·r + 1/C = 0 (ver
+    lineal.elegir_integrador); el circuito solo tiene Euler y el exacto.
+    """
+    opciones.setdefault("candidatos", ("euler",))
+    return lineal.elegir_integrador(L, R, 1/C, omega, t_final, dt_maximo, **opciones)
+
+
+def solucion_analitica(t, R, L, C, Q0, I0, V0, omega, t0=0.0):
+    """
+    Q(t) e I(t) exactos sobre un arreglo de tiempos.
+
+    Parte homogénea según las raíces de L·r² + R·r + 1/C = 0 más la solución
+    particular de estado estacionario de V₀·cos(ω·t) (incluida la resonancia
+    con R = 0). Q0 e I0 son las condiciones en t = t0.
+    """
+    return lineal.solucion(t, L, R, 1/C, Q0, I0, V0, omega, t0)
+
+
+def respuesta_frecuencia(omega, R, L, C, V0=1.0):
+    """
+    Amplitud y fase de Q_p frente a un arreglo de frecuencias ω.
+
+    La corriente estacionaria tiene amplitud ω·|Q_p| y va π/2 adelantada.
+    """
+    return lineal.respuesta_frecuencia(omega, L, R, 1/C, V0)
+
+
+def resonancia(R, L, C, V0=1.0):
+    """Pico, ancho de banda y factor Q de la carga (ver lineal.resonancia)."""
+    return lineal.resonancia(L, R, 1/C, V0)
+
+
+# -------------------------------------------------
+# ANÁLISIS DE LA ECUACIÓN
+# -------------------------------------------------
+
+def analizar_ecuacion_rlc(R, L, C, Q0, I0, V0, omega):
+    """
+    Analiza la ecuación diferencial del circuito RLC.
+    
+    Ecuación: L·Q'' + R·Q' + Q/C = V₀·cos(ω·t)
+    
+    Para la parte homogénea (V₀ = 0):
+    Ecuación característica: L·r² + R·r + 1/C = 0
+    r = [-R ± √(R² - 4L/C)] / (2L)
+    """
+    
+    # Ecuación con parámetros
+    if V0 == 0:
+        ec_texto = f"({L:.2f})·Q'' + ({R:.2f})·Q' + Q/({C:.2f}) = 0\n"
+        ec_texto += f"Simplificando: ({L:.2f})·Q'' + ({R:.2f})·Q' + ({1/C:.2f})·Q = 0\n\n"
+    else:
+        ec_texto = f"({L:.2f})·Q'' + ({R:.2f})·Q' + Q/({C:.2f}) = ({V0:.2f})·cos(({omega:.2f})·t)\n"
+        ec_texto += f"Simplificando: ({L:.2f})·Q'' + ({R:.2f})·Q' + ({1/C:.2f})·Q = ({V0:.2f})·cos(({omega:.2f})·t)\n\n"
+    
+    # Análisis de la ecuación característica homogénea
+    analisis = "\n--- Análisis de la Ecuación Característica ---\n"
+    analisis += f"Ecuación característica: ({L:.2f})·r² + ({R:.2f})·r + ({1/C:.2f}) = 0\n"
+    
+    # Discriminante
+    discriminante = R**2 - 4*L*(1/C)
+    analisis += f"Discriminante Δ = R² - 4L/C = {discriminante:.4f}\n\n"
+    
+    if discriminante > 0:
+        # Sobreamortiguado - dos raíces reales
+        r1 = (-R + np.sqrt(discriminante)) / (2*L)
+        r2 = (-R - np.sqrt(discriminante)) / (2*L)
+        analisis += "🔹 Caso: SOBREAMORTIGUADO (dos raíces reales distintas)\n"
+        analisis += f"   r₁ = {r1:.4f}\n"
+        analisis += f"   r₂ = {r2:.4f}\n"
+        analisis += f"   Solución homogénea: Q_h(t) = C₁·e^({r1:.4f}·t) + C₂·e^({r2:.4f}·t)\n"
+        analisis += "   Comportamiento: Decaimiento exponencial SIN oscilaciones\n"
+        tipo = "sobreamortiguado"
+        
+    elif abs(discriminante) < 1e-10:
+        # Críticamente amortiguado
+        r = -R / (2*L)
+        analisis += "🔹 Caso: CRÍTICAMENTE AMORTIGUADO (raíz real doble)\n"
+        analisis += f"   r = {r:.4f}\n"
+        analisis += f"   Solución homogénea: Q_h(t) = (C₁ + C₂·t)·e^({r:.4f}·t)\n"
+        analisis += "   Comportamiento: Decaimiento más rápido posible sin oscilación\n"
+        tipo = "critico"
+        
+    else:
+        # Subamortiguado - raíces complejas
+        alpha = -R / (2*L)
+        beta = np.sqrt(-discriminante) / (2*L)
+        analisis += "🔹 Caso: SUBAMORTIGUADO (raíces complejas conjugadas)\n"
+        analisis += f"   r = {alpha:.4f} ± {beta:.4f}i\n"
+        analisis += f"   Solución homogénea: Q_h(t) = e^({alpha:.4f}·t)·[C₁·cos({beta:.4f}·t) + C₂·sin({beta:.4f}·t)]\n"
+        analisis += "   Comportamiento: Oscilaciones AMORTIGUADAS\n"
+        tipo = "subamortiguado"
+        
+        # Parámetros adicionales
+        omega_n = lineal.frecuencia_natural(L, 1/C)
+        zeta = lineal.factor_amortiguamiento(L, R, 1/C)
+        periodo = 2*np.pi / beta
+        
+        analisis += f"\n   📊 Parámetros del sistema:\n"
+        analisis += f"   Frecuencia natural: ω₀ = {omega_n:.4f} rad/s\n"
+        analisis += f"   Factor de amortiguamiento: ζ = {zeta:.4f}\n"
+        analisis += f"   Frecuencia amortiguada: ω_d = {beta:.4f} rad/s\n"
+        analisis += f"   Período de oscilación: T = {periodo:.4f} s\n"
+    
+    if V0 > 0:
+        analisis += f"\n🔹 Solución particular (forzamiento externo):\n"
+        analisis += f"   Debido a V₀·cos(ω·t), habrá una respuesta forzada\n"
+        analisis += f"   Solución completa: Q(t) = Q_h(t) + Q_p(t)\n"
+        analisis += f"   donde Q_p(t) es la solución particular (estado estacionario)\n"
+
+    # Respuesta en frecuencia, relativa a la carga estática C·V₀
+    res = resonancia(R, L, C)
+    analisis += f"\n🔹 Respuesta en frecuencia (Q_p relativa a C·V₀):\n"
+    if res["omega_pico"] > 0:
+        analisis += f"   Pico de resonancia: ω_r = {res['omega_pico']:.4f} rad/s, amplificación {res['amplitud_pico']/C:.3f}\n"
+    else:
+        analisis += "   Sin pico de resonancia (ζ ≥ 1/√2): la amplitud decrece con ω\n"
+    analisis += f"   Ancho de banda: Δω = {res['ancho_banda']:.4f} rad/s, factor de calidad Q = {res['Q']:.3f}\n"
+    if V0 > 0:
+        amplitud, fase = respuesta_frecuencia(omega, R, L, C)
+        analisis += f"   Con ω = {omega:.2f}: amplificación {amplitud/C:.3f}, fase {np.degrees(fase):.1f}°\n"
+    
+    return ec_texto, analisis, tipo
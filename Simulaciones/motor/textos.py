@@ -0,0 +1,63 @@
+"""
+Textos en pantalla con frecuencia limitada y envío solo si cambian.
+
+Cada asignación a label.text o wtext.text es un mensaje al navegador, y
+construir los f-strings en cada paso cuesta más que la física. Un
+TextoLimitado formatea como máximo `frecuencia` veces por segundo y solo
+envía el texto si cambió a la precisión mostrada.
+
+No importa VPython: recibe el objeto (label o wtext) ya creado.
+"""
+import time
+
+# Actualizaciones por segundo de cada texto
+FRECUENCIA_TEXTO = 10
+
+
+class TextoLimitado:
+    """
+    objeto:     label o wtext de VPython (cualquier objeto con atributo .text)
+    plantilla:  cadena de str.format con los valores, p. ej. "Carga: {:.3f} C"
+    frecuencia: actualizaciones máximas por segundo
+    reloj:      función de tiempo en segundos (time.monotonic por defecto)
+    """
+
+    def __init__(self, objeto, plantilla, frecuencia=FRECUENCIA_TEXTO, reloj=time.monotonic):
+        self.objeto = objeto
+        self.plantilla = plantilla
+        self.intervalo = 1.0 / frecuencia
+        self.reloj = reloj
+        self.texto = getattr(objeto, "text", None)
+        self.ultimo_envio = -float("inf")
+        self._pendientes = None
+        self.n_envios = 0
+
+    def actualizar(self, *valores):
+        """Registra valores nuevos; se formatean y envían si pasó el intervalo."""
+        ahora = self.reloj()
+        if ahora - self.ultimo_envio < self.intervalo:
+            self._pendientes = valores
+            return
+        self._pendientes = None
+        self.ultimo_envio = ahora
+        self._enviar(self.plantilla.format(*valores))
+
+    def forzar(self):
+        """Envía ya los últimos valores pendientes (por ejemplo al terminar)."""
+        if self._pendientes is not None:
+            valores = self._pendientes
+            self._pendientes = None
+            self.ultimo_envio = self.reloj()
+            self._enviar(self.plantilla.format(*valores))
+
+    def fijar(self, texto):
+        """Muestra un texto fijo de inmediato y descarta lo pendiente."""
+        self._pendientes = None
+        self.ultimo_envio = self.reloj()
+        self._enviar(texto)
+
+    def _enviar(self, texto):
+        if texto != self.texto:
+            self.objeto.text = texto
+            self.texto = texto
+            self.n_envios += 1
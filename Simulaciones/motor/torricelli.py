@@ -0,0 +1,145 @@
+"""
+Vaciado de un tanque cilíndrico por la ley de Torricelli.
+
+Ecuación: dh/dt = -(Cd·A_orificio/A_tanque)·√(2gh)
+Estado:   columna [h] de forma (N, 1)
+"""
+import numpy as np
+
+from .integradores import dormand_prince
+
+DIM_ESTADO = 1
+
+# Altura a partir de la cual se considera el tanque vacío
+H_MINIMA = 0.001
+
+
+def dhdt(h, Cd, A_orificio, A_tanque, g):
+    """
+    Ecuación de Torricelli para vaciado de tanque:
+    dh/dt = -(Cd·A_orificio/A_tanque)·√(2gh)
+
+    Acepta escalares o arreglos; donde h <= 0 la derivada es 0.
+    """
+    h = np.asarray(h, dtype=float)
+    velocidad = -(Cd * A_orificio / A_tanque) * np.sqrt(2 * g * np.maximum(h, 0))
+    resultado = np.where(h > 0, velocidad, 0.0)
+    return resultado if resultado.ndim else float(resultado)
+
+
+def solucion_teorica(t, h0, k):
+    """
+    Calcula la altura teórica en el tiempo t usando la solución analítica.
+    h(t) = (√h₀ - (k/2)·t)², y 0 una vez vaciado el tanque.
+
+    Acepta escalares o arreglos.
+    """
+    raiz = np.sqrt(h0) - (k/2) * np.asarray(t, dtype=float)
+    resultado = np.where(raiz < 0, 0.0, raiz**2)
+    return resultado if resultado.ndim else float(resultado)
+
+
+def derivadas(t, estado, Cd, A_orificio, A_tanque, g):
+    """Devuelve [h'] para todo el lote."""
+    return dhdt(estado[:, 0], Cd, A_orificio, A_tanque, g)[:, None]
+
+
+def paso_euler(t, estado, dt, Cd, A_orificio, A_tanque, g):
+    """Paso de Euler explícito; la altura nunca baja de 0."""
+    h = estado[:, 0]
+    h = np.maximum(h + dhdt(h, Cd, A_orificio, A_tanque, g) * dt, 0)
+    return h[:, None]
+
+
+def tanque_vacio(estado, **parametros):
+    """Máscara de configuraciones cuyo tanque ya se vació."""
+    return estado[:, 0] <= H_MINIMA
+
+
+# -------------------------------------------------
+# INTEGRACIÓN ADAPTATIVA
+# -------------------------------------------------
+
+# Error relativo admitido entre el tiempo de vaciado numérico y el teórico
+TOLERANCIA_VACIADO = 1e-5
+
+
+def _tanque_vacio_evento(t, y):
+    """Evento terminal: h = 0 (cruce descendente)."""
+    return y[0]
+
+
+_tanque_vacio_evento.direccion = -1
+
+
+def vaciar(h0, Cd, A_orificio, A_tanque, g, t_maximo=None, rtol=1e-8, atol=1e-12):
+    """
+    Integra dhdt() con Dormand-Prince 5(4) hasta que el tanque se vacía.
+
+    El instante de vaciado se localiza como raíz del evento h = 0, así que
+    coincide con t_final = 2√h₀/k dentro de TOLERANCIA_VACIADO sin depender
+    de un dt fijo. atol se expresa relativo a h₀.
+
+    Devuelve una SolucionEDO; su atributo t_evento es el tiempo de vaciado.
+    """
+    if t_maximo is None:
+        # Cota holgada: diez veces el tiempo de vaciado teórico
+        k = Cd * (A_orificio / A_tanque) * np.sqrt(2 * g)
+        t_maximo = 20 * np.sqrt(h0) / k
+
+    def f(t, y):
+        return np.atleast_1d(dhdt(y, Cd, A_orificio, A_tanque, g))
+
+    return dormand_prince(f, 0.0, h0, t_maximo, rtol=rtol, atol=atol * h0,
+                          eventos=[_tanque_vacio_evento])
+
+
+# -------------------------------------------------
+# ANÁLISIS DE LA ECUACIÓN
+# -------------------------------------------------
+
+def analizar_ecuacion(h0, Cd, A_orificio, A_tanque, g):
+    """
+    Analiza la ecuación diferencial y encuentra su solución analítica.
+    
+    Ecuación: dh/dt = -k·√h  donde k = Cd·(A_orificio/A_tanque)·√(2g)
+    
+    Solución por separación de variables:
+    ∫ dh/√h = -k ∫ dt
+    2√h = -kt + C
+    
+    Con condición inicial h(0) = h₀:
+    2√h₀ = C
+    
+    Por lo tanto:
+    √h = √h₀ - (k/2)·t
+    h(t) = (√h₀ - (k/2)·t)²
+    
+    El tanque se vacía cuando h = 0:
+    √h₀ - (k/2)·t_final = 0
+    t_final = 2√h₀ / k
+    """
+    
+    k = Cd * (A_orificio / A_tanque) * np.sqrt(2 * g)
+    
+    # Tiempo teórico de vaciado
+    t_final_teorico = 2 * np.sqrt(h0) / k
+    
+    texto = "\n--- Solución Analítica ---\n"
+    texto += f"Simplificando: dh/dt = -k·√h\n"
+    texto += f"donde k = Cd·(A_orificio/A_tanque)·√(2g) = {k:.6f}\n\n"
+    
+    texto += "📐 Resolución por separación de variables:\n"
+    texto += "∫ dh/√h = -k ∫ dt\n"
+    texto += "2√h = -kt + C\n"
+    texto += f"Con h(0) = {h0:.2f}, obtenemos C = {2*np.sqrt(h0):.4f}\n\n"
+    
+    texto += "🎯 Solución general:\n"
+    texto += f"h(t) = (√{h0:.2f} - {k/2:.6f}·t)²\n"
+    texto += f"h(t) = ({np.sqrt(h0):.4f} - {k/2:.6f}·t)²\n\n"
+    
+    texto += "⏱️  Tiempo teórico de vaciado:\n"
+    texto += f"t_final = 2√h₀ / k = 2√{h0:.2f} / {k:.6f}\n"
+    texto += f"t_final = {t_final_teorico:.2f} segundos\n\n"
+    
+    return texto, k, t_final_teorico
@@ -0,0 +1,112 @@
+"""
+Modo en vivo: cambios de parámetros durante una ejecución.
+
+Los callbacks de los sliders solo anotan el cambio (CambiosEnVivo.cambiar).
+El bucle de la simulación lo recoge una vez por fotograma con tomar() y lo
+aplica desde el estado actual, sin reiniciar, así que se ve en el fotograma
+siguiente. Lo que es más caro y no hace falta a cada movimiento del slider
+(el texto del análisis y la curva de predicción) espera a que el slider
+lleve `espera` segundos quieto: listo() lo avisa una sola vez por ráfaga.
+
+prediccion() evalúa la solución analítica de cada modelo a partir de un
+estado cualquiera (t0, estado), sin integrar.
+
+Ejemplo:
+    en_vivo = CambiosEnVivo()
+    ...                                    # slider: en_vivo.cambiar(p)
+    cambios = en_vivo.tomar()              # en el bucle, cada fotograma
+    if cambios is not None:
+        productor.actualizar_parametros(m=cambios["m"], ...)
+    if en_vivo.listo():
+        t, estados = prediccion("masa_resorte", t, estado, T_FINAL, m=..., ...)
+"""
+import time
+
+import numpy as np
+
+from . import masa_resorte, mezcla, rlc, torricelli
+
+# Segundos que el slider debe estar quieto antes de rehacer la predicción
+ESPERA_ANTIRREBOTE = 0.3
+# Puntos de la curva de predicción
+PUNTOS_PREDICCION = 400
+
+
+class CambiosEnVivo:
+    """
+    Último cambio de parámetros pendiente de una ejecución en curso.
+
+    espera: segundos sin cambios antes de que listo() devuelva True
+    reloj:  función de tiempo en segundos (time.monotonic por defecto)
+    """
+
+    def __init__(self, espera=ESPERA_ANTIRREBOTE, reloj=time.monotonic):
+        self.espera = espera
+        self.reloj = reloj
+        self.n_cambios = 0
+        self._pendientes = None
+        self._ultimo_cambio = None
+
+    def cambiar(self, parametros):
+        """Registra los parámetros nuevos (se llama desde los sliders)."""
+        self._pendientes = dict(parametros)
+        self._ultimo_cambio = self.reloj()
+        self.n_cambios += 1
+
+    def tomar(self):
+        """Devuelve el último cambio sin aplicar (o None) y lo descarta."""
+        pendientes, self._pendientes = self._pendientes, None
+        return pendientes
+
+    def listo(self):
+        """True una vez cuando los cambios llevan `espera` segundos quietos."""
+        if self._ultimo_cambio is None or self.reloj() - self._ultimo_cambio < self.espera:
+            return False
+        self._ultimo_cambio = None
+        return True
+
+
+# -------------------------------------------------
+# PREDICCIÓN DESDE EL ESTADO ACTUAL
+# -------------------------------------------------
+
+def prediccion(modelo, t0, estado, t_final, puntos=PUNTOS_PREDICCION, **parametros):
+    """
+    Trayectoria analítica desde `estado` en t0 hasta t_final.
+
+    parametros: los del paso del modelo (m, b, k, A, w para masa_resorte;
+    R, L, C, V0, omega para rlc; Cd, A_orificio, A_tanque, g para
+    torricelli; Qin, Qout, Cin, A para mezcla). Torricelli y mezcla se
+    detienen al vaciarse o llenarse el tanque.
+
+    Devuelve (t, estados) con estados de forma (puntos, dim_estado).
+    """
+    estado = [float(c) for c in np.asarray(estado, dtype=float).reshape(-1)]
+    p = parametros
+
+    if modelo == "masa_resorte":
+        t = np.linspace(t0, t_final, puntos)
+        x, v = masa_resorte.solucion_analitica(t, p["m"], p["b"], p["k"], estado[0], estado[1],
+                                               p["A"], p["w"], t0)
+        return t, np.column_stack([x, v])
+
+    if modelo == "rlc":
+        t = np.linspace(t0, t_final, puntos)
+        Q, I = rlc.solucion_analitica(t, p["R"], p["L"], p["C"], estado[0], estado[1],
+                                      p["V0"], p["omega"], t0)
+        return t, np.column_stack([Q, I])
+
+    if modelo == "torricelli":
+        h = estado[0]
+        k = p["Cd"] * (p["A_orificio"] / p["A_tanque"]) * np.sqrt(2 * p["g"])
+        t = np.linspace(t0, min(t_final, t0 + 2 * np.sqrt(max(h, 0)) / k), puntos)
+        return t, torricelli.solucion_teorica(t - t0, h, k)[:, None]
+
+    if modelo == "mezcla":
+        C, H = estado
+        t_fin = mezcla.instante_final(p["Qin"], p["Qout"], H, p["A"])
+        t = np.linspace(t0, min(t_final, t0 + t_fin), puntos)
+        C_t, H_t = mezcla.solucion_analitica(t - t0, p["Qin"], p["Qout"], p["Cin"], H, p["A"], C0=C)
+        return t, np.column_stack([C_t, H_t])
+
+    raise ValueError(f"Modelo desconocido: {modelo!r}")